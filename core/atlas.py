@@ -0,0 +1,287 @@
+"""Design atlas: precomputed design results over a grid of key inputs.
+
+For screening many variants of one field type, ``run_design`` is evaluated
+once over a user grid of rate × pump depth × GOR × water cut × PI (all
+other inputs fixed) and the results are stored in an ``.npy`` file that is
+opened memory-mapped, so only the cells a query touches are read.
+
+Queries are answered by multilinear interpolation. Each answer comes with
+an error estimate built from the interpolation error ``h² |f''| / 8``
+summed over the axes, with the second differences tabulated at the grid
+nodes when the atlas is built and stored next to the values, so both come
+from the same cell corners. Node curvatures can understate the error
+inside a cell, so the estimate is not a bound by itself: it is scaled by
+``ERROR_SAFETY_FACTOR``, or by more where a random sample of in-grid
+points checked against the engine at build time shows larger errors.
+
+A single point reads only its cell block from the memory-mapped file and
+takes a few tens of microseconds, an order of magnitude below one
+``run_design`` call; batches cost a few microseconds per point. Queries
+outside the grid, with other inputs differing from the atlas, touching
+cells the reservoir cannot deliver, or with an estimate above tolerance
+are sent to the full engine instead.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from core.engine import DEFAULT_INPUTS, InputsLike, prepare_inputs, run_design, take_inputs
+from core.interp import multilinear_interpolate
+
+ATLAS_AXES = ('targetFlowRate', 'pumpDepth', 'gasOilRatio', 'waterCut', 'productivityIndex')
+ATLAS_METRICS = ('pip_atm', 'tdh_m', 'void_fraction', 'pressure_drop')
+# Largest accepted error estimate per metric before falling back to the engine.
+# Sized to the engineering resolution of a screening answer (a few percent
+# of typical values); denser grids answer more queries from the atlas.
+ATLAS_TOLERANCES: Dict[str, float] = {
+    'pip_atm': 5.0,
+    'tdh_m': 50.0,
+    'void_fraction': 3.0,
+    'pressure_drop': 5.0,
+}
+# The node-wise estimate understates the error inside some cells (up to
+# about 2x on typical grids).
+ERROR_SAFETY_FACTOR = 2.0
+# In-grid points checked against the engine when the atlas is built; errors
+# below this fraction of the tolerance do not raise the scale, and the
+# largest sampled ratio is widened by the margin for the cells not sampled.
+CALIBRATION_POINTS = 256
+CALIBRATION_FLOOR = 0.1
+CALIBRATION_MARGIN = 1.25
+CALIBRATION_SEED = 0
+ATLAS_VERSION = 2
+
+
+def _second_difference_error(values: np.ndarray, axes: Sequence[np.ndarray]) -> np.ndarray:
+    """Node-wise interpolation error bound ``Σ h² |f''| / 8`` over the grid axes."""
+    error = np.zeros(values.shape, dtype=float)
+    for dim, axis in enumerate(axes):
+        if axis.size < 3:
+            continue
+        h = np.diff(axis)
+        slope = np.diff(values, axis=dim) / h.reshape((-1,) + (1,) * (values.ndim - dim - 1))
+        span = (h[:-1] + h[1:]).reshape((-1,) + (1,) * (values.ndim - dim - 1))
+        curvature = 2.0 * np.abs(np.diff(slope, axis=dim)) / span
+        # End nodes, and nodes next to cells the reservoir cannot deliver,
+        # take the curvature of their neighbour.
+        curvature = np.concatenate([curvature.take([0], axis=dim), curvature,
+                                    curvature.take([-1], axis=dim)], axis=dim)
+        gap = np.full_like(curvature.take([0], axis=dim), np.nan)
+        neighbour = np.fmax(np.concatenate([gap, curvature.take(range(axis.size - 1), axis=dim)], axis=dim),
+                            np.concatenate([curvature.take(range(1, axis.size), axis=dim), gap], axis=dim))
+        curvature = np.where(np.isnan(curvature), neighbour, curvature)
+        cell = np.r_[h, h[-1]].reshape((-1,) + (1,) * (values.ndim - dim - 1))
+        error += cell ** 2 * curvature / 8.0
+    return error
+
+
+def _error_scale(table: np.ndarray, grid: Mapping[str, np.ndarray], base: Mapping[str, float],
+                 metrics: Sequence[str]) -> np.ndarray:
+    """Factor per metric that makes the estimate cover the engine on a random sample."""
+    rng = np.random.default_rng(CALIBRATION_SEED)
+    axes = list(grid.values())
+    coords = [rng.uniform(axis[0], axis[-1], CALIBRATION_POINTS) for axis in axes]
+    interpolated = multilinear_interpolate(axes, table, coords)
+    design = run_design(dict(base, **dict(zip(grid, coords))))
+    scale = np.full(len(metrics), ERROR_SAFETY_FACTOR)
+    for m, metric in enumerate(metrics):
+        actual = np.abs(interpolated[:, 0, m] - design[metric])
+        estimate = interpolated[:, 1, m]
+        checked = (design['inflow_feasible'] & np.isfinite(actual) & np.isfinite(estimate)
+                   & (actual > CALIBRATION_FLOOR * ATLAS_TOLERANCES.get(metric, 0.0)))
+        if checked.any():
+            with np.errstate(divide='ignore'):
+                ratio = float(np.max(actual[checked] / estimate[checked]))
+            scale[m] = max(scale[m], CALIBRATION_MARGIN * ratio)
+    return scale
+
+
+class DesignAtlas:
+    """Memory-mapped design results with interpolated lookups."""
+
+    def __init__(self, base: Mapping[str, float], axes: Mapping[str, np.ndarray],
+                 table: np.ndarray, metrics: Sequence[str] = ATLAS_METRICS) -> None:
+        """``table`` has the grid axes then ``(2, metrics)``: values and error estimates."""
+        self.base = {key: float(value) for key, value in base.items()}
+        self.axis_names = tuple(axes)
+        self.axes = [np.asarray(axis, dtype=float) for axis in axes.values()]
+        self.table = table
+        self.metrics = tuple(metrics)
+        self._fixed_keys = [key for key in self.base if key not in self.axis_names]
+        self._fixed_values = np.array([self.base[key] for key in self._fixed_keys])
+        self._lower = [float(axis[0]) for axis in self.axes]
+        self._upper = [float(axis[-1]) for axis in self.axes]
+        # Single points are located with plain floats and read through an
+        # ndarray view of the table (same pages, without the memmap subclass).
+        self._axis_lists = [axis.tolist() for axis in self.axes]
+        self._axis_defaults = [float(DEFAULT_INPUTS.get(name, np.nan)) for name in self.axis_names]
+        self._fixed = [(key, float(DEFAULT_INPUTS[key]), fixed)
+                       for key, fixed in zip(self._fixed_keys, self._fixed_values.tolist())]
+        self._values = table.view(np.ndarray)
+
+    @classmethod
+    def load(cls, directory: Path) -> 'DesignAtlas':
+        """Open an atlas written by :func:`build_atlas` (arrays memory-mapped)."""
+        directory = Path(directory)
+        meta = json.loads((directory / "atlas.json").read_text(encoding='utf-8'))
+        if meta.get('version') != ATLAS_VERSION:
+            raise ValueError(f"Unsupported atlas version: {meta.get('version')}")
+        return cls(meta['base'], meta['axes'], np.load(directory / "atlas.npy", mmap_mode='r'),
+                   meta['metrics'])
+
+    def interpolate(self, p: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Interpolated metrics and error estimates for prepared inputs.
+
+        Returns:
+            Dict of metrics plus ``error_<metric>`` estimates and ``covered``
+            (inside the grid with all other inputs equal to the atlas base).
+        """
+        coords = np.broadcast_arrays(*[p[name] for name in self.axis_names])
+        covered = np.ones(coords[0].shape, dtype=bool)
+        for x, lower, upper in zip(coords, self._lower, self._upper):
+            covered &= (x >= lower) & (x <= upper)
+        interpolated = multilinear_interpolate(self.axes, self.table, coords)
+        values, error = interpolated[..., 0, :], interpolated[..., 1, :]
+        if self._fixed_keys:
+            fixed = np.stack(np.broadcast_arrays(*[p[key] for key in self._fixed_keys]), axis=-1)
+            covered &= np.all(np.isclose(fixed, self._fixed_values, rtol=1e-9, atol=1e-12), axis=-1)
+        result = {metric: values[..., i] for i, metric in enumerate(self.metrics)}
+        result.update({f"error_{metric}": error[..., i] for i, metric in enumerate(self.metrics)})
+        result['covered'] = covered
+        return result
+
+    def query(self, inputs: InputsLike = None,
+              tolerances: Optional[Mapping[str, float]] = None) -> Dict[str, Any]:
+        """Design metrics from the atlas, with the engine as fallback.
+
+        Args:
+            inputs: Inputs of any batch (missing keys take the defaults, so
+                pass the atlas base for the fixed inputs). A dict of scalars
+                is answered as a single point, without building a batch.
+            tolerances: Accepted error estimate per metric (defaults to
+                ``ATLAS_TOLERANCES``).
+
+        Returns:
+            Dict of metrics, ``error_estimate`` (largest estimate relative
+            to its tolerance; 0 for engine rows) and ``from_atlas``; plain
+            floats and a bool for a single point.
+        """
+        tolerances = dict(ATLAS_TOLERANCES, **(tolerances or {}))
+        if isinstance(inputs, Mapping) and all(isinstance(value, (int, float)) or np.ndim(value) == 0
+                                               for value in inputs.values()):
+            return self._query_point(inputs, tolerances)
+        p = prepare_inputs(inputs)
+        result = self.interpolate(p)
+        ratio = np.max([result[f"error_{metric}"] / tolerances[metric] for metric in self.metrics],
+                       axis=0)
+        finite = np.all([np.isfinite(result[metric]) for metric in self.metrics], axis=0)
+        from_atlas = result['covered'] & finite & (ratio <= 1.0)
+        output = {metric: np.array(result[metric], dtype=float) for metric in self.metrics}
+        output['error_estimate'] = np.where(from_atlas, ratio, 0.0)
+        output['from_atlas'] = from_atlas
+
+        fallback = ~from_atlas
+        if fallback.any():
+            design = run_design(take_inputs(p, fallback))
+            feasible = design['inflow_feasible']
+            for metric in self.metrics:
+                output[metric][fallback] = np.where(feasible, design[metric], np.nan)
+        return output
+
+    def _query_point(self, inputs: Mapping[str, Any],
+                     tolerances: Mapping[str, float]) -> Dict[str, Any]:
+        get = inputs.get
+        covered = all(math.isclose(float(get(key, default)), fixed, rel_tol=1e-9, abs_tol=1e-12)
+                      for key, default, fixed in self._fixed)
+        cell = []
+        # Corner weights in the C order of the cell block.
+        weights = [1.0]
+        for name, default, axis in zip(self.axis_names, self._axis_defaults, self._axis_lists):
+            if not covered:
+                break
+            x = float(get(name, default))
+            covered = axis[0] <= x <= axis[-1]
+            if len(axis) == 1:
+                cell.append(slice(0, 1))
+                continue
+            i = min(max(bisect_right(axis, x) - 1, 0), len(axis) - 2)
+            frac = (x - axis[i]) / (axis[i + 1] - axis[i])
+            cell.append(slice(i, i + 2))
+            weights = [w * f for w in weights for f in (1.0 - frac, frac)]
+        if covered:
+            block = self._values[tuple(cell)].reshape(len(weights), -1)
+            blended = np.dot(np.array(weights), block).tolist()
+            values, error = blended[:len(self.metrics)], blended[len(self.metrics):]
+            ratio = max(e / tolerances[metric] for e, metric in zip(error, self.metrics))
+            if ratio <= 1.0 and all(math.isfinite(v) for v in values):
+                output: Dict[str, Any] = dict(zip(self.metrics, values))
+                output.update(error_estimate=ratio, from_atlas=True)
+                return output
+        design = run_design(inputs)
+        feasible = bool(design['inflow_feasible'])
+        output = {metric: float(design[metric]) if feasible else float('nan') for metric in self.metrics}
+        output.update(error_estimate=0.0, from_atlas=False)
+        return output
+
+
+def build_atlas(directory: Path, axes: Mapping[str, Sequence[float]],
+                base: Optional[Mapping[str, Any]] = None,
+                metrics: Sequence[str] = ATLAS_METRICS) -> DesignAtlas:
+    """Evaluate ``run_design`` over the grid and store it under ``directory``.
+
+    Args:
+        directory: Target directory (created if needed).
+        axes: Input name -> sorted grid values, for any of ``ATLAS_AXES``
+            (or other inputs); grid order follows the mapping.
+        base: Values of all other inputs.
+        metrics: ``run_design`` outputs to tabulate.
+
+    The grid is evaluated one slice of the first axis at a time and
+    written straight into the memory-mapped file. Cells the reservoir
+    cannot deliver are stored as NaN. The error estimates are then scaled
+    per metric (see ``_error_scale``); the factors are kept in the
+    metadata as ``error_scale``.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    base_values = {key: float((base or {}).get(key, default)) for key, default in DEFAULT_INPUTS.items()}
+    grid = {name: np.asarray(values, dtype=float) for name, values in axes.items()}
+    for name, values in grid.items():
+        if name not in DEFAULT_INPUTS:
+            raise ValueError(f"Unknown input: {name}")
+        if values.ndim != 1 or np.any(np.diff(values) <= 0):
+            raise ValueError(f"Atlas axis {name} must be strictly increasing")
+    names = list(grid)
+    shape = tuple(values.size for values in grid.values())
+
+    table = np.lib.format.open_memmap(directory / "atlas.npy", mode='w+', dtype=np.float64,
+                                      shape=shape + (2, len(metrics)))
+    rest = np.meshgrid(*[grid[name] for name in names[1:]], indexing='ij')
+    for i, first in enumerate(grid[names[0]]):
+        inputs = dict(base_values, **{names[0]: first}, **dict(zip(names[1:], rest)))
+        design = run_design(inputs)
+        for m, metric in enumerate(metrics):
+            table[i, ..., 0, m] = np.where(design['inflow_feasible'], design[metric], np.nan)
+    for m in range(len(metrics)):
+        table[..., 1, m] = _second_difference_error(np.asarray(table[..., 0, m]), list(grid.values()))
+    scale = _error_scale(table, grid, base_values, metrics)
+    table[..., 1, :] *= scale
+    table.flush()
+    meta = {
+        'version': ATLAS_VERSION,
+        'base': {key: value for key, value in base_values.items() if key not in grid},
+        'axes': {name: grid[name].tolist() for name in names},
+        'metrics': list(metrics),
+        'error_scale': scale.tolist(),
+    }
+    (directory / "atlas.json").write_text(json.dumps(meta, ensure_ascii=False, indent=1),
+                                          encoding='utf-8')
+    del table
+    return DesignAtlas.load(directory)
@@ -0,0 +1,202 @@
+"""Branch-and-bound search for the cheapest complete ESP bundle of a well.
+
+A bundle is a separator, a pump (with its stage count), a motor and a
+cable. The search levels are:
+
+1. separator × pump: free gas left after separation, staging at the design
+   point, pump operating range, stage limit (head bound) and cavitation
+   margin, all as one ``(separators, pumps)`` array;
+2. supply voltage: a lower bound on the lifecycle cost from the shaft power
+   alone (best motor efficiency, no cable losses), the cheapest motor at the
+   voltage that can carry it and the cheapest cable whose resistance keeps
+   the voltage drop within limits (binary searches in the sorted catalogs of
+   ``core.equipment``);
+3. motor × cable: the exact cost of each remaining pair, among the motors
+   that pass the cooling and winding-temperature check of
+   ``core.cooling`` (computed for all pumps and motors in one array up
+   front).
+
+Nodes are expanded in order of their lower bound and the search stops once
+the bound reaches the best complete bundle, so most of the cross-product
+is never evaluated.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from core.catalog import catalog_arrays
+from core.cooling import CASING_ID_MM, motor_temperatures
+from core.cavitation import STATUS_DANGER, npsh_margin, npsh_required
+from core.engine import (MOTOR_POWER_MARGIN, InputsLike, batch_size, calculate_staging,
+                         prepare_inputs, run_design, void_fraction_and_rate)
+from core.equipment import CableIndex, MotorIndex, cable_arrays, motor_arrays
+from core.motor import (COPPER_TEMP_COEFF, ENERGY_PRICE_PER_KWH, HOURS_PER_YEAR, MAX_VOLTAGE_DROP,
+                        SERVICE_YEARS)
+from core.viscosity import viscosity_corrections
+
+# ``efficiency`` None takes the well's ``separatorEfficiency`` input, %.
+SEPARATOR_CATALOG = [
+    {'name': "Без сепаратора", 'efficiency': 0.0, 'pressure_loss_atm': 0.0, 'price': 0.0},
+    {'name': "Газосепаратор", 'efficiency': None, 'pressure_loss_atm': 0.5, 'price': 6000.0},
+]
+
+# Rough pump cost per stage for catalogs without prices, $.
+PUMP_COST_PER_STAGE = 120.0
+
+
+def _group_suffix_min(index: MotorIndex, price: np.ndarray) -> np.ndarray:
+    """Cheapest price from each sorted position to the end of its voltage group."""
+    sorted_price = price[index.order]
+    result = np.empty_like(sorted_price)
+    start = 0
+    for end in index.group_end:
+        result[start:end] = np.minimum.accumulate(sorted_price[start:end][::-1])[::-1]
+        start = end
+    return result
+
+
+def optimize_bundle(inputs: InputsLike = None,
+                    pumps: Optional[Sequence[Mapping[str, Any]]] = None,
+                    motors: Optional[Sequence[Mapping[str, Any]]] = None,
+                    cables: Optional[Sequence[Mapping[str, Any]]] = None,
+                    separators: Optional[Sequence[Mapping[str, Any]]] = None,
+                    max_stages: float = np.inf,
+                    max_voltage_drop: float = MAX_VOLTAGE_DROP,
+                    energy_price: float = ENERGY_PRICE_PER_KWH,
+                    service_years: float = SERVICE_YEARS,
+                    casing_id_mm: float = CASING_ID_MM,
+                    thermal_check: bool = True) -> Dict[str, Any]:
+    """Cheapest feasible bundle (lifecycle cost) for one well.
+
+    Catalogs default to the built-in pump, motor, cable and separator
+    lists. ``max_stages`` (or a ``max_stages`` catalog column) bounds the
+    head a pump can develop. The motor runs at its rated voltage; the cable
+    length is the pump depth and its temperature the intake temperature.
+    With ``thermal_check`` motors that are cooled too slowly in a casing of
+    ``casing_id_mm`` or whose windings overheat are left out.
+
+    Returns:
+        Dict with ``best`` (``None`` if nothing is feasible, otherwise the
+        chosen separator/pump/motor/cable names, stages, voltage, powers,
+        voltage drop, winding temperature, capex and lifecycle cost), ``cross_product`` (number
+        of complete bundles) and ``evaluated`` (bundles actually costed).
+    """
+    p = prepare_inputs(inputs)
+    if batch_size(p) != 1:
+        raise ValueError("optimize_bundle expects the inputs of a single well")
+    p = {key: value.reshape(()) for key, value in p.items()}
+    pumps_a = catalog_arrays(pumps)
+    motors_a = motor_arrays(motors)
+    cables_a = cable_arrays(cables)
+    separators = SEPARATOR_CATALOG if separators is None else separators
+    motor_index = MotorIndex.from_arrays(motors_a)
+    cable_index = CableIndex.from_arrays(cables_a)
+
+    # Level 1: separator x pump.
+    design = run_design(p)
+    void = void_fraction_and_rate(design['pip_atm'], design['temp_bottom_c'], p['targetFlowRate'], p)
+    sep_eff = np.array([p['separatorEfficiency'] if s.get('efficiency') is None else s['efficiency']
+                        for s in separators], dtype=float) / 100.0
+    sep_loss = np.array([s.get('pressure_loss_atm', 0.0) for s in separators], dtype=float)
+    sep_price = np.array([s.get('price', 0.0) for s in separators], dtype=float)
+    gas = void['gas_rate'] * (1.0 - sep_eff)
+    q = void['total_rate'] - void['gas_rate'] + gas
+    vf = np.divide(gas, q, out=np.zeros_like(q), where=q > 0) * 100.0
+
+    factors = viscosity_corrections(p, pumps_a, q)
+    pump_p = {key: value[..., None, None] for key, value in p.items()}
+    pump_p['viscCorrHead'] = pump_p['viscCorrHead'] * factors['c_h']
+    pump_p['viscCorrEff'] = pump_p['viscCorrEff'] * factors['c_eff']
+    sp_design = {'void_fraction': vf[:, None], 'downhole_q_m3': q[:, None],
+                 'tdh_m': design['tdh_m'][..., None, None]}
+    staging = calculate_staging(sp_design, pump_p, pumps_a)
+    stages = staging['stages']
+    shaft = staging['shaft_power_kw']
+    in_range = ((q[:, None] >= pumps_a['min_q_m3'] * factors['c_q'])
+                & (q[:, None] <= pumps_a['max_q_m3'] * factors['c_q']))
+    cavitation = npsh_margin(design['pip_atm'], design['temp_bottom_c'], p['bubblePointPressure'],
+                             sep_loss[:, None], npsh_required(pumps_a, q[:, None] / factors['c_q']))
+    feasible_sp = (in_range & (stages <= pumps_a.get('max_stages', max_stages))
+                   & (cavitation['status'] != STATUS_DANGER) & np.isfinite(shaft))
+    pump_cost = stages * pumps_a.get('price_per_stage', PUMP_COST_PER_STAGE)
+    fixed_cost = sep_price[:, None] + pump_cost
+
+    # (separators, pumps, motors): the motor sits below the separator in the full stream.
+    thermal = motor_temperatures(shaft, void['total_rate'], design['temp_bottom_c'], p, motors_a,
+                                 casing_id_mm)
+    motor_ok = thermal['ok'] if thermal_check else np.ones(thermal['ok'].shape, dtype=bool)
+
+    # Level 2: supply voltage, with lower bounds on motor and cable cost.
+    length_km = p['pumpDepth'] / 1000.0
+    r_factor = (1.0 + COPPER_TEMP_COEFF * (design['temp_bottom_c'] - 20.0)) * length_km
+    hours = HOURS_PER_YEAR * service_years
+    voltages = motor_index.voltages
+    motor_floor = _group_suffix_min(motor_index, motors_a['price'])
+    cable_floor = np.minimum.accumulate(cables_a['price_per_km'][cable_index.order])
+
+    min_input = shaft[..., None] / motors_a['efficiency'].max()
+    need_kw = min_input * MOTOR_POWER_MARGIN
+    group = np.arange(voltages.size)
+    position = np.searchsorted(motor_index.keys, group * motor_index.scale + need_kw)
+    has_motor = position < motor_index.group_end
+    motor_lb = np.where(has_motor, motor_floor[np.minimum(position, motor_floor.size - 1)], np.inf)
+    current_lb = min_input * 1000.0 / (np.sqrt(3) * voltages * motors_a['power_factor'].max())
+    r_allowed = max_voltage_drop * voltages / (np.sqrt(3) * np.maximum(current_lb, 1e-12) * r_factor)
+    count = cable_index.count_at_most(r_allowed)
+    cable_lb = np.where(count > 0, cable_floor[np.maximum(count - 1, 0)] * length_km, np.inf)
+    bound = fixed_cost[..., None] + motor_lb + cable_lb + min_input * hours * energy_price
+    bound = np.where(feasible_sp[..., None], bound, np.inf)
+
+    # Level 3: expand motor x cable pairs in order of the bound.
+    best: Optional[Dict[str, Any]] = None
+    best_cost = np.inf
+    evaluated = 0
+    for node in np.argsort(bound, axis=None, kind='stable'):
+        if bound.flat[node] >= best_cost:
+            break
+        s, k, v = np.unravel_index(node, bound.shape)
+        motor_ids = motor_index.order[position[s, k, v]:motor_index.group_end[v]]
+        cable_ids = cable_index.order[:count[s, k, v]]
+        evaluated += motor_ids.size * cable_ids.size
+
+        motor_input = shaft[s, k] / motors_a['efficiency'][motor_ids][:, None]
+        current = motor_input * 1000.0 / (np.sqrt(3) * voltages[v]
+                                          * motors_a['power_factor'][motor_ids][:, None])
+        resistance = cables_a['r20_ohm_km'][cable_ids][None, :] * r_factor
+        losses = 3 * current ** 2 * resistance / 1000.0
+        drop = np.sqrt(3) * current * resistance
+        input_kw = motor_input + losses
+        ok = ((motors_a['power_kw'][motor_ids][:, None] >= input_kw * MOTOR_POWER_MARGIN)
+              & (drop <= max_voltage_drop * voltages[v]) & motor_ok[s, k, motor_ids][:, None])
+        capex = (fixed_cost[s, k] + motors_a['price'][motor_ids][:, None]
+                 + cables_a['price_per_km'][cable_ids][None, :] * length_km)
+        cost = np.where(ok, capex + input_kw * hours * energy_price, np.inf)
+        m, c = np.unravel_index(np.argmin(cost), cost.shape)
+        if cost[m, c] < best_cost:
+            best_cost = float(cost[m, c])
+            best = {
+                'separator': separators[s].get('name', str(s)),
+                'pump': pumps_a['name'][k],
+                'stages': float(stages[s, k]),
+                'motor': motors_a['model'][motor_ids[m]],
+                'motor_power_kw': float(motors_a['power_kw'][motor_ids[m]]),
+                'voltage_v': float(voltages[v]),
+                'cable': cables_a['model'][cable_ids[c]],
+                'void_fraction': float(vf[s]),
+                'shaft_power_kw': float(shaft[s, k]),
+                'input_power_kw': float(input_kw[m, c]),
+                'voltage_drop_v': float(drop[m, c]),
+                'winding_temp_c': float(thermal['winding_temp_c'][s, k, motor_ids[m]]),
+                'cooling_velocity_m_s': float(thermal['velocity_m_s'][..., motor_ids[m]]),
+                'capex': float(capex[m, c]),
+                'lifecycle_cost': best_cost,
+            }
+    return {
+        'best': best,
+        'cross_product': len(separators) * pumps_a['name'].size * motors_a['power_kw'].size
+                         * cables_a['r20_ohm_km'].size,
+        'evaluated': evaluated,
+    }
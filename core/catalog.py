@@ -0,0 +1,118 @@
+"""Pump catalog in columnar form for the batch engine.
+
+``BORETS_CATALOG`` is the built-in catalog of the HTML page. Catalog rows
+(either that schema or ``PumpManager`` pumps) are converted into a dict of
+NumPy columns, and ``PumpEnvelopeIndex`` answers "first catalog pump whose
+operating range contains Q" for whole arrays of rates by binary search.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from core.cavitation import npsh_curve_columns
+from core.gas import DEFAULT_GAS_TOLERANCE, tolerance_codes
+
+BORETS_CATALOG: List[Dict[str, Any]] = [
+    {'id': 0, 'name': "ЭЦНД 3-50", 'group': "3", 'nominal_q_m3': 50, 'min_q_m3': 25, 'max_q_m3': 70, 'head_per_stage_m': 8.2, 'base_eff': 0.60, 'npsh_req': 3.0, 'gas_tolerance': "Низкая"},
+    {'id': 1, 'name': "ЭЦНД 3-80", 'group': "3", 'nominal_q_m3': 80, 'min_q_m3': 40, 'max_q_m3': 110, 'head_per_stage_m': 7.8, 'base_eff': 0.62, 'npsh_req': 3.5, 'gas_tolerance': "Низкая"},
+    {'id': 2, 'name': "ЭЦНД 5-80", 'group': "5", 'nominal_q_m3': 80, 'min_q_m3': 40, 'max_q_m3': 110, 'head_per_stage_m': 7.8, 'base_eff': 0.62, 'npsh_req': 3.5, 'gas_tolerance': "Средняя"},
+    {'id': 3, 'name': "ЭЦНД 5-125", 'group': "5", 'nominal_q_m3': 125, 'min_q_m3': 70, 'max_q_m3': 160, 'head_per_stage_m': 7.1, 'base_eff': 0.65, 'npsh_req': 4.2, 'gas_tolerance': "Средняя"},
+    {'id': 4, 'name': "ЭЦНД 5А-100", 'group': "5А", 'nominal_q_m3': 100, 'min_q_m3': 50, 'max_q_m3': 130, 'head_per_stage_m': 7.5, 'base_eff': 0.68, 'npsh_req': 3.8, 'gas_tolerance': "Высокая"},
+    {'id': 5, 'name': "ЭЦНД 5-160", 'group': "5", 'nominal_q_m3': 160, 'min_q_m3': 80, 'max_q_m3': 200, 'head_per_stage_m': 6.8, 'base_eff': 0.66, 'npsh_req': 5.0, 'gas_tolerance': "Средняя"},
+    {'id': 6, 'name': "ЭЦНД 6-125", 'group': "6", 'nominal_q_m3': 125, 'min_q_m3': 60, 'max_q_m3': 170, 'head_per_stage_m': 8.0, 'base_eff': 0.64, 'npsh_req': 4.0, 'gas_tolerance': "Средняя"},
+    {'id': 7, 'name': "ЭЦНД 6-200", 'group': "6", 'nominal_q_m3': 200, 'min_q_m3': 100, 'max_q_m3': 250, 'head_per_stage_m': 7.2, 'base_eff': 0.67, 'npsh_req': 4.8, 'gas_tolerance': "Средняя"},
+    {'id': 8, 'name': "ЭЦНД 7-250", 'group': "7", 'nominal_q_m3': 250, 'min_q_m3': 120, 'max_q_m3': 320, 'head_per_stage_m': 6.5, 'base_eff': 0.65, 'npsh_req': 5.5, 'gas_tolerance': "Низкая"},
+    {'id': 9, 'name': "ЭЦНД 8-320", 'group': "8", 'nominal_q_m3': 320, 'min_q_m3': 160, 'max_q_m3': 400, 'head_per_stage_m': 6.0, 'base_eff': 0.66, 'npsh_req': 6.0, 'gas_tolerance': "Низкая"},
+]
+
+NUMERIC_COLUMNS = ('nominal_q_m3', 'min_q_m3', 'max_q_m3', 'head_per_stage_m', 'base_eff', 'npsh_req')
+TEXT_COLUMNS = ('name', 'group', 'gas_tolerance')
+
+CatalogArrays = Dict[str, np.ndarray]
+
+
+def normalize_pump(pump: Mapping[str, Any]) -> Dict[str, Any]:
+    """Map a catalog row (JS schema or PumpManager schema) to the JS schema."""
+    row = dict(pump)
+    row.setdefault('name', row.get('model', ''))
+    row.setdefault('group', '')
+    if 'head_per_stage_m' not in row:
+        stages = max(float(row.get('stages', 1) or 1), 1.0)
+        row['head_per_stage_m'] = float(row.get('nominal_head_m', 0.0)) / stages
+    if 'base_eff' not in row:
+        efficiency = float(row.get('efficiency', 60.0))
+        row['base_eff'] = efficiency / 100.0 if efficiency > 1 else efficiency
+    row.setdefault('npsh_req', 3.0)
+    row.setdefault('gas_tolerance', DEFAULT_GAS_TOLERANCE)
+    return row
+
+
+def catalog_arrays(pumps: Optional[Sequence[Mapping[str, Any]]] = None) -> CatalogArrays:
+    """Columnar view of a catalog; defaults to ``BORETS_CATALOG``."""
+    rows = [normalize_pump(pump) for pump in (BORETS_CATALOG if pumps is None else pumps)]
+    arrays: CatalogArrays = {
+        column: np.array([float(row[column]) for row in rows], dtype=float)
+        for column in NUMERIC_COLUMNS
+    }
+    for column in TEXT_COLUMNS:
+        arrays[column] = np.array([str(row[column]) for row in rows], dtype=object)
+    arrays['gas_tolerance_code'] = tolerance_codes(arrays['gas_tolerance'])
+    arrays.update(npsh_curve_columns(rows))
+    return arrays
+
+
+def numeric_columns(arrays: CatalogArrays) -> CatalogArrays:
+    """Catalog columns that can live in shared memory (no text)."""
+    return {key: value for key, value in arrays.items() if value.dtype != object}
+
+
+def take_pumps(arrays: CatalogArrays, index: np.ndarray) -> CatalogArrays:
+    """Per-element pump fields for an array of catalog indices (clipped to valid rows)."""
+    safe = np.clip(index, 0, max(len(arrays['min_q_m3']) - 1, 0))
+    return {column: values[safe] for column, values in arrays.items()}
+
+
+class PumpEnvelopeIndex:
+    """First catalog pump (in catalog order) whose [min_q, max_q] contains a rate.
+
+    The rate axis is cut at every range endpoint; the answer is precomputed
+    for each endpoint and each open interval between them, so a lookup is
+    one ``searchsorted`` regardless of catalog size.
+    """
+
+    def __init__(self, min_q: np.ndarray, max_q: np.ndarray) -> None:
+        self.min_q = np.asarray(min_q, dtype=float)
+        self.max_q = np.asarray(max_q, dtype=float)
+        self.breakpoints = np.unique(np.concatenate([self.min_q, self.max_q]))
+        mids = 0.5 * (self.breakpoints[:-1] + self.breakpoints[1:])
+        self.at_point = self._first_cover(self.breakpoints)
+        self.in_interval = self._first_cover(mids)
+
+    @classmethod
+    def from_arrays(cls, arrays: CatalogArrays) -> 'PumpEnvelopeIndex':
+        return cls(arrays['min_q_m3'], arrays['max_q_m3'])
+
+    def _first_cover(self, q: np.ndarray) -> np.ndarray:
+        covers = (q[:, None] >= self.min_q[None, :]) & (q[:, None] <= self.max_q[None, :])
+        return np.where(covers.any(axis=1), covers.argmax(axis=1), -1)
+
+    def lookup(self, q_m3: np.ndarray) -> np.ndarray:
+        """Catalog index per rate, -1 where no pump fits."""
+        q = np.asarray(q_m3, dtype=float)
+        n = self.breakpoints.size
+        if n == 0:
+            return np.full(q.shape, -1)
+        point = np.clip(np.searchsorted(self.breakpoints, q, side='left'), 0, n - 1)
+        exact = self.breakpoints[point] == q
+        interval = np.searchsorted(self.breakpoints, q, side='right') - 1
+        inside = (interval >= 0) & (interval < n - 1)
+        from_interval = self.in_interval[np.clip(interval, 0, max(n - 2, 0))] if n > 1 else -1
+        return np.where(exact, self.at_point[point], np.where(inside, from_interval, -1))
+
+    def contains(self, index: np.ndarray, q_m3: np.ndarray) -> np.ndarray:
+        """Whether pump ``index`` keeps rate ``q_m3`` inside its operating range."""
+        safe = np.clip(index, 0, self.min_q.size - 1)
+        return (index >= 0) & (q_m3 >= self.min_q[safe]) & (q_m3 <= self.max_q[safe])
@@ -0,0 +1,164 @@
+"""NPSH margin and cavitation status as array operations.
+
+Same formulas as ``CavitationTab._calculate_npsh``: vapor pressure from the
+Antoine equation (clamped to [0.03, Pb]), NPSH available as the pump inlet
+pressure minus vapor pressure, and the status from the margin over the
+required NPSH. ``npsh_map`` evaluates them over a PIP × intake temperature
+grid, optionally for several pumps at once. Catalog pumps may carry NPSHr(Q)
+curves, stored as padded segment coefficients for vectorized evaluation.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Antoine coefficients for hydrocarbons (mm Hg, °C), as in the cavitation tab.
+ANTOINE_A = 6.834
+ANTOINE_B = 948.2
+ANTOINE_C = 239.7
+MM_HG_PER_ATM = 760.0
+MIN_VAPOR_PRESSURE_ATM = 0.03
+
+# Status codes in order of increasing margin.
+STATUS_DANGER = 0
+STATUS_WARNING = 1
+STATUS_SAFE = 2
+CAVITATION_STATUSES = ("ОПАСНО", "ВНИМАНИЕ", "БЕЗОПАСНО")
+STATUS_COLORS = ("red", "orange", "green")
+MARGIN_THRESHOLDS = (0.5, 1.0)
+
+
+def vapor_pressure(temp_c: np.ndarray, pb_atm: np.ndarray) -> np.ndarray:
+    """Vapor pressure, atm, limited to [0.03, Pb]."""
+    pv_atm = 10.0 ** (ANTOINE_A - ANTOINE_B / (np.asarray(temp_c, dtype=float) + ANTOINE_C)) / MM_HG_PER_ATM
+    return np.minimum(pb_atm, np.maximum(MIN_VAPOR_PRESSURE_ATM, pv_atm))
+
+
+def status_codes(margin: np.ndarray) -> np.ndarray:
+    """Cavitation status code per margin value; an unknown (NaN) margin is "ОПАСНО"."""
+    margin = np.asarray(margin, dtype=float)
+    codes = np.digitize(margin, MARGIN_THRESHOLDS)
+    return np.where(np.isnan(margin), STATUS_DANGER, codes).astype(np.int8)
+
+
+def npsh_margin(pip_atm: np.ndarray, temp_c: np.ndarray, pb_atm: np.ndarray,
+                separator_loss: np.ndarray, npsh_req: np.ndarray) -> Dict[str, np.ndarray]:
+    """NPSH available, margin and status for broadcast arrays of operating points."""
+    vapor = vapor_pressure(temp_c, pb_atm)
+    inlet = np.asarray(pip_atm, dtype=float) - separator_loss
+    available = inlet - vapor
+    margin = available - npsh_req
+    return {
+        'vapor_pressure': vapor,
+        'pump_inlet_pressure': inlet,
+        'npsh_available': available,
+        'cavitation_margin': margin,
+        'status': status_codes(margin),
+    }
+
+
+def npsh_map(pb_atm: float, separator_loss: float = 0.5, npsh_req=3.0,
+             pip_grid: Optional[np.ndarray] = None,
+             temp_grid: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Margin and status over a ``(temperature, PIP)`` grid.
+
+    ``npsh_req`` may be an array (e.g. every candidate pump's NPSHr); the
+    outputs then get a leading pump axis, ``(pumps, temperatures, pips)``.
+    Vapor pressure is evaluated once per temperature. ``min_safe_pip`` is
+    the lowest PIP with a "БЕЗОПАСНО" status at each temperature.
+    """
+    pip_grid = np.linspace(0.0, max(2.0 * pb_atm, 50.0), 201) if pip_grid is None else pip_grid
+    temp_grid = np.linspace(0.0, 150.0, 151) if temp_grid is None else temp_grid
+    pip_grid = np.asarray(pip_grid, dtype=float)
+    temp_grid = np.asarray(temp_grid, dtype=float)
+    required = np.asarray(npsh_req, dtype=float)[..., None, None]
+
+    vapor = vapor_pressure(temp_grid, pb_atm)[:, None]
+    available = (pip_grid[None, :] - separator_loss) - vapor
+    margin = available - required
+    return {
+        'pip_grid': pip_grid,
+        'temp_grid': temp_grid,
+        'vapor_pressure': vapor[:, 0],
+        'npsh_available': available,
+        'cavitation_margin': margin,
+        'status': status_codes(margin),
+        'min_safe_pip': vapor[:, 0] + separator_loss + required[..., 0] + MARGIN_THRESHOLDS[1],
+    }
+
+
+# Catalog columns of the NPSHr(Q) curves, see ``npsh_curve_columns``.
+NPSH_CURVE_COLUMNS = ('npsh_q_m3', 'npsh_slope', 'npsh_intercept')
+
+
+def parse_npsh_curve(curve: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Rates and NPSHr of a curve given as ``(q, npsh)`` pairs, a ``{'q_m3', 'npsh_m'}``
+    dict or a ``"q:npsh; q:npsh"`` string, sorted by rate."""
+    if isinstance(curve, str):
+        curve = [point.split(':') for point in curve.replace(',', '.').split(';') if point.strip()]
+    if isinstance(curve, Mapping):
+        q, npsh = curve['q_m3'], curve['npsh_m']
+    else:
+        points = np.asarray(curve, dtype=float).reshape(-1, 2)
+        q, npsh = points[:, 0], points[:, 1]
+    q = np.asarray(q, dtype=float)
+    order = np.argsort(q, kind='stable')
+    return q[order], np.asarray(npsh, dtype=float)[order]
+
+
+def format_npsh_curve(curve: Any) -> str:
+    """Curve as the ``"q:npsh; q:npsh"`` string read back by ``parse_npsh_curve``."""
+    q, npsh = parse_npsh_curve(curve)
+    return "; ".join(f"{rate:.10g}:{value:.10g}" for rate, value in zip(q, npsh))
+
+
+def npsh_curve_columns(pumps: Sequence[Mapping[str, Any]]) -> Dict[str, np.ndarray]:
+    """Piecewise-linear NPSHr(Q) curves of a catalog as padded coefficient arrays.
+
+    Each pump contributes its ``npsh_curve`` (see ``parse_npsh_curve``) or,
+    without one, a flat curve at ``npsh_req`` over ``[min_q_m3, max_q_m3]``.
+    Knots are padded to a common count by repeating the last one, so the
+    catalog holds three ``(pumps, knots)`` arrays: knot rates plus the slope
+    and intercept of the segment starting at each knot.
+    """
+    curves = []
+    for pump in pumps:
+        if pump.get('npsh_curve') is not None:
+            q, npsh = parse_npsh_curve(pump['npsh_curve'])
+        else:
+            q = np.array([pump['min_q_m3'], pump['max_q_m3']], dtype=float)
+            npsh = np.full(2, float(pump['npsh_req']))
+        curves.append((q, npsh))
+    knots = max([2] + [q.size for q, _ in curves])
+    q_knots = np.zeros((len(curves), knots))
+    slope = np.zeros_like(q_knots)
+    intercept = np.zeros_like(q_knots)
+    for i, (q, npsh) in enumerate(curves):
+        q = np.concatenate([q, np.repeat(q[-1:], knots - q.size)])
+        npsh = np.concatenate([npsh, np.repeat(npsh[-1:], knots - npsh.size)])
+        dq = np.diff(q)
+        seg_slope = np.divide(np.diff(npsh), dq, out=np.zeros_like(dq), where=dq > 0)
+        q_knots[i] = q
+        slope[i, :-1] = seg_slope
+        intercept[i, :-1] = npsh[:-1] - seg_slope * q[:-1]
+        intercept[i, -1] = npsh[-1]
+    return {'npsh_q_m3': q_knots, 'npsh_slope': slope, 'npsh_intercept': intercept}
+
+
+def npsh_required(columns: Mapping[str, np.ndarray], q_m3: np.ndarray) -> np.ndarray:
+    """NPSHr of every pump at its own rate, shape ``(..., pumps)``.
+
+    ``columns`` holds the ``npsh_curve_columns`` arrays (e.g. catalog
+    arrays, or rows taken per element with ``take_pumps``); ``q_m3``
+    broadcasts against their leading axes. Rates outside a curve are held
+    at its end points.
+    """
+    knots = columns['npsh_q_m3']
+    q = np.clip(np.asarray(q_m3, dtype=float), knots[..., 0], knots[..., -1])
+    segment = (q[..., None] > knots[..., 1:-1]).sum(axis=-1)[..., None]
+    shape = segment.shape[:-1] + knots.shape[-1:]
+    slope = np.take_along_axis(np.broadcast_to(columns['npsh_slope'], shape), segment, axis=-1)
+    intercept = np.take_along_axis(np.broadcast_to(columns['npsh_intercept'], shape), segment, axis=-1)
+    return intercept[..., 0] + slope[..., 0] * q
@@ -0,0 +1,31 @@
+"""Chunked evaluation shared by the batch modes.
+
+Large batches are split into fixed-size chunks, each with its own child of
+one ``SeedSequence`` where randomness is involved, and evaluated in order,
+optionally in a process pool. Results do not depend on the number of
+workers.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+
+def chunk_plan(n: int, chunk_size: int, root: np.random.SeedSequence) -> List[tuple]:
+    """Chunk sizes paired with independent child seeds of ``root``."""
+    sizes = [chunk_size] * (n // chunk_size)
+    if n % chunk_size:
+        sizes.append(n % chunk_size)
+    children = root.spawn(len(sizes))
+    return list(zip(sizes, children))
+
+
+def map_chunks(func, tasks: Sequence[Any], workers: Optional[int] = None) -> List[Any]:
+    """Evaluate chunk tasks in order, in a process pool when ``workers > 1``."""
+    if workers is None or workers <= 1 or len(tasks) <= 1:
+        return [func(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, tasks))
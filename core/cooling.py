@@ -0,0 +1,105 @@
+"""Motor cooling and winding temperature for every candidate motor at once.
+
+The well fluid flowing up the annulus between the casing and the motor
+housing carries away the motor losses. For a shaft load and each motor:
+
+* velocity past the motor: downhole rate over the annulus area;
+* fluid heat rise: losses over ``mass rate × c_p`` of the liquid;
+* housing film rise: losses over ``h × surface``, with the film
+  coefficient growing as ``v^0.8`` (turbulent forced convection) and the
+  housing length estimated from the rated power per metre of a motor of
+  that diameter when the catalog does not give it;
+* winding rise above the housing in proportion to the motor load (shaft
+  power over the rated output).
+
+The winding temperature is the intake temperature plus the three rises.
+Arrays carry a trailing motor axis, so a whole catalog is checked against
+any batch of loads in one pass.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping
+
+import numpy as np
+
+from core.engine import SECONDS_PER_DAY, InputArrays
+from core.temperature import OIL_HEAT_CAPACITY_J_KGK, WATER_HEAT_CAPACITY_J_KGK
+
+# Inner diameter of a 146 mm production casing, mm.
+CASING_ID_MM = 130.0
+# Below ~1 ft/s past the housing the motor overheats.
+MIN_COOLING_VELOCITY_M_S = 0.3
+MAX_WINDING_TEMP_C = 160.0
+# Winding temperature above the housing at full load, °C.
+WINDING_RISE_RATED_C = 30.0
+# Film coefficient at 1 m/s, W/(m²·K).
+FILM_COEFF_W_M2K = 1500.0
+# Rated power per metre of housing for a 117 mm motor; scales with OD².
+POWER_PER_LENGTH_KW_M = 12.0
+REFERENCE_OD_MM = 117.0
+
+
+def _trailing(value: Any) -> np.ndarray:
+    return np.asarray(value, dtype=float)[..., None]
+
+
+def motor_length(motors: Mapping[str, np.ndarray]) -> np.ndarray:
+    """Housing length of each motor, m (catalog ``length_m`` where known)."""
+    estimate = motors['power_kw'] / (POWER_PER_LENGTH_KW_M * (motors['od_mm'] / REFERENCE_OD_MM) ** 2)
+    length = motors.get('length_m')
+    return estimate if length is None else np.where(np.isfinite(length), length, estimate)
+
+
+def motor_temperatures(shaft_kw: Any, downhole_q_m3: Any, intake_temp_c: Any,
+                       p: InputArrays, motors: Mapping[str, np.ndarray],
+                       casing_id_mm: Any = CASING_ID_MM,
+                       min_velocity: float = MIN_COOLING_VELOCITY_M_S) -> Dict[str, np.ndarray]:
+    """Cooling and winding temperature of every motor, shape ``(..., motors)``.
+
+    Args:
+        shaft_kw: Shaft load of the pump(s), kW.
+        downhole_q_m3: In-situ rate flowing past the motor, m³/сут.
+        intake_temp_c: Fluid temperature arriving at the motor, °C.
+        p: Prepared inputs (liquid density, water cut, surface rate),
+            broadcasting with ``shaft_kw``.
+        motors: Motor catalog columns (see ``core.equipment.motor_arrays``).
+        casing_id_mm: Casing inner diameter, mm.
+        min_velocity: Smallest acceptable velocity past the housing, m/s.
+
+    Returns:
+        Dict with ``velocity_m_s``, ``heat_loss_kw``, ``fluid_rise_c``,
+        ``film_rise_c``, ``winding_temp_c``, ``load`` and ``ok`` (the motor
+        fits in the casing, is cooled fast enough and stays below its
+        ``max_winding_temp_c``).
+    """
+    shaft = _trailing(shaft_kw)
+    casing_m = _trailing(casing_id_mm) / 1000.0
+    od_m = motors['od_mm'] / 1000.0
+    annulus = np.pi / 4.0 * (casing_m ** 2 - od_m ** 2)
+    fits = annulus > 0
+    flow_m3_s = _trailing(downhole_q_m3) / SECONDS_PER_DAY
+    velocity = np.where(fits, flow_m3_s / np.where(fits, annulus, 1.0), 0.0)
+
+    losses_kw = shaft * (1.0 / motors['efficiency'] - 1.0)
+    wc = _trailing(p['waterCut']) / 100.0
+    heat_capacity = wc * WATER_HEAT_CAPACITY_J_KGK + (1.0 - wc) * OIL_HEAT_CAPACITY_J_KGK
+    liquid_q = _trailing(p['targetFlowRate']) * _trailing(p['boFactor'])
+    mass_rate = liquid_q * _trailing(p['liquidDensity']) / SECONDS_PER_DAY
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fluid_rise = losses_kw * 1000.0 / (mass_rate * heat_capacity)
+        film = FILM_COEFF_W_M2K * velocity ** 0.8
+        film_rise = losses_kw * 1000.0 / (film * np.pi * od_m * motor_length(motors))
+    load = shaft / motors['power_kw']
+    winding = _trailing(intake_temp_c) + fluid_rise + film_rise + WINDING_RISE_RATED_C * load
+    winding = np.where(np.isfinite(winding), winding, np.inf)
+    limit = motors.get('max_winding_temp_c', MAX_WINDING_TEMP_C)
+    return {
+        'velocity_m_s': velocity,
+        'heat_loss_kw': losses_kw,
+        'fluid_rise_c': fluid_rise,
+        'film_rise_c': film_rise,
+        'winding_temp_c': winding,
+        'load': load,
+        'ok': fits & (velocity >= min_velocity) & (winding <= limit),
+    }
@@ -0,0 +1,267 @@
+"""Batch Arps decline-curve fitting from monthly production history.
+
+A long-format history table (one row per well and month) is packed into
+padded ``(wells, months)`` arrays. Exponential, hyperbolic and harmonic
+models are fitted to every well at once: linearized least squares give the
+initial guesses (log-rate, ``q^-b`` over a grid of ``b``, and ``1/q``),
+then a batched Levenberg-Marquardt refines them on the rate residuals.
+Wells are processed in chunks, optionally in a process pool.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from core.chunks import map_chunks
+
+DECLINE_MODELS = ('exponential', 'hyperbolic', 'harmonic')
+MIN_POINTS = {'exponential': 2, 'hyperbolic': 3, 'harmonic': 2}
+B_BOUNDS = (0.01, 1.0)
+B_GRID = np.linspace(0.05, 1.0, 20)
+FIT_KEYS = ('qi', 'di', 'b', 'sse', 'rmse')
+
+History = Any  # pandas.DataFrame or a mapping of column arrays
+
+
+def pack_history(history: History, well_col: str = 'well', time_col: str = 'month',
+                 rate_col: str = 'rate') -> Dict[str, np.ndarray]:
+    """Padded per-well arrays from a long-format history table.
+
+    Time may be a month number or a date column (converted to months). Each
+    well's time axis starts at its first record; non-positive rates are
+    masked out.
+    """
+    wells_raw = np.asarray(history[well_col])
+    time_raw = np.asarray(history[time_col])
+    if np.issubdtype(time_raw.dtype, np.datetime64):
+        time_raw = time_raw.astype('datetime64[M]').astype(np.int64)
+    t_all = time_raw.astype(float)
+    q_all = np.asarray(history[rate_col], dtype=float)
+
+    wells, codes = np.unique(wells_raw, return_inverse=True)
+    order = np.lexsort((t_all, codes))
+    codes, t_all, q_all = codes[order], t_all[order], q_all[order]
+    counts = np.bincount(codes, minlength=wells.size)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    position = np.arange(codes.size) - starts[codes]
+
+    width = int(counts.max()) if counts.size else 0
+    t = np.zeros((wells.size, width))
+    q = np.zeros((wells.size, width))
+    filled = np.zeros((wells.size, width), dtype=bool)
+    t[codes, position] = t_all
+    q[codes, position] = q_all
+    filled[codes, position] = True
+    first = np.where(counts > 0, t[:, 0], 0.0) if width else np.zeros(wells.size)
+    t = np.where(filled, t - first[:, None], 0.0)
+    mask = filled & np.isfinite(q) & (q > 0)
+    return {
+        'wells': wells,
+        't': t,
+        'q': np.where(mask, q, 1.0),
+        'mask': mask,
+        't_last': np.where(filled, t, 0.0).max(axis=1) if width else np.zeros(wells.size),
+    }
+
+
+def _linear_fit(x: np.ndarray, y: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Intercept and slope of masked least squares along the last axis."""
+    w = mask.astype(float)
+    n = w.sum(axis=-1)
+    sx, sy = (w * x).sum(axis=-1), (w * y).sum(axis=-1)
+    sxx, sxy = (w * x * x).sum(axis=-1), (w * x * y).sum(axis=-1)
+    denom = n * sxx - sx ** 2
+    slope = np.where(denom > 0, (n * sxy - sx * sy) / np.where(denom > 0, denom, 1.0), 0.0)
+    intercept = (sy - slope * sx) / np.maximum(n, 1.0)
+    return intercept, slope
+
+
+def arps_rate(t: np.ndarray, qi: np.ndarray, di: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Arps rate; ``b = 0`` is exponential, ``b = 1`` harmonic."""
+    safe_b = np.where(b > 0, b, 1.0)
+    return qi * np.where(b > 0, (1.0 + safe_b * di * t) ** (-1.0 / safe_b), np.exp(-di * t))
+
+
+def _exponential(params: np.ndarray, t: np.ndarray):
+    qi, di = params[:, :1], params[:, 1:2]
+    q = qi * np.exp(-di * t)
+    return q, np.stack([q / qi, -q * t], axis=-1)
+
+
+def _harmonic(params: np.ndarray, t: np.ndarray):
+    qi, di = params[:, :1], params[:, 1:2]
+    base = 1.0 + di * t
+    q = qi / base
+    return q, np.stack([q / qi, -q * t / base], axis=-1)
+
+
+def _hyperbolic(params: np.ndarray, t: np.ndarray):
+    qi, di, b = params[:, :1], params[:, 1:2], params[:, 2:3]
+    base = 1.0 + b * di * t
+    q = qi * base ** (-1.0 / b)
+    d_b = q * (np.log(base) / b ** 2 - di * t / (b * base))
+    return q, np.stack([q / qi, -q * t / base, d_b], axis=-1)
+
+
+_MODEL_FUNCS: Dict[str, Callable] = {
+    'exponential': _exponential,
+    'hyperbolic': _hyperbolic,
+    'harmonic': _harmonic,
+}
+
+
+def _initial_guess(model: str, t: np.ndarray, q: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    if model == 'exponential':
+        intercept, slope = _linear_fit(t, np.log(q), mask)
+        return np.stack([np.exp(intercept), np.maximum(-slope, 0.0)], axis=1)
+    if model == 'harmonic':
+        intercept, slope = _linear_fit(t, 1.0 / q, mask)
+        intercept = np.where(intercept > 0, intercept, 1.0 / q[:, 0])
+        return np.stack([1.0 / intercept, np.maximum(slope / intercept, 0.0)], axis=1)
+    # Hyperbolic: q^-b is linear in t for fixed b; keep the best b of the grid.
+    b = B_GRID[:, None, None]
+    intercept, slope = _linear_fit(t[None], q[None] ** -b, mask[None])
+    valid = intercept > 0
+    intercept = np.where(valid, intercept, 1.0)
+    qi = np.where(valid, intercept ** (-1.0 / b[..., 0]), q[None, :, 0])
+    di = np.where(valid, np.maximum(slope, 0.0) / (intercept * b[..., 0]), 0.0)
+    predicted = arps_rate(t[None], qi[..., None], di[..., None], b)
+    sse = np.where(mask[None], (q[None] - predicted) ** 2, 0.0).sum(axis=-1)
+    best = np.argmin(np.where(np.isfinite(sse), sse, np.inf), axis=0)
+    rows = np.arange(t.shape[0])
+    return np.stack([qi[best, rows], di[best, rows], B_GRID[best]], axis=1)
+
+
+def _bounds(model: str, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    lower = [1e-9, 0.0] + ([B_BOUNDS[0]] if model == 'hyperbolic' else [])
+    upper = [np.inf, np.inf] + ([B_BOUNDS[1]] if model == 'hyperbolic' else [])
+    return np.tile(lower, (size, 1)), np.tile(upper, (size, 1))
+
+
+def _sse(model: str, params: np.ndarray, t: np.ndarray, q: np.ndarray, mask: np.ndarray):
+    predicted, jacobian = _MODEL_FUNCS[model](params, t)
+    residual = np.where(mask, q - predicted, 0.0)
+    return residual, jacobian, (residual ** 2).sum(axis=1)
+
+
+def _levenberg_marquardt(model: str, params: np.ndarray, t: np.ndarray, q: np.ndarray,
+                         mask: np.ndarray, iterations: int = 50,
+                         tolerance: float = 1e-10) -> Tuple[np.ndarray, np.ndarray]:
+    """Batched Levenberg-Marquardt with a per-well damping factor."""
+    lower, upper = _bounds(model, params.shape[0])
+    params = np.clip(params, lower, upper)
+    residual, jacobian, sse = _sse(model, params, t, q, mask)
+    damping = np.full(params.shape[0], 1e-3)
+    eye = np.eye(params.shape[1])
+    active = np.isfinite(sse)
+    for _ in range(iterations):
+        if not active.any():
+            break
+        jm = jacobian * mask[..., None]
+        jt = jm.transpose(0, 2, 1)
+        normal = jt @ jm
+        gradient = (jt @ residual[..., None])[..., 0]
+        scaled = normal + damping[:, None, None] * (normal * eye + 1e-12 * eye)
+        step = np.linalg.solve(scaled, gradient[..., None])[..., 0]
+        trial = np.clip(params + step, lower, upper)
+        trial_residual, trial_jacobian, trial_sse = _sse(model, trial, t, q, mask)
+        better = active & np.isfinite(trial_sse) & (trial_sse < sse)
+        converged = better & (sse - trial_sse <= tolerance * np.maximum(sse, 1e-30))
+        params = np.where(better[:, None], trial, params)
+        residual = np.where(better[:, None], trial_residual, residual)
+        jacobian = np.where(better[:, None, None], trial_jacobian, jacobian)
+        sse = np.where(better, trial_sse, sse)
+        damping = np.where(better, damping * 0.3, damping * 10.0)
+        active &= ~converged & (damping < 1e12)
+    return params, sse
+
+
+def _fit_chunk(args) -> Dict[str, Dict[str, np.ndarray]]:
+    t, q, mask, models = args
+    n = mask.sum(axis=1)
+    result = {}
+    for model in models:
+        params, sse = _levenberg_marquardt(model, _initial_guess(model, t, q, mask), t, q, mask)
+        ok = n >= MIN_POINTS[model]
+        b = params[:, 2] if model == 'hyperbolic' else np.full(n.shape, float(model == 'harmonic'))
+        result[model] = {
+            'qi': np.where(ok, params[:, 0], np.nan),
+            'di': np.where(ok, params[:, 1], np.nan),
+            'b': np.where(ok, b, np.nan),
+            'sse': np.where(ok, sse, np.nan),
+            'rmse': np.where(ok, np.sqrt(sse / np.maximum(n, 1)), np.nan),
+        }
+    return result
+
+
+def fit_decline(history: History, models=DECLINE_MODELS, well_col: str = 'well',
+                time_col: str = 'month', rate_col: str = 'rate',
+                chunk_size: int = 1000, workers: Optional[int] = None) -> Dict[str, Any]:
+    """Fit Arps models to every well of a history table.
+
+    Args:
+        history: Long-format table (DataFrame or mapping of columns).
+        models: Models to fit, any of ``DECLINE_MODELS``.
+        well_col, time_col, rate_col: Column names.
+        chunk_size: Wells per chunk.
+        workers: Worker processes; ``None`` or 1 fits in-process.
+
+    Returns:
+        Dict with ``wells``, ``n_points``, ``t_last`` (months since the first
+        record), per-model parameter dicts (``qi``, ``di`` per month, ``b``,
+        ``sse``, ``rmse``) and the best model per well by AIC under
+        ``model``/``qi``/``di``/``b``/``rmse``. An empty history gives
+        empty per-well arrays.
+    """
+    for model in models:
+        if model not in DECLINE_MODELS:
+            raise ValueError(f"Unknown decline model: {model}")
+    packed = pack_history(history, well_col, time_col, rate_col)
+    n_wells = packed['wells'].size
+    tasks = [
+        (packed['t'][start:start + chunk_size], packed['q'][start:start + chunk_size],
+         packed['mask'][start:start + chunk_size], tuple(models))
+        for start in range(0, n_wells, chunk_size)
+    ]
+    chunks = map_chunks(_fit_chunk, tasks, workers)
+    result: Dict[str, Any] = {
+        'wells': packed['wells'],
+        'n_points': packed['mask'].sum(axis=1),
+        't_last': packed['t_last'],
+    }
+    for model in models:
+        result[model] = {key: np.concatenate([chunk[model][key] for chunk in chunks])
+                         if chunks else np.empty(0) for key in FIT_KEYS}
+
+    # Akaike criterion penalizes the extra hyperbolic parameter.
+    n = np.maximum(result['n_points'], 1)
+    aic = np.stack([
+        n * np.log(np.maximum(result[model]['sse'], 1e-300) / n) + 2 * (3 if model == 'hyperbolic' else 2)
+        for model in models
+    ])
+    aic = np.where(np.isfinite(aic), aic, np.inf)
+    best = np.argmin(aic, axis=0)
+    names = np.array(models, dtype=object)
+    fitted = np.isfinite(aic).any(axis=0)
+    result['model'] = np.where(fitted, names[best], None)
+    for key in ('qi', 'di', 'b', 'rmse'):
+        stacked = np.stack([result[model][key] for model in models])
+        result[key] = stacked[best, np.arange(n_wells)]
+    return result
+
+
+def forecast_parameters(fit: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+    """Rate and decline at the end of history, ready for ``run_forecast``.
+
+    The Arps curve is shifted to the last history month: the hyperbolic
+    decline rate falls as ``D / (1 + b D t)``, the exponent is unchanged.
+    Pass ``decline_type='hyperbolic'`` (``b = 0`` is the exponential limit).
+    """
+    t_last, qi, di, b = fit['t_last'], fit['qi'], fit['di'], fit['b']
+    return {
+        'targetFlowRate': arps_rate(t_last, qi, di, b),
+        'decline_rate': di / (1.0 + b * di * t_last),
+        'hyperbolic_n': b,
+    }
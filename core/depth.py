@@ -0,0 +1,134 @@
+"""Pump setting depth that minimizes shaft power.
+
+Moving the pump changes the intake pressure (the casing column between the
+pump and the perforations), the discharge pressure the tubing requires,
+the intake temperature and hence the free gas. Both pressure columns are
+marched once per well on a common depth grid down to the perforations:
+the tubing from the wellhead down (:func:`core.traverse.pressure_traverse`)
+and the casing from the flowing bottomhole pressure up
+(:func:`core.traverse.casing_traverse`). Every grid depth is then a
+candidate setting depth without another traverse, and all catalog pumps
+are staged at all candidate depths in one ``(wells, depths, pumps)`` pass.
+
+Free gas limits a depth through the selection itself: each pump's head and
+efficiency are degraded for its gas-tolerance class, and a pump is usable
+where ``evaluate_candidates`` finds it suitable. A fixed void-fraction cap
+is only applied on request.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from core.catalog import catalog_arrays
+from core.engine import G, PA_PER_ATM, InputsLike, prepare_inputs, void_fraction_and_rate
+from core.forecast import selected_pump_index
+from core.ipr import build_ipr
+from core.selection import evaluate_candidates
+from core.survey import Survey
+from core.traverse import casing_traverse, pressure_traverse
+
+
+def optimize_setting_depth(inputs: InputsLike = None, depth_min: Any = 500.0,
+                           depth_max: Any = None, perforation_depth: Any = None,
+                           catalog: Optional[Sequence[Mapping[str, Any]]] = None,
+                           pump: Any = None, max_void_fraction: Any = None,
+                           segments: int = 100,
+                           survey: Optional[Survey] = None,
+                           temperature_model: str = 'geothermal') -> Dict[str, np.ndarray]:
+    """Setting depth and pump with the lowest shaft power for each well.
+
+    Args:
+        inputs: Well inputs (a batch of wells is solved at once).
+        depth_min, depth_max: Search bounds, m; ``depth_max`` defaults to
+            ``pumpDepth``.
+        perforation_depth: Depth of the inflow, where the pressure equals
+            the IPR flowing pressure; defaults to the ``perforationDepth``
+            input, or ``depth_max`` when that is shallower.
+        catalog: Pump catalog rows (defaults to ``BORETS_CATALOG``).
+        pump: Name of the pump to place; by default every catalog pump is
+            considered.
+        max_void_fraction: Optional void-fraction limit at the intake, %,
+            on top of the per-class gas degradation; a scalar or one
+            value per catalog pump.
+        segments: Depth steps between the surface and the perforations.
+        survey: Directional survey of the well; depths are then measured
+            depths.
+        temperature_model: ``'flowing'`` takes the intake temperature (for
+            the gas volume and the vapor pressure) from the Ramey profile
+            of fluid rising from the perforations, see ``core.temperature``.
+
+    Returns:
+        Dict with per-depth arrays of shape ``(wells..., segments + 1)``
+        (``depth``, ``pip_atm``, ``tdh_m``, ``void_fraction``,
+        ``temp_c``, ``feasible``, ``shaft_power_kw`` and ``pump_index`` of
+        the best pump at that depth) and per-well results
+        ``best_depth``, ``best_pump_index``, ``best_shaft_power_kw`` and
+        ``best_feasible``. Where no depth has a suitable pump,
+        ``best_depth`` is the depth within the bounds with the lowest
+        void fraction (NaN when no depth is in bounds), ``best_pump_index``
+        is -1 and the power is NaN. The
+        NPSH constraint is the cavitation check of ``evaluate_candidates``.
+    """
+    p = prepare_inputs(inputs)
+    arrays = catalog_arrays(catalog)
+    q = p['targetFlowRate']
+    depth_max = p['pumpDepth'] if depth_max is None else np.asarray(depth_max, dtype=float)
+    perforation = (np.maximum(p['perforationDepth'], depth_max) if perforation_depth is None
+                   else np.asarray(perforation_depth, dtype=float))
+
+    tubing = pressure_traverse(q, p, segments, depth=perforation, survey=survey,
+                               temperature_model=temperature_model)
+    casing = casing_traverse(q, p, build_ipr(p).pwf(q), perforation, segments, survey,
+                             temperature_model)
+    depth = tubing['depth']
+
+    pd = {key: value[..., None] for key, value in p.items()}
+    pd['pumpDepth'] = depth
+    pip = casing['pressure']
+    temp = tubing['temperature']
+    void = void_fraction_and_rate(pip, temp, q[..., None], pd)
+    rho_g = p['liquidDensity'][..., None] * G
+    design = {
+        'pip_atm': pip,
+        'temp_bottom_c': temp,
+        'void_fraction': void['void_fraction'],
+        'downhole_q_m3': void['total_rate'],
+        'tdh_m': np.maximum(0.0, tubing['pressure'] - pip) * PA_PER_ATM / rho_g,
+    }
+    candidates = evaluate_candidates(pd, design=design, arrays=arrays)
+
+    in_bounds = ((depth >= np.asarray(depth_min, dtype=float)[..., None])
+                 & (depth <= np.asarray(depth_max, dtype=float)[..., None]))
+    feasible = in_bounds & (pip > 0.0)
+    allowed = candidates['suitable'] & feasible[..., None]
+    if max_void_fraction is not None:
+        allowed &= design['void_fraction'][..., None] <= np.asarray(max_void_fraction, dtype=float)
+    if pump is not None:
+        allowed &= np.arange(arrays['name'].size) == selected_pump_index(arrays, pump)[..., None, None]
+    power = np.where(allowed, candidates['shaft_power_kw'], np.inf)
+    best_pump = np.argmin(power, axis=-1)
+    depth_power = np.take_along_axis(power, best_pump[..., None], axis=-1)[..., 0]
+    found = np.isfinite(depth_power).any(axis=-1)
+    least_gas = np.where(feasible, design['void_fraction'], np.inf)
+    best = np.where(found, np.argmin(depth_power, axis=-1), np.argmin(least_gas, axis=-1))[..., None]
+
+    def at_best(values: np.ndarray) -> np.ndarray:
+        return np.take_along_axis(values, best, axis=-1)[..., 0]
+
+    return {
+        'depth': depth,
+        'pip_atm': pip,
+        'tdh_m': design['tdh_m'],
+        'void_fraction': design['void_fraction'],
+        'temp_c': temp,
+        'feasible': np.isfinite(depth_power),
+        'shaft_power_kw': np.where(np.isfinite(depth_power), depth_power, np.nan),
+        'pump_index': np.where(np.isfinite(depth_power), best_pump, -1),
+        'best_depth': np.where(found | np.isfinite(least_gas).any(axis=-1), at_best(depth), np.nan),
+        'best_pump_index': np.where(found, at_best(best_pump), -1),
+        'best_shaft_power_kw': np.where(found, at_best(depth_power), np.nan),
+        'best_feasible': found,
+    }
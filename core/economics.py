@@ -0,0 +1,131 @@
+"""Forecast economics evaluated for a whole matrix of scenarios.
+
+Price, operating cost, decline rate and discount rate vectors are combined
+into a ``(scenarios, months)`` grid; NPV, cumulative profit and breakeven
+month come from reductions along the month axis, so thousands of
+combinations are evaluated in one call. Formulas follow
+``ForecastTab._calculate_forecast``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from core.forecast import decline_rates
+
+# m³ -> barrels as used by the forecast tab.
+BBL_PER_M3 = 6.29
+
+# Decline type names shown in ForecastTab.
+DECLINE_TYPE_NAMES = {
+    "Экспоненциальное": 'exponential',
+    "Гиперболическое": 'hyperbolic',
+    "Гармоническое": 'harmonic',
+}
+
+SCENARIO_FIELDS = ('oil_price', 'operating_cost', 'decline_rate', 'discount_rate')
+
+
+def decline_type_key(decline_type: str) -> str:
+    """Engine decline key from a tab label or an engine key."""
+    return DECLINE_TYPE_NAMES.get(decline_type, decline_type)
+
+
+def cash_flows(rates: np.ndarray, months: np.ndarray, oil_price: np.ndarray,
+               operating_cost: np.ndarray, discount_rate: np.ndarray) -> Dict[str, np.ndarray]:
+    """Monthly and cumulative cash flows; inputs broadcast with a trailing month axis."""
+    rates_bbl = rates * BBL_PER_M3
+    revenues = rates_bbl * oil_price
+    costs = rates_bbl * operating_cost
+    profits = revenues - costs
+    discount_factors = 1.0 / (1.0 + discount_rate) ** (months / 12.0)
+    discounted_profits = profits * discount_factors
+    cumulative_profit = np.cumsum(profits, axis=-1)
+    positive = cumulative_profit >= 0
+    return {
+        'rates_bbl': rates_bbl,
+        'revenues': revenues,
+        'costs': costs,
+        'profits': profits,
+        'discounted_profits': discounted_profits,
+        'cumulative_production': np.cumsum(rates_bbl, axis=-1),
+        'cumulative_revenue': np.cumsum(revenues, axis=-1),
+        'cumulative_profit': cumulative_profit,
+        'npv': discounted_profits.sum(axis=-1),
+        # First month with non-negative cumulative profit, -1 if never.
+        'breakeven_month': np.where(positive.any(axis=-1), positive.argmax(axis=-1), -1),
+    }
+
+
+def run_scenarios(initial_rate: float, forecast_period: int,
+                  oil_prices: Sequence[float], operating_costs: Sequence[float],
+                  declines: Sequence[float], discount_rates: Sequence[float],
+                  decline_type: str = 'exponential', hyperbolic_n: float = 0.5,
+                  keep_monthly: bool = False) -> Dict[str, Any]:
+    """Economics for every combination of the given vectors.
+
+    Args:
+        initial_rate: Initial liquid rate, m³/сут.
+        forecast_period: Last month (months 0..period).
+        oil_prices: Oil prices, $/bbl.
+        operating_costs: Operating costs, $/bbl.
+        declines: Monthly decline rates as fractions.
+        discount_rates: Annual discount rates as fractions.
+        decline_type: Engine key or ForecastTab label.
+        hyperbolic_n: Arps exponent for the hyperbolic model.
+        keep_monthly: Also return the ``(scenarios, months)`` cash flow arrays.
+
+    Returns:
+        Dict with ``scenarios`` (column arrays of the inputs and of
+        ``npv``, ``total_profit``, ``total_production``, ``final_rate`` and
+        ``breakeven_month``, one row per combination, sorted by NPV
+        descending) and ``months``.
+    """
+    grids = np.meshgrid(np.asarray(oil_prices, dtype=float),
+                        np.asarray(operating_costs, dtype=float),
+                        np.asarray(declines, dtype=float),
+                        np.asarray(discount_rates, dtype=float), indexing='ij')
+    columns = {name: grid.reshape(-1) for name, grid in zip(SCENARIO_FIELDS, grids)}
+    months = np.arange(forecast_period + 1)
+
+    # Rates depend only on the decline rate: evaluate once per distinct value.
+    unique_decline, inverse = np.unique(columns['decline_rate'], return_inverse=True)
+    unique_rates = decline_rates(initial_rate, months, decline_type_key(decline_type),
+                                 unique_decline[:, None], hyperbolic_n)
+    rates = unique_rates[inverse]
+
+    flows = cash_flows(rates, months, columns['oil_price'][:, None],
+                       columns['operating_cost'][:, None], columns['discount_rate'][:, None])
+    table = dict(columns)
+    table.update({
+        'npv': flows['npv'],
+        'total_profit': flows['cumulative_profit'][:, -1],
+        'total_production': flows['cumulative_production'][:, -1],
+        'final_rate': rates[:, -1],
+        'breakeven_month': flows['breakeven_month'],
+    })
+    order = np.argsort(-table['npv'], kind='stable')
+    result: Dict[str, Any] = {
+        'months': months,
+        'scenarios': {key: value[order] for key, value in table.items()},
+    }
+    if keep_monthly:
+        result['rates'] = rates[order]
+        result.update({key: value[order] for key, value in flows.items()
+                       if np.ndim(value) == 2})
+    return result
+
+
+def scenario_rows(scenarios: Dict[str, np.ndarray],
+                  limit: Optional[int] = None) -> list:
+    """Scenario table as a list of row dicts (``breakeven_month`` None if never)."""
+    count = len(scenarios['npv']) if limit is None else min(limit, len(scenarios['npv']))
+    rows = []
+    for i in range(count):
+        row = {key: float(values[i]) for key, values in scenarios.items()}
+        month = int(scenarios['breakeven_month'][i])
+        row['breakeven_month'] = month if month >= 0 else None
+        rows.append(row)
+    return rows
@@ -0,0 +1,421 @@
+"""Vectorized port of the IrkPUMP design formulas.
+
+Every function here accepts NumPy arrays (or plain scalars) and broadcasts
+them, so a single call evaluates a whole batch of wells, months or
+realizations. The formulas mirror the JavaScript engine in
+``IrkPUMP v6.html``; input dictionaries use the same camelCase keys as
+``getInputs()`` in the page and ``DesignTab._collect``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.gas import DEFAULT_GAS_TOLERANCE, gas_factors
+from core.ipr import IPR_MODEL_CODES, IPRCoefficients, build_ipr
+from core.survey import Survey
+from core.temperature import SECONDS_PER_DAY, temperature_profile
+
+G = 9.81
+PA_PER_ATM = 101325.0
+M3_TO_BBL = 6.2898
+ATM_TO_PSI = 14.696
+
+T_STD_K = 20 + 273.15
+P_STD_ATM = 1.033
+Z_FACTOR = 0.9
+GAS_VISCOSITY_PA_S = 0.00001
+
+DEFAULT_INPUTS: Dict[str, float] = {
+    'reservoirPressure': 89.6,
+    'productivityIndex': 2.238,
+    'bubblePointPressure': 89.6,
+    'gasOilRatio': 251.7,
+    'waterCut': 52.7,
+    'liquidDensity': 1016.0,
+    'boFactor': 1.64,
+    'viscosity': 0.44,
+    'gasSpecificGravity': 0.85,
+    'tubingId': 62.0,
+    'pumpDepth': 2630.0,
+    'tubingHeadPressure': 25.0,
+    'surfaceTemperature': 20.0,
+    'tempGradient': 3.0,
+    'targetFlowRate': 80.0,
+    'separatorEfficiency': 69.16,
+    'viscCorrHead': 1.0,
+    'viscCorrEff': 1.0,
+    # IPR model code, see core.ipr.IPR_MODEL_CODES (2 = composite, as in the JS engine)
+    'iprModel': 2.0,
+    # Inflow depth, m; at or above the pump the inflow is taken at the pump
+    'perforationDepth': 0.0,
+}
+
+# Motor and cable assumptions of the JS calculateStaging.
+MOTOR_POWERS_KW = (37, 45, 55, 75, 90, 110, 132, 160, 200, 250, 315)
+MOTOR_EFFICIENCY = 0.88
+MOTOR_POWER_FACTOR = 0.85
+MOTOR_POWER_MARGIN = 1.15
+CABLE_RESISTANCE_OHM_KM = 1.15
+CABLE_VOLTAGE_KV = 1.0
+
+# Flow pattern codes returned by beggs_brill(); names match the JS engine.
+FLOW_PATTERNS = ("Сегментный", "Переходный", "Пробковый", "Рассеянный")
+# Number of holdup expressions of beggs_brill(); the code HOLDUP_CASES
+# marks rows that fall in none of them (zero inclination factor).
+HOLDUP_CASES = 7
+
+InputArrays = Dict[str, np.ndarray]
+InputsLike = Union[Mapping[str, Any], Sequence[Mapping[str, Any]], None]
+
+
+def prepare_inputs(inputs: InputsLike = None) -> InputArrays:
+    """Normalize inputs into a dict of broadcast float arrays.
+
+    Accepts a dict whose values are scalars or arrays, or a sequence of
+    per-well dicts. Missing keys fall back to ``DEFAULT_INPUTS``.
+    """
+    if inputs is None:
+        inputs = {}
+    if not isinstance(inputs, Mapping):
+        rows = list(inputs)
+        inputs = {
+            key: [row.get(key, default) for row in rows]
+            for key, default in DEFAULT_INPUTS.items()
+        }
+    inputs = dict(inputs)
+    if isinstance(inputs.get('iprModel'), str):
+        inputs['iprModel'] = IPR_MODEL_CODES[inputs['iprModel']]
+    elif 'iprModel' in inputs and np.asarray(inputs['iprModel']).dtype.kind in 'OU':
+        models = np.asarray(inputs['iprModel'], dtype=object)
+        inputs['iprModel'] = np.array([
+            IPR_MODEL_CODES[m] if isinstance(m, str) else m for m in models.reshape(-1)
+        ], dtype=float).reshape(models.shape)
+    merged = {
+        key: np.asarray(inputs.get(key, default), dtype=float)
+        for key, default in DEFAULT_INPUTS.items()
+    }
+    arrays = np.broadcast_arrays(*merged.values())
+    return dict(zip(merged.keys(), arrays))
+
+
+def take_inputs(p: InputArrays, index: Any) -> InputArrays:
+    """Select a subset of a prepared batch (fancy or boolean index)."""
+    return {key: value[index] for key, value in p.items()}
+
+
+def batch_size(p: InputArrays) -> int:
+    """Number of elements in a prepared batch."""
+    return int(next(iter(p.values())).size)
+
+
+def bottomhole_temperature(p: InputArrays, depth: Optional[np.ndarray] = None) -> np.ndarray:
+    """Temperature at pump depth from the geothermal gradient, °C."""
+    depth = p['pumpDepth'] if depth is None else depth
+    return p['surfaceTemperature'] + (depth / 100.0) * p['tempGradient']
+
+
+def inflow_depth(p: InputArrays, survey: Optional[Survey] = None) -> np.ndarray:
+    """Vertical depth of the inflow: the perforations, or the pump when deeper, m."""
+    depth = np.maximum(p['perforationDepth'], p['pumpDepth'])
+    return depth if survey is None else survey.tvd_at(depth)
+
+
+def intake_temperature(p: InputArrays, q_m3: np.ndarray,
+                       survey: Optional[Survey] = None) -> np.ndarray:
+    """Fluid temperature at the pump intake, °C.
+
+    The fluid enters at formation temperature at the perforations and cools
+    on its way up to the pump (flowing profile of ``core.temperature``);
+    with the perforations at the pump this is the geothermal temperature.
+    """
+    tvd = None if survey is None else survey.tvd_at(p['pumpDepth'])
+    if not np.any(p['perforationDepth'] > p['pumpDepth']):
+        return bottomhole_temperature(p, tvd)
+    tvd = p['pumpDepth'] if tvd is None else tvd
+    return temperature_profile(p, q_m3, inflow_depth(p, survey)).at(tvd)
+
+
+def ipr_rate(pwf_atm: np.ndarray, p: InputArrays) -> np.ndarray:
+    """Surface liquid rate for a given flowing pressure, m³/сут."""
+    return build_ipr(p).rate(pwf_atm)
+
+
+def ipr_pwf(q_m3: np.ndarray, p: InputArrays) -> np.ndarray:
+    """Flowing pressure for a given surface rate, atm.
+
+    Closed-form inverse of the IPR (the JS version scans pressure in
+    0.5 psi steps). Rates beyond the absolute open flow return 0.
+    """
+    return build_ipr(p).pwf(q_m3)
+
+
+def void_fraction_and_rate(pip_atm: np.ndarray, temp_c: np.ndarray, q_m3: np.ndarray,
+                           p: InputArrays) -> Dict[str, np.ndarray]:
+    """Free gas at pump intake: void fraction (%), total and gas downhole rates."""
+    pip = np.maximum(pip_atm, 1e-6)
+    oil_rate = q_m3 * (1.0 - p['waterCut'] / 100.0)
+    liquid_rate = q_m3 * p['boFactor']
+    ratio = np.divide(pip, p['bubblePointPressure'],
+                      out=np.ones_like(pip * p['bubblePointPressure']),
+                      where=p['bubblePointPressure'] > 0)
+    solution_gor = p['gasOilRatio'] * ratio ** 1.2
+    free_gor = np.maximum(0.0, p['gasOilRatio'] - solution_gor)
+    gas_rate = (oil_rate * free_gor * (P_STD_ATM / pip)
+                * ((temp_c + 273.15) / T_STD_K) * Z_FACTOR)
+    gas_rate = np.where(pip_atm >= p['bubblePointPressure'], 0.0, gas_rate)
+    total_rate = liquid_rate + gas_rate
+    void_fraction = np.divide(gas_rate, total_rate, out=np.zeros_like(total_rate),
+                              where=total_rate > 0) * 100.0
+    return {'void_fraction': void_fraction, 'total_rate': total_rate, 'gas_rate': gas_rate}
+
+
+def liquid_holdup(flow_rate_m3: np.ndarray, gas_rate_m3: np.ndarray,
+                  p: InputArrays) -> Dict[str, np.ndarray]:
+    """No-slip flow state and liquid holdup of the simplified Beggs-Brill correlation.
+
+    ``holdup_case`` is the index of the holdup expression that applies
+    (``HOLDUP_CASES`` when none does): the holdup is smooth within a case
+    and jumps between cases.
+    """
+    tubing_id_m = p['tubingId'] / 1000.0
+    area = np.pi * (tubing_id_m / 2.0) ** 2
+    v_sl = flow_rate_m3 / SECONDS_PER_DAY / area
+    v_sg = gas_rate_m3 / SECONDS_PER_DAY / area
+    v_m = v_sl + v_sg
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        lambda_l = np.where(v_m > 0, v_sl / v_m, 1.0)
+        froude = v_m ** 2 / (G * tubing_id_m)
+        l1 = 316.0 * lambda_l ** 0.302
+        l2 = 0.00091 * lambda_l ** -2.843
+        l3 = 0.1 * lambda_l ** -1.538
+        l4 = 0.5 * lambda_l ** -6.389
+        conditions = [
+            (lambda_l < 0.01) & (froude >= l1),
+            (lambda_l >= 0.01) & (froude >= l2),
+            (lambda_l >= 0.01) & (lambda_l < 0.4) & (froude >= l3) & (froude <= l1),
+            (lambda_l >= 0.4) & (lambda_l <= 1.0) & (froude >= l3) & (froude <= l4),
+            (lambda_l >= 0.4) & (lambda_l <= 1.0) & (froude >= l1),
+            (lambda_l < 0.4) & (froude <= l2),
+            (lambda_l >= 0.01) & (froude <= l2),
+        ]
+        b = np.select(
+            conditions,
+            [
+                1.0,
+                1.0,
+                (l3 - froude) / (l3 - l1),
+                (l3 - froude) / (l3 - l4),
+                1.0,
+                (l2 - froude) / (l2 - l3),
+                (l2 - froude) / (l2 - l3),
+            ],
+            default=0.0,
+        )
+        holdup = lambda_l * b + (1.0 - lambda_l) * (1.0 - b)
+        rho_g = p['gasSpecificGravity'] * 1.225
+        rho_mix = p['liquidDensity'] * holdup + rho_g * (1.0 - holdup)
+    return {
+        'no_slip_holdup': lambda_l,
+        'mixture_velocity': v_m,
+        'froude_number': froude,
+        'holdup_case': np.select(conditions, list(range(HOLDUP_CASES)), default=HOLDUP_CASES),
+        'flow_pattern': np.select([froude < 0.01, froude < 0.1, froude < 1.0], [0, 1, 2], default=3),
+        'liquid_holdup': holdup,
+        'mixture_density': rho_mix,
+    }
+
+
+def beggs_brill(flow_rate_m3: np.ndarray, gas_rate_m3: np.ndarray, p: InputArrays,
+                length: Optional[np.ndarray] = None,
+                height: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Simplified Beggs-Brill pressure drop over the tubing, atm.
+
+    ``length`` defaults to the pump depth, as in the JS engine. Friction
+    acts over ``length`` and gravity over the vertical ``height`` (equal
+    to ``length`` unless the tubing is deviated).
+    """
+    length = p['pumpDepth'] if length is None else length
+    height = length if height is None else height
+    tubing_id_m = p['tubingId'] / 1000.0
+    flow = liquid_holdup(flow_rate_m3, gas_rate_m3, p)
+    holdup, rho_mix, v_m = flow['liquid_holdup'], flow['mixture_density'], flow['mixture_velocity']
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        mu_mix = (p['viscosity'] / 1000.0) * holdup + GAS_VISCOSITY_PA_S * (1.0 - holdup)
+        reynolds = rho_mix * v_m * tubing_id_m / mu_mix
+        friction = (1.0 / (-4.0 * np.log10(1 / 3.7 + 5.74 / reynolds ** 0.9))) ** 2
+        dp_friction = friction * (length / tubing_id_m) * rho_mix * v_m ** 2 / (2.0 * PA_PER_ATM)
+    dp_friction = np.nan_to_num(dp_friction, nan=0.0)
+    dp_gravity = rho_mix * G * height / PA_PER_ATM
+    return {
+        'flow_pattern': flow['flow_pattern'],
+        'liquid_holdup': holdup,
+        'mixture_density': rho_mix,
+        'mixture_velocity': v_m,
+        'pressure_drop': dp_gravity + dp_friction,
+        'friction_loss': dp_friction,
+        'gravity_loss': dp_gravity,
+        'reynolds_number': reynolds,
+    }
+
+
+def tubing_pressure_drop(q_m3: np.ndarray, void: Dict[str, np.ndarray], p: InputArrays,
+                         lift_table: Any = None,
+                         height: Optional[np.ndarray] = None) -> np.ndarray:
+    """Tubing pressure drop, atm: lift-table lookup when given, else Beggs-Brill.
+
+    A lift table (see ``core.lift_tables``) belongs to one well, so pass it
+    only for batches of that well (months, what-ifs, iterations); points
+    outside its grid (or next to rates beyond the open flow) use the
+    correlation. ``height`` is the vertical depth of the pump for a deviated
+    well; lift tables are tabulated for vertical wells, so the two cannot be
+    combined.
+    """
+    if lift_table is not None:
+        if height is not None:
+            raise ValueError("Lift tables are tabulated for vertical wells; "
+                             "do not combine them with a survey")
+        coords = (q_m3, p['gasOilRatio'], p['waterCut'])
+        dp = lift_table.interpolate(*coords)
+        outside = ~lift_table.covers(*coords) | ~np.isfinite(dp)
+        if outside.any():
+            exact = beggs_brill(void['total_rate'], void['gas_rate'], p, height=height)['pressure_drop']
+            dp = np.where(outside, exact, dp)
+        return dp
+    return beggs_brill(void['total_rate'], void['gas_rate'], p, height=height)['pressure_drop']
+
+
+def calculate_pip(q_m3: np.ndarray, p: InputArrays, iterations: int = 5,
+                  tolerance: float = 0.1, lift_table: Any = None,
+                  ipr: Optional[IPRCoefficients] = None,
+                  survey: Optional[Survey] = None) -> np.ndarray:
+    """Pump intake pressure for a surface rate, batched port of calculatePipIteratively.
+
+    ``ipr`` reuses coefficients already built for this batch. With a
+    ``survey`` the pump depth is a measured depth.
+    """
+    ipr = build_ipr(p) if ipr is None else ipr
+    pip = ipr.pwf(q_m3) * np.ones(np.broadcast(q_m3, p['reservoirPressure']).shape)
+    tvd = None if survey is None else survey.tvd_at(p['pumpDepth'])
+    temp = intake_temperature(p, q_m3, survey)
+    rho_g = p['liquidDensity'] * G
+    active = np.ones(pip.shape, dtype=bool)
+    for _ in range(iterations):
+        if not active.any():
+            break
+        void = void_fraction_and_rate(pip, temp, q_m3, p)
+        dp = tubing_pressure_drop(q_m3, void, p, lift_table, tvd)
+        pip_head = pip * PA_PER_ATM / rho_g
+        pdp_head = (pip + dp) * PA_PER_ATM / rho_g
+        tdh = np.maximum(0.0, pdp_head - pip_head)
+        new_pip = (pdp_head - tdh) * rho_g / PA_PER_ATM
+        converged = np.abs(new_pip - pip) < tolerance
+        pip = np.where(active, np.where(converged, new_pip, 0.7 * pip + 0.3 * new_pip), pip)
+        active &= ~converged
+    return pip
+
+
+def run_design(inputs: InputsLike = None, flow_rate: Optional[np.ndarray] = None,
+               lift_table: Any = None,
+               survey: Optional[Survey] = None) -> Dict[str, np.ndarray]:
+    """Design point (PIP, void fraction, TDH) for a batch of inputs.
+
+    ``flow_rate`` overrides ``targetFlowRate`` and broadcasts against the
+    batch, which is how forecasts evaluate every month in one call. With a
+    ``lift_table`` the pressure drop is interpolated and the flow-pattern
+    details of the correlation are not reported. ``inflow_feasible`` flags
+    rates the IPR can actually deliver. A directional ``survey`` (one well,
+    see ``core.survey``) makes ``pumpDepth`` (and ``perforationDepth``) a
+    measured depth: gravity and temperature then use its true vertical
+    depth. ``temp_bottom_c`` is the intake temperature, see
+    :func:`intake_temperature`. A survey and a lift table
+    cannot be combined (``ValueError``).
+    """
+    p = prepare_inputs(inputs)
+    q = p['targetFlowRate'] if flow_rate is None else np.asarray(flow_rate, dtype=float)
+    ipr = build_ipr(p)
+    pip = calculate_pip(q, p, lift_table=lift_table, ipr=ipr, survey=survey)
+    tvd = None if survey is None else survey.tvd_at(p['pumpDepth'])
+    temp = intake_temperature(p, q, survey)
+    void = void_fraction_and_rate(pip, temp, q, p)
+    if lift_table is None:
+        multiphase = beggs_brill(void['total_rate'], void['gas_rate'], p, height=tvd)
+        pressure_drop = multiphase['pressure_drop']
+    else:
+        multiphase = None
+        pressure_drop = tubing_pressure_drop(q, void, p, lift_table, tvd)
+    rho_g = p['liquidDensity'] * G
+    pip_head = pip * PA_PER_ATM / rho_g
+    pdp_head = (pip + pressure_drop) * PA_PER_ATM / rho_g
+    result = {
+        'flow_rate': q * np.ones_like(pip),
+        'pip_atm': pip,
+        'temp_bottom_c': temp * np.ones_like(pip),
+        'void_fraction': void['void_fraction'],
+        'downhole_q_m3': void['total_rate'],
+        'gas_rate_m3': void['gas_rate'],
+        'tdh_m': np.maximum(0.0, pdp_head - pip_head),
+        'pressure_drop': pressure_drop * np.ones_like(pip),
+        # The reservoir cannot deliver rates at or above the absolute open flow.
+        'inflow_feasible': q < ipr.aof,
+    }
+    if multiphase is not None:
+        result.update({
+            'flow_pattern': multiphase['flow_pattern'],
+            'liquid_holdup': multiphase['liquid_holdup'],
+            'mixture_density': multiphase['mixture_density'],
+        })
+    return result
+
+
+
+def gas_degradation(void_fraction_percent: np.ndarray,
+                    gas_tolerance: Any = DEFAULT_GAS_TOLERANCE) -> Tuple[np.ndarray, np.ndarray]:
+    """Head and efficiency factors from free gas, port of estimateGasDegradation.
+
+    ``gas_tolerance`` is a class name or code, or an array of them (one per
+    pump); factors come from the tabulated curves in ``core.gas``.
+    """
+    return gas_factors(gas_tolerance, void_fraction_percent)
+
+
+def calculate_staging(design: Dict[str, np.ndarray], inputs: InputsLike,
+                      pump: Mapping[str, Any], motors: Any = None) -> Dict[str, np.ndarray]:
+    """Stages, shaft power and motor size for one pump, port of calculateStaging.
+
+    ``motors`` is an optional ``core.equipment.MotorIndex``; by default the
+    motor is taken from the fixed ``MOTOR_POWERS_KW`` list.
+    """
+    p = prepare_inputs(inputs)
+    tolerance = pump.get('gas_tolerance_code', pump.get('gas_tolerance', DEFAULT_GAS_TOLERANCE))
+    head_factor, eff_factor = gas_degradation(design['void_fraction'], tolerance)
+    head_per_stage = pump['head_per_stage_m'] * p['viscCorrHead'] * head_factor
+    efficiency = pump['base_eff'] * p['viscCorrEff'] * eff_factor
+    stages = np.ceil(design['tdh_m'] / head_per_stage)
+    hydraulic_kw = (design['downhole_q_m3'] / SECONDS_PER_DAY * p['liquidDensity']
+                    * G * design['tdh_m']) / 1000.0
+    shaft_kw = hydraulic_kw / efficiency
+    current = (shaft_kw / MOTOR_EFFICIENCY) / (np.sqrt(3) * CABLE_VOLTAGE_KV * MOTOR_POWER_FACTOR)
+    cable_loss_kw = 3 * current ** 2 * CABLE_RESISTANCE_OHM_KM * (p['pumpDepth'] / 1000.0) / 1000.0
+    input_kw = shaft_kw / MOTOR_EFFICIENCY + cable_loss_kw
+    recommended_kw = input_kw * MOTOR_POWER_MARGIN
+    if motors is None:
+        motor_powers = np.asarray(MOTOR_POWERS_KW, dtype=float)
+        index = np.minimum(np.searchsorted(motor_powers, recommended_kw), motor_powers.size - 1)
+    else:
+        # Index -1 (no motor rated for the voltage) picks the trailing NaN.
+        motor_powers = np.append(motors.power, np.nan)
+        index = motors.smallest(recommended_kw, CABLE_VOLTAGE_KV * 1000.0, clamp=True)
+    return {
+        'stages': stages,
+        'gas_head_factor': head_factor,
+        'gas_eff_factor': eff_factor,
+        'shaft_power_kw': shaft_kw,
+        'motor_current_a': current,
+        'cable_loss_kw': cable_loss_kw,
+        'motor_input_power_kw': input_kw,
+        'recommended_motor_power_kw': recommended_kw,
+        'motor_power_kw': motor_powers[index],
+    }
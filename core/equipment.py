@@ -0,0 +1,149 @@
+"""Motor and cable catalogs in columnar form with sorted lookup indexes.
+
+Rows come from ``MotorManager``/``CableManager`` (see
+``equipment_manager.py``) or the built-in defaults, which reproduce the
+JS staging assumptions: the 37–315 kW motor list at 1 kV and the cable
+resistances of the motor tab. ``MotorIndex`` answers "smallest motor of at
+least P kW rated for V volts" and ``CableIndex`` "cables with resistance at
+most R" for whole arrays of queries by binary search.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from core.cooling import MAX_WINDING_TEMP_C
+from core.engine import (CABLE_VOLTAGE_KV, MOTOR_EFFICIENCY, MOTOR_POWER_FACTOR,
+                         MOTOR_POWERS_KW)
+from core.motor import (CABLE_COST_PER_MM2_KM, CABLE_RESISTANCE_20_OHM_KM, CABLE_SECTIONS_MM2,
+                        MOTOR_COST_PER_KW)
+
+# Outer diameter of a 117-series motor, mm.
+DEFAULT_MOTOR_OD_MM = 117.0
+
+MOTOR_NUMERIC_COLUMNS = ('power_kw', 'voltage_v', 'efficiency', 'power_factor', 'od_mm', 'price',
+                         'length_m', 'max_winding_temp_c')
+CABLE_NUMERIC_COLUMNS = ('section_mm2', 'r20_ohm_km', 'max_current_a', 'price_per_km')
+TEXT_COLUMNS = ('model', 'manufacturer')
+
+DEFAULT_MOTORS = [
+    {'model': f"ПЭД {power}", 'power_kw': power, 'voltage_v': CABLE_VOLTAGE_KV * 1000.0}
+    for power in MOTOR_POWERS_KW
+]
+DEFAULT_CABLES = [
+    {'model': name, 'section_mm2': section, 'r20_ohm_km': r20}
+    for (name, r20), section in zip(CABLE_RESISTANCE_20_OHM_KM.items(), CABLE_SECTIONS_MM2)
+]
+
+
+def _column(rows: Sequence[Mapping[str, Any]], key: str, default: Any) -> np.ndarray:
+    values = [row.get(key) for row in rows]
+    return np.array([default(row) if value is None else value for row, value in zip(rows, values)],
+                    dtype=float)
+
+
+def motor_arrays(motors: Optional[Sequence[Mapping[str, Any]]] = None) -> Dict[str, np.ndarray]:
+    """Columnar motor catalog; efficiency as a fraction. Defaults to ``DEFAULT_MOTORS``.
+
+    ``length_m`` is NaN when unknown (``core.cooling`` estimates it).
+    """
+    rows = DEFAULT_MOTORS if motors is None else motors
+    arrays = {
+        'power_kw': _column(rows, 'power_kw', lambda row: 0.0),
+        'voltage_v': _column(rows, 'voltage_v', lambda row: CABLE_VOLTAGE_KV * 1000.0),
+        'efficiency': _column(rows, 'efficiency', lambda row: MOTOR_EFFICIENCY),
+        'power_factor': _column(rows, 'power_factor', lambda row: MOTOR_POWER_FACTOR),
+        'od_mm': _column(rows, 'od_mm', lambda row: DEFAULT_MOTOR_OD_MM),
+        'price': _column(rows, 'price', lambda row: MOTOR_COST_PER_KW * float(row.get('power_kw', 0.0))),
+        'length_m': _column(rows, 'length_m', lambda row: np.nan),
+        'max_winding_temp_c': _column(rows, 'max_winding_temp_c', lambda row: MAX_WINDING_TEMP_C),
+    }
+    arrays['efficiency'] = np.where(arrays['efficiency'] > 1, arrays['efficiency'] / 100.0,
+                                    arrays['efficiency'])
+    for column in TEXT_COLUMNS:
+        arrays[column] = np.array([str(row.get(column, '')) for row in rows], dtype=object)
+    return arrays
+
+
+def cable_arrays(cables: Optional[Sequence[Mapping[str, Any]]] = None) -> Dict[str, np.ndarray]:
+    """Columnar cable catalog (``max_current_a`` is NaN when unknown). Defaults to ``DEFAULT_CABLES``."""
+    rows = DEFAULT_CABLES if cables is None else cables
+    arrays = {
+        'section_mm2': _column(rows, 'section_mm2', lambda row: 0.0),
+        'r20_ohm_km': _column(rows, 'r20_ohm_km', lambda row: np.nan),
+        'max_current_a': _column(rows, 'max_current_a', lambda row: np.nan),
+        'price_per_km': _column(rows, 'price_per_km',
+                                lambda row: CABLE_COST_PER_MM2_KM * float(row.get('section_mm2', 0.0))),
+    }
+    for column in TEXT_COLUMNS:
+        arrays[column] = np.array([str(row.get(column, '')) for row in rows], dtype=object)
+    return arrays
+
+
+class MotorIndex:
+    """Smallest motor of at least a given power among those rated for a voltage.
+
+    Motors are sorted by (voltage, power) and keyed as
+    ``voltage_rank * scale + power``, so one ``searchsorted`` finds the
+    first motor at or above the requested power within the voltage group.
+    """
+
+    def __init__(self, power_kw: np.ndarray, voltage_v: np.ndarray) -> None:
+        self.power = np.asarray(power_kw, dtype=float)
+        self.voltage = np.asarray(voltage_v, dtype=float)
+        self.order = np.lexsort((self.power, self.voltage))
+        self.voltages, rank = np.unique(self.voltage[self.order], return_inverse=True)
+        self.scale = 2.0 * (float(self.power.max()) + 1.0) if self.power.size else 1.0
+        self.keys = rank * self.scale + self.power[self.order]
+        self.group_end = np.searchsorted(rank, np.arange(self.voltages.size), side='right')
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray]) -> 'MotorIndex':
+        return cls(arrays['power_kw'], arrays['voltage_v'])
+
+    def smallest(self, power_kw: np.ndarray, voltage_v: np.ndarray, clamp: bool = False) -> np.ndarray:
+        """Catalog index per query, -1 where no motor fits.
+
+        With ``clamp`` a request above the largest motor of the voltage
+        returns that motor (as ``calculate_staging`` does).
+        """
+        power, voltage = np.broadcast_arrays(np.asarray(power_kw, dtype=float),
+                                             np.asarray(voltage_v, dtype=float))
+        if self.voltages.size == 0:
+            return np.full(power.shape, -1)
+        group = np.clip(np.searchsorted(self.voltages, voltage), 0, self.voltages.size - 1)
+        known = self.voltages[group] == voltage
+        position = np.searchsorted(self.keys, group * self.scale + np.clip(power, 0.0, None))
+        end = self.group_end[group]
+        if clamp:
+            position = np.minimum(position, end - 1)
+        found = known & (position < end)
+        return np.where(found, self.order[np.minimum(position, self.order.size - 1)], -1)
+
+
+class CableIndex:
+    """Cables sorted by resistance for "resistance at most R" queries."""
+
+    def __init__(self, r20_ohm_km: np.ndarray) -> None:
+        self.resistance = np.asarray(r20_ohm_km, dtype=float)
+        self.order = np.argsort(self.resistance, kind='stable')
+        self.sorted = self.resistance[self.order]
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray]) -> 'CableIndex':
+        return cls(arrays['r20_ohm_km'])
+
+    def count_at_most(self, r_ohm_km: np.ndarray) -> np.ndarray:
+        """Number of cables with resistance ≤ R; they are ``order[:count]``."""
+        return np.searchsorted(self.sorted, np.asarray(r_ohm_km, dtype=float), side='right')
+
+    def thinnest(self, r_ohm_km: np.ndarray) -> np.ndarray:
+        """Catalog index of the cable with the highest resistance ≤ R, -1 if none."""
+        count = self.count_at_most(r_ohm_km)
+        return np.where(count > 0, self.order[np.maximum(count - 1, 0)], -1)
+
+    def at_most(self, r_ohm_km: float) -> np.ndarray:
+        """Catalog indices of all cables with resistance ≤ R, lowest resistance first."""
+        return self.order[:int(self.count_at_most(r_ohm_km))]
@@ -0,0 +1,226 @@
+"""Equipment forecast over a production decline, evaluated for all months at once.
+
+Port of the JS ``runForecast``: the decline curve gives the rate of every
+month, the design (PIP, void fraction, tubing pressure drop, TDH) is run
+over the whole month axis in one batched call, the first catalog pump whose
+range covers the downhole rate is found through ``PumpEnvelopeIndex`` and
+staging/motor sizing is broadcast over the per-month pump columns. An
+optional surrogate of the tubing pressure drop (see ``core.surrogate``)
+replaces the correlation in the design, checked against ``run_design``.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from core.catalog import (
+    CatalogArrays,
+    PumpEnvelopeIndex,
+    catalog_arrays,
+    take_pumps,
+)
+from core.engine import (DEFAULT_INPUTS, InputArrays, InputsLike, calculate_staging,
+                         prepare_inputs, run_design, take_inputs)
+from core.surrogate import PILOT_SIZE, PolynomialSurrogate, pilot_surrogate
+
+DECLINE_TYPES = ('exponential', 'hyperbolic', 'harmonic')
+
+# Month status codes; names and row classes match the JS forecast table.
+STATUS_OK = 0
+STATUS_PUMP_CHANGE = 1
+STATUS_NO_PUMP = 2
+FORECAST_STATUSES = ('OK', 'Смена насоса', 'Нет насоса')
+STATUS_CLASSES = ('', 'warning', 'danger')
+NO_PUMP_NAME = 'Нет подходящего'
+
+
+def decline_rates(initial_rate: np.ndarray, months: np.ndarray,
+                  decline_type: str = 'exponential', decline_rate: np.ndarray = 0.02,
+                  hyperbolic_n: np.ndarray = 0.5) -> np.ndarray:
+    """Arps decline rates; ``decline_rate`` is a monthly fraction (JS ``declineRate / 100``).
+
+    All arguments broadcast, so scenario or well axes can be placed in front
+    of the month axis.
+    """
+    q0 = np.asarray(initial_rate, dtype=float)
+    d = np.asarray(decline_rate, dtype=float)
+    t = np.asarray(months, dtype=float)
+    if decline_type == 'exponential':
+        return q0 * np.exp(-d * t)
+    if decline_type == 'harmonic':
+        return q0 / (1.0 + d * t)
+    if decline_type == 'hyperbolic':
+        # n = 0 is the exponential limit, so fitted wells of any model share this branch.
+        n = np.asarray(hyperbolic_n, dtype=float)
+        safe_n = np.where(n > 0, n, 1.0)
+        return q0 * np.where(n > 0, (1.0 + safe_n * d * t) ** (-1.0 / safe_n), np.exp(-d * t))
+    raise ValueError(f"Unknown decline type: {decline_type}")
+
+
+def selected_pump_index(arrays: CatalogArrays, selected_pump: Any) -> np.ndarray:
+    """Catalog index of the installed pump(s) by name.
+
+    -1 means no pump is selected, -2 a name that is not in the catalog (so
+    every month with a suitable pump counts as a change, as in the JS page).
+    """
+    lookup = {str(name): i for i, name in enumerate(arrays['name'])}
+    names = np.asarray(selected_pump, dtype=object)
+    codes = [-1 if not name else lookup.get(str(name), -2) for name in names.reshape(-1)]
+    return np.array(codes, dtype=np.int32).reshape(names.shape)
+
+
+def forecast_surrogate(p: InputArrays, decline_type: str, decline_rate: Any,
+                       hyperbolic_n: Any, forecast_period: int,
+                       rng: Optional[np.random.Generator] = None) -> Optional[PolynomialSurrogate]:
+    """Pressure-drop surrogate fitted on up to ``PILOT_SIZE`` random well-months.
+
+    Drawing single months from many wells (rather than every month of a
+    few) spreads the pilot over the well inputs. ``None`` when too few of
+    the pilot months are feasible.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    months = forecast_period + 1
+    shape = p['targetFlowRate'].shape
+    wells = {key: value.reshape(-1) for key, value in p.items()}
+    wells['decline_rate'] = np.broadcast_to(np.asarray(decline_rate, dtype=float), shape).reshape(-1)
+    wells['hyperbolic_n'] = np.broadcast_to(np.asarray(hyperbolic_n, dtype=float), shape).reshape(-1)
+    total = wells['targetFlowRate'].size * months
+    well, month = np.divmod(rng.choice(total, size=min(total, PILOT_SIZE), replace=False), months)
+    pilot = take_inputs(wells, well)
+    inputs = {key: pilot[key] for key in DEFAULT_INPUTS}
+    inputs['targetFlowRate'] = decline_rates(pilot['targetFlowRate'], month, decline_type,
+                                             pilot['decline_rate'], pilot['hyperbolic_n'])
+    return pilot_surrogate(inputs, rng=rng)
+
+
+def equipment_forecast(p: InputArrays, decline_type: str, decline_rate: Any,
+                       hyperbolic_n: Any, forecast_period: int, arrays: CatalogArrays,
+                       selected_index: Any = -1, envelope: Optional[PumpEnvelopeIndex] = None,
+                       lift_table: Any = None,
+                       surrogate: Optional[PolynomialSurrogate] = None,
+                       rng: Optional[np.random.Generator] = None) -> Dict[str, Any]:
+    """Numeric core of :func:`run_forecast` on prepared inputs and catalog columns.
+
+    Only numeric catalog columns are used, so it also runs on arrays
+    attached from shared memory. With a ``surrogate`` (not combined with a
+    lift table) the design comes from :meth:`PolynomialSurrogate.design`,
+    validated on a sample drawn with ``rng``, and its check report is
+    returned under ``surrogate``.
+    """
+    if surrogate is not None and lift_table is not None:
+        raise ValueError("A surrogate replaces the tubing correlation; "
+                         "do not combine it with a lift table")
+    months = np.arange(forecast_period + 1)
+    month_p = {key: value[..., None] for key, value in p.items()}
+    rates = decline_rates(month_p['targetFlowRate'], months, decline_type,
+                          np.asarray(decline_rate, dtype=float)[..., None],
+                          np.asarray(hyperbolic_n, dtype=float)[..., None])
+    report = None
+    if surrogate is None:
+        design = run_design(month_p, flow_rate=rates, lift_table=lift_table)
+    else:
+        design, report = surrogate.design(month_p, rng=rng, flow_rate=rates)
+
+    envelope = PumpEnvelopeIndex.from_arrays(arrays) if envelope is None else envelope
+    index = envelope.lookup(design['downhole_q_m3'])
+    has_pump = index >= 0
+    pumps = take_pumps(arrays, index)
+    staging = calculate_staging(design, month_p, pumps)
+
+    selected = np.asarray(selected_index)[..., None]
+    change = has_pump & (selected != -1) & (index != selected)
+    status = np.where(has_pump, np.where(change, STATUS_PUMP_CHANGE, STATUS_OK), STATUS_NO_PUMP)
+    result: Dict[str, Any] = {
+        'flow_rate': design['flow_rate'],
+        'pip_atm': design['pip_atm'],
+        'void_fraction': design['void_fraction'],
+        'downhole_q_m3': design['downhole_q_m3'],
+        'tdh_m': design['tdh_m'],
+        'pump_index': index,
+        'stages': np.where(has_pump, staging['stages'], 0.0),
+        'motor_power_kw': np.where(has_pump, staging['motor_power_kw'], 0.0),
+        'status': status.astype(np.int8),
+        'month_of_pump_change': np.where(change.any(axis=-1), change.argmax(axis=-1), -1),
+    }
+    if report is not None:
+        result['surrogate'] = report
+    return result
+
+
+def run_forecast(inputs: InputsLike = None, decline_type: str = 'exponential',
+                 decline_rate: float = 0.02, hyperbolic_n: float = 0.5,
+                 forecast_period: int = 60, selected_pump: Any = None,
+                 catalog: Optional[Sequence[Mapping[str, Any]]] = None,
+                 lift_table: Any = None,
+                 surrogate: Union[None, bool, PolynomialSurrogate] = None) -> Dict[str, Any]:
+    """Month-by-month equipment forecast.
+
+    Args:
+        inputs: Design inputs; ``targetFlowRate`` is the initial rate. A batch
+            of wells gets a trailing month axis.
+        decline_type: ``exponential``, ``hyperbolic`` or ``harmonic``.
+        decline_rate: Monthly decline as a fraction (scalar or one per well).
+        hyperbolic_n: Arps exponent for the hyperbolic model (scalar or per well).
+        forecast_period: Last month (months 0..period are evaluated).
+        selected_pump: Name of the installed pump (or one name per well);
+            months needing another pump get the "Смена насоса" status.
+        catalog: Pump rows; defaults to the built-in catalog.
+        lift_table: Optional single-well lift table for the tubing drop.
+        surrogate: Fitted pressure-drop surrogate, or ``True`` to fit one
+            with :func:`forecast_surrogate`; the months are still checked
+            against ``run_design``.
+
+    Returns:
+        Dict of ``(..., months)`` arrays (flow rate, PIP, void fraction, TDH,
+        pump index and name, stages, motor power, status code) plus
+        ``month_of_pump_change`` (-1 when the pump lasts the whole period)
+        and, with a surrogate, its check report under ``surrogate``.
+    """
+    p = prepare_inputs(inputs)
+    arrays = catalog_arrays(catalog)
+    if surrogate is True:
+        surrogate = forecast_surrogate(p, decline_type, decline_rate, hyperbolic_n, forecast_period)
+    elif surrogate is False:
+        surrogate = None
+    result: Dict[str, Any] = {'months': np.arange(forecast_period + 1)}
+    result.update(equipment_forecast(p, decline_type, decline_rate, hyperbolic_n,
+                                     forecast_period, arrays,
+                                     selected_pump_index(arrays, selected_pump),
+                                     lift_table=lift_table, surrogate=surrogate))
+    index = result['pump_index']
+    result['pump_name'] = np.where(index >= 0, take_pumps(arrays, index)['name'], NO_PUMP_NAME)
+    result['initial_pump'] = selected_pump if selected_pump is not None else 'Не выбран'
+    return result
+
+
+def forecast_rows(forecast: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """Single-well forecast as the row dicts of the JS ``forecastResults``."""
+    return [
+        {
+            'month': int(month),
+            'flowRate': float(rate),
+            'tdh': float(tdh),
+            'recommendedPump': str(name),
+            'recommendedMotorKW': float(motor),
+            'status': FORECAST_STATUSES[code],
+            'statusClass': STATUS_CLASSES[code],
+        }
+        for month, rate, tdh, name, motor, code in zip(
+            forecast['months'], forecast['flow_rate'], forecast['tdh_m'],
+            forecast['pump_name'], forecast['motor_power_kw'], forecast['status'])
+    ]
+
+
+def equipment_demand(forecast: Mapping[str, Any]) -> Dict[str, Dict[Any, int]]:
+    """Pumps and motors needed per year, as counted in renderForecastFindings."""
+    period = max(len(forecast['months']) - 1, 1)
+    pumps = Counter(name for name in forecast['pump_name'] if name != NO_PUMP_NAME)
+    motors = Counter(float(kw) for kw in forecast['motor_power_kw'] if kw > 0)
+    return {
+        'pumps': {name: math.ceil(count / period * 12) for name, count in pumps.items()},
+        'motors': {kw: math.ceil(count / period * 12) for kw, count in motors.items()},
+    }
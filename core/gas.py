@@ -0,0 +1,108 @@
+"""Gas degradation of pump head and efficiency by table lookup.
+
+The piecewise-linear factors of the JS ``estimateGasDegradation`` are
+tabulated once per tolerance class on a fine void-fraction grid. Pumps
+carry their tolerance class as a small integer code, so factors for whole
+arrays of (pump, void fraction) pairs come from one gather and a linear
+interpolation. The grid contains every breakpoint of the curves, so the
+lookup reproduces the formula except within one grid step of the 0.2 floor.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+GAS_TOLERANCE_CLASSES = ("Низкая", "Средняя", "Высокая")
+DEFAULT_GAS_TOLERANCE = "Средняя"
+
+# Gas degradation coefficients (head a, b, c; efficiency a, b, c) per tolerance class.
+GAS_DEGRADATION_COEFFICIENTS: Dict[str, Tuple[Tuple[float, ...], Tuple[float, ...]]] = {
+    "Низкая": ((0.5, 0.45, 0.3), (0.3, 0.47, 0.3)),
+    "Средняя": ((0.5, 0.45, 0.3), (0.3, 0.47, 0.3)),
+    "Высокая": ((0.3, 0.3, 0.2), (0.2, 0.3, 0.2)),
+}
+
+# Beyond 50 % free gas the factors no longer change.
+VOID_FRACTION_MAX_PERCENT = 50.0
+GRID_STEP_PERCENT = 0.05
+
+
+def tolerance_codes(tolerance: Any) -> np.ndarray:
+    """Class codes from names (unknown names map to the default class) or codes.
+
+    Numeric codes must index ``GAS_TOLERANCE_CLASSES`` (``ValueError`` otherwise).
+    """
+    values = np.asarray(tolerance)
+    if np.issubdtype(values.dtype, np.number):
+        valid = (values >= 0) & (values < len(GAS_TOLERANCE_CLASSES)) & (values == np.round(values))
+        if not np.all(valid):
+            raise ValueError(f"Gas tolerance codes must be integers 0..{len(GAS_TOLERANCE_CLASSES) - 1}, "
+                             f"got {values[~valid].reshape(-1)[0]}")
+        return values.astype(np.int8)
+    default = GAS_TOLERANCE_CLASSES.index(DEFAULT_GAS_TOLERANCE)
+    lookup = {name: code for code, name in enumerate(GAS_TOLERANCE_CLASSES)}
+    unique, inverse = np.unique(values.astype(str).reshape(-1), return_inverse=True)
+    codes = np.array([lookup.get(name, default) for name in unique], dtype=np.int8)
+    return codes[inverse].reshape(values.shape)
+
+
+def tolerance_names(codes: np.ndarray) -> np.ndarray:
+    """Class names from codes."""
+    return np.array(GAS_TOLERANCE_CLASSES, dtype=object)[np.asarray(codes)]
+
+
+def degradation_formula(void_fraction_percent: np.ndarray, a: float, b: float,
+                        c: float) -> np.ndarray:
+    """One factor curve of estimateGasDegradation, evaluated directly."""
+    vf = np.asarray(void_fraction_percent, dtype=float) / 100.0
+    value = np.select(
+        [vf <= 0.05, vf <= 0.15, vf <= 0.30],
+        [1.0, 1.0 - a * (vf - 0.05) / 0.10, (1.0 - a) - b * (vf - 0.15) / 0.15],
+        default=(1.0 - a - b) - c * np.minimum(1.0, (vf - 0.30) / 0.20),
+    )
+    return np.clip(value, 0.2, 1.0)
+
+
+class GasDegradationTable:
+    """Head and efficiency factors per tolerance class on a void-fraction grid."""
+
+    def __init__(self, step_percent: float = GRID_STEP_PERCENT,
+                 max_percent: float = VOID_FRACTION_MAX_PERCENT) -> None:
+        self.step = float(step_percent)
+        self.grid = np.linspace(0.0, max_percent, int(round(max_percent / self.step)) + 1)
+        # values[class, 0 = head / 1 = efficiency, grid point]
+        self.values = np.stack([
+            np.stack([degradation_formula(self.grid, *coefficients)
+                      for coefficients in GAS_DEGRADATION_COEFFICIENTS[name]])
+            for name in GAS_TOLERANCE_CLASSES
+        ])
+
+    def lookup(self, codes: np.ndarray,
+               void_fraction_percent: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Head and efficiency factors for broadcast arrays of class codes and void fractions.
+
+        Non-finite void fractions give NaN factors.
+        """
+        codes, vf = np.broadcast_arrays(np.asarray(codes, dtype=np.intp),
+                                        np.asarray(void_fraction_percent, dtype=float))
+        finite = np.isfinite(vf)
+        position = np.clip(np.where(finite, vf, 0.0), 0.0, self.grid[-1]) / self.step
+        left = np.minimum(position.astype(np.intp), self.grid.size - 2)
+        weight = position - left
+        head = self.values[codes, 0, left] * (1.0 - weight) + self.values[codes, 0, left + 1] * weight
+        eff = self.values[codes, 1, left] * (1.0 - weight) + self.values[codes, 1, left + 1] * weight
+        return np.where(finite, head, np.nan), np.where(finite, eff, np.nan)
+
+
+@lru_cache(maxsize=None)
+def default_table() -> GasDegradationTable:
+    """Table shared by the engine (built on first use)."""
+    return GasDegradationTable()
+
+
+def gas_factors(tolerance: Any, void_fraction_percent: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Head and efficiency factors for class names or codes (one per pump) and void fractions."""
+    return default_table().lookup(tolerance_codes(tolerance), void_fraction_percent)
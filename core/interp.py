@@ -0,0 +1,65 @@
+"""Interpolation helpers shared by the tabulated models."""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+
+def grid_weights(axis: np.ndarray, x: np.ndarray):
+    """Lower cell index and fractional position of ``x`` on a sorted axis.
+
+    Points outside the axis are clamped to its end cells.
+    """
+    axis = np.asarray(axis, dtype=float)
+    if np.ndim(x) == 0 and axis.size > 1:
+        # Single point: plain floats avoid the array machinery.
+        x = min(max(float(x), axis[0]), axis[-1])
+        idx = min(max(int(np.searchsorted(axis, x, side='right')) - 1, 0), axis.size - 2)
+        return idx, (x - axis[idx]) / (axis[idx + 1] - axis[idx])
+    if axis.size == 1:
+        zeros = np.zeros(np.shape(x))
+        return zeros.astype(np.intp), zeros
+    x = np.clip(x, axis[0], axis[-1])
+    idx = np.clip(np.searchsorted(axis, x, side='right') - 1, 0, axis.size - 2)
+    frac = (x - axis[idx]) / (axis[idx + 1] - axis[idx])
+    return idx, frac
+
+
+def multilinear_interpolate(axes: Sequence[np.ndarray], values: np.ndarray,
+                            coords: Sequence[np.ndarray]) -> np.ndarray:
+    """Multilinear interpolation on a rectilinear grid.
+
+    ``values`` has one dimension per axis (plus optional trailing output
+    dimensions); ``coords`` are broadcast arrays, one per axis. A single
+    point reads only its cell block of ``values`` (cheap on memory-mapped
+    tables) and blends it one axis at a time.
+    """
+    if all(np.ndim(c) == 0 for c in coords):
+        located = [grid_weights(axis, c) for axis, c in zip(axes, coords)]
+        block = np.asarray(values[tuple(slice(int(idx), int(idx) + 2) for idx, _ in located)])
+        for _, frac in located:
+            block = block[0] * (1.0 - frac) + block[1] * frac if block.shape[0] == 2 else block[0]
+        return block
+    coords = np.broadcast_arrays(*[np.asarray(c, dtype=float) for c in coords])
+    located = [grid_weights(axis, c) for axis, c in zip(axes, coords)]
+    single = [np.asarray(axis).size == 1 for axis in axes]
+    trailing = values.shape[len(axes):]
+    result = np.zeros(coords[0].shape + trailing)
+    for corner in range(1 << len(axes)):
+        index = []
+        weight = np.ones(coords[0].shape)
+        skip = False
+        for dim, (idx, frac) in enumerate(located):
+            upper = (corner >> dim) & 1
+            if upper and single[dim]:
+                skip = True
+                break
+            index.append(idx + upper)
+            weight = weight * (frac if upper else 1.0 - frac)
+        if skip:
+            continue
+        corner_values = values[tuple(index)]
+        result += weight.reshape(weight.shape + (1,) * len(trailing)) * corner_values
+    return result
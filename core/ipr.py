@@ -0,0 +1,114 @@
+"""Inflow performance relationships with precomputed per-well coefficients.
+
+Three models share one closed form, so a batch may mix them freely and is
+evaluated without Python-level branching:
+
+* ``linear``    - straight-line PI, ``q = J (Pr - Pwf)``;
+* ``vogel``     - Vogel for the whole drawdown, ``Qmax = J Pr / 1.8``;
+* ``composite`` - PI above the bubble point, Vogel below it, water blended
+  linearly (the JS ``createIprFunction`` model).
+
+Linear is the composite form with an effective bubble point of zero, Vogel
+the composite form with the bubble point at reservoir pressure and no
+water blending.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Mapping, Union
+
+import numpy as np
+
+IPR_MODEL_CODES: Dict[str, int] = {'linear': 0, 'vogel': 1, 'composite': 2}
+IPR_MODELS = tuple(IPR_MODEL_CODES)
+
+
+def model_code(model: Union[str, int, float, np.ndarray]) -> np.ndarray:
+    """Integer model code(s) from names or codes."""
+    if isinstance(model, str):
+        if model not in IPR_MODEL_CODES:
+            raise ValueError(f"Unknown IPR model: {model}")
+        return np.asarray(IPR_MODEL_CODES[model])
+    return np.asarray(model).astype(np.int8)
+
+
+@dataclass(frozen=True)
+class IPRCoefficients:
+    """Per-well IPR coefficients; every field broadcasts with the others."""
+
+    pr: np.ndarray
+    pb: np.ndarray
+    j: np.ndarray
+    fo: np.ndarray
+    fw: np.ndarray
+    q_bubble: np.ndarray
+    q_vogel_max: np.ndarray
+    # Inverse below Pb: a*Pwf² + b*Pwf - (c0 - q) = 0
+    a: np.ndarray
+    b: np.ndarray
+    c0: np.ndarray
+    aof: np.ndarray
+
+    def rate(self, pwf_atm: np.ndarray) -> np.ndarray:
+        """Surface liquid rate at flowing pressure, m³/сут."""
+        pwf = np.clip(pwf_atm, 0.0, self.pr)
+        x = pwf / np.where(self.pb > 0, self.pb, 1.0)
+        vogel = self.q_vogel_max * (1.0 - 0.2 * x - 0.8 * x ** 2)
+        below = self.fo * (self.q_bubble + vogel) + self.fw * self.j * (self.pr - pwf)
+        return np.where(pwf >= self.pb, self.j * (self.pr - pwf), below)
+
+    def pwf(self, q_m3: np.ndarray) -> np.ndarray:
+        """Flowing pressure at surface liquid rate, atm (0 beyond the AOF)."""
+        q = np.clip(q_m3, 0.0, self.aof)
+        c = self.c0 - q
+        disc = np.sqrt(np.maximum(self.b ** 2 + 4.0 * self.a * c, 0.0))
+        quadratic = np.where(self.a > 0,
+                             2.0 * c / (self.b + disc),  # stable form of (-b + disc) / 2a
+                             c / self.b)
+        above = self.pr - q / self.j
+        return np.clip(np.where(q <= self.q_bubble, above, quadratic), 0.0, None)
+
+    def take(self, index: Any) -> 'IPRCoefficients':
+        """Coefficients of a subset of wells."""
+        return IPRCoefficients(**{
+            f.name: np.broadcast_to(getattr(self, f.name), self.shape)[index]
+            for f in fields(self)
+        })
+
+    def expand(self) -> 'IPRCoefficients':
+        """Add a trailing axis so the coefficients broadcast against rate grids."""
+        return IPRCoefficients(**{
+            f.name: np.asarray(getattr(self, f.name))[..., None] for f in fields(self)
+        })
+
+    @property
+    def shape(self):
+        return np.broadcast(*[getattr(self, f.name) for f in fields(self)]).shape
+
+
+def build_ipr(p: Mapping[str, np.ndarray], model: Any = None) -> IPRCoefficients:
+    """Precompute coefficients from prepared inputs.
+
+    ``model`` overrides the ``iprModel`` input; it may be a name, a code or
+    an array of codes (one per well).
+    """
+    code = model_code(p['iprModel'] if model is None else model)
+    pr = np.asarray(p['reservoirPressure'], dtype=float)
+    j = np.asarray(p['productivityIndex'], dtype=float)
+    fw_input = np.asarray(p['waterCut'], dtype=float) / 100.0
+    pb_input = np.minimum(np.asarray(p['bubblePointPressure'], dtype=float), pr)
+
+    pb = np.select([code == 0, code == 1], [0.0, pr], default=pb_input)
+    fw = np.where(code == 1, 0.0, fw_input)
+    fo = 1.0 - fw
+    q_bubble = j * (pr - pb)
+    q_vogel_max = j * pb / 1.8
+
+    safe_pb = np.where(pb > 0, pb, 1.0)
+    a = np.where(pb > 0, 0.8 * fo * q_vogel_max / safe_pb ** 2, 0.0)
+    b = np.where(pb > 0, 0.2 * fo * q_vogel_max / safe_pb + fw * j, 1.0)
+    c0 = fo * (q_bubble + q_vogel_max) + fw * j * pr
+    aof = np.where(pb > 0, c0, j * pr)
+    return IPRCoefficients(pr=pr, pb=pb, j=j, fo=fo, fw=fw, q_bubble=q_bubble,
+                           q_vogel_max=q_vogel_max, a=a, b=b, c0=c0, aof=aof)
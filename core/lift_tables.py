@@ -0,0 +1,186 @@
+"""Per-well lift tables: tubing pressure drop tabulated for reuse.
+
+A table holds the tubing pressure drop of ``run_design`` (Beggs-Brill with
+the free gas at the inflow pressure of each rate) over a grid of surface
+liquid rate × GOR × water cut for one well. Tables are
+stored as compressed ``.npz`` files named by a hash of the well properties
+and the grid axes, so later forecasts and designs for the same well
+interpolate instead of re-running the correlation. Grid points beyond the
+absolute open flow are NaN; for points outside the grid or in cells
+touching those, :func:`core.engine.tubing_pressure_drop` evaluates the
+correlation instead of clamping. Interpolation smooths the jumps of the
+correlation between flow patterns, so values next to a pattern change are
+approximate. The drop does not depend on the wellhead pressure (the
+correlation takes no pressure level), so it is not a grid axis.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.engine import InputsLike, prepare_inputs, run_design
+from core.interp import multilinear_interpolate
+from core.ipr import build_ipr
+
+# Inputs that define a table besides the grid axes: tubing, depth and fluid,
+# and the inflow (the intake pressure and temperature set the free gas).
+KEY_FIELDS = (
+    'tubingId', 'pumpDepth', 'liquidDensity', 'boFactor', 'viscosity',
+    'gasSpecificGravity', 'bubblePointPressure', 'surfaceTemperature', 'tempGradient',
+    'reservoirPressure', 'productivityIndex', 'iprModel', 'perforationDepth',
+)
+AXIS_NAMES = ('rate', 'gor', 'water_cut')
+TABLE_VERSION = 3
+
+Axes = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def table_axes(inputs: InputsLike = None, rates: Optional[np.ndarray] = None,
+               gors: Optional[np.ndarray] = None,
+               water_cuts: Optional[np.ndarray] = None) -> Axes:
+    """Grid axes of a well's table; defaults bracket its own rate, GOR and water cut.
+
+    The default rate axis stops at the absolute open flow.
+    """
+    p = prepare_inputs(inputs)
+    base = {key: float(value.reshape(-1)[0]) for key, value in p.items()}
+    if rates is None:
+        aof = float(np.reshape(build_ipr(p).aof, -1)[0])
+        rates = np.linspace(1.0, max(min(3.0 * base['targetFlowRate'], aof), 10.0), 25)
+    if gors is None:
+        gors = np.linspace(0.0, max(2.0 * base['gasOilRatio'], 10.0), 9)
+    if water_cuts is None:
+        water_cuts = np.linspace(0.0, 99.0, 8)
+    return tuple(np.asarray(axis, dtype=float) for axis in (rates, gors, water_cuts))
+
+
+def lift_table_key(inputs: InputsLike = None, axes: Optional[Axes] = None) -> str:
+    """Stable hash of the well properties and grid axes of one table."""
+    p = prepare_inputs(inputs)
+    axes = table_axes(p) if axes is None else axes
+    description = {field: round(float(p[field].reshape(-1)[0]), 6) for field in KEY_FIELDS}
+    description['axes'] = {name: np.round(axis, 6).tolist() for name, axis in zip(AXIS_NAMES, axes)}
+    description['version'] = TABLE_VERSION
+    raw = json.dumps(description, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+@dataclass
+class LiftTable:
+    """Tabulated pressure drop (atm) with multilinear lookup."""
+
+    key: str
+    rate: np.ndarray
+    gor: np.ndarray
+    water_cut: np.ndarray
+    values: np.ndarray
+
+    @property
+    def axes(self) -> Sequence[np.ndarray]:
+        return (self.rate, self.gor, self.water_cut)
+
+    def interpolate(self, rate: np.ndarray, gor: np.ndarray, water_cut: np.ndarray) -> np.ndarray:
+        """Pressure drop for arbitrary broadcast arrays of grid coordinates."""
+        return multilinear_interpolate(self.axes, self.values, (rate, gor, water_cut))
+
+    def covers(self, rate: np.ndarray, gor: np.ndarray, water_cut: np.ndarray) -> np.ndarray:
+        """Mask of points inside the grid (outside, ``interpolate`` clamps)."""
+        inside = True
+        for axis, x in zip(self.axes, (rate, gor, water_cut)):
+            inside = inside & (x >= axis[0]) & (x <= axis[-1])
+        return np.asarray(inside)
+
+    def save(self, path: Path) -> None:
+        np.savez_compressed(
+            path, key=np.array(self.key), rate=self.rate, gor=self.gor,
+            water_cut=self.water_cut, values=self.values,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> 'LiftTable':
+        with np.load(path) as data:
+            return cls(
+                key=str(data['key']),
+                rate=data['rate'], gor=data['gor'], water_cut=data['water_cut'],
+                values=data['values'],
+            )
+
+
+def generate_lift_table(inputs: InputsLike = None, rates: Optional[np.ndarray] = None,
+                        gors: Optional[np.ndarray] = None,
+                        water_cuts: Optional[np.ndarray] = None) -> LiftTable:
+    """Evaluate the ``run_design`` pressure drop over the full grid in one batched call.
+
+    Default axes come from :func:`table_axes`.
+    """
+    p = prepare_inputs(inputs)
+    base = {key: float(value.reshape(-1)[0]) for key, value in p.items()}
+    axes = table_axes(p, rates, gors, water_cuts)
+    q, gor, wc = np.meshgrid(*axes, indexing='ij')
+    grid_inputs = dict(base, targetFlowRate=q, gasOilRatio=gor, waterCut=wc)
+    design = run_design(grid_inputs)
+    # Rates the reservoir cannot deliver have no intake pressure to take the gas at.
+    drop = np.where(design['inflow_feasible'], design['pressure_drop'], np.nan)
+    return LiftTable(
+        key=lift_table_key(p, axes),
+        rate=axes[0], gor=axes[1], water_cut=axes[2],
+        values=drop,
+    )
+
+
+class LiftTableCache:
+    """Directory of lift tables keyed by :func:`lift_table_key`."""
+
+    def __init__(self, data_dir: Path = None):
+        """Initialize cache.
+
+        Args:
+            data_dir: Base directory. Defaults to the project directory;
+                tables live in its ``lift_tables`` subdirectory.
+        """
+        base = data_dir or Path(__file__).resolve().parent.parent
+        self.tables_dir = base / "lift_tables"
+        self._memory: Dict[str, LiftTable] = {}
+
+    def path_for(self, key: str) -> Path:
+        return self.tables_dir / f"{key}.npz"
+
+    def get(self, inputs: InputsLike = None, **grid) -> LiftTable:
+        """Return the well's table on the requested grid, loading or generating and storing it.
+
+        ``grid`` takes the axis arguments of :func:`generate_lift_table`.
+        """
+        axes = table_axes(inputs, **grid)
+        key = lift_table_key(inputs, axes)
+        if key in self._memory:
+            return self._memory[key]
+        path = self.path_for(key)
+        table = None
+        if path.exists():
+            try:
+                table = LiftTable.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error loading lift table {path.name}: {e}", file=sys.stderr)
+        if table is None:
+            table = generate_lift_table(inputs, *axes)
+            try:
+                self.tables_dir.mkdir(parents=True, exist_ok=True)
+                table.save(path)
+            except OSError as e:
+                print(f"Error saving lift table {path.name}: {e}", file=sys.stderr)
+        self._memory[key] = table
+        return table
+
+    def clear(self) -> None:
+        """Drop cached tables from memory and disk."""
+        self._memory.clear()
+        if self.tables_dir.exists():
+            for path in self.tables_dir.glob("*.npz"):
+                path.unlink()
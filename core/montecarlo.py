@@ -0,0 +1,236 @@
+"""Monte Carlo uncertainty mode for the design calculation.
+
+Uncertain inputs are sampled from user-set distributions and the whole set
+of realizations is pushed through the vectorized engine at once. Sampling
+is split into fixed-size chunks, each with its own child of one
+``SeedSequence``, so results are reproducible for a given seed no matter
+how many worker processes evaluate the chunks.
+
+With a surrogate (see ``core.surrogate``) the tubing pressure drop comes
+from a polynomial fit of the ``run_design`` drop instead of the correlation;
+every batch is checked against ``run_design`` on a random sample and
+recomputed by it when the error exceeds the threshold, so the surrogate
+changes the speed, not the result.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.chunks import chunk_plan, map_chunks
+from core.engine import DEFAULT_INPUTS, calculate_staging, prepare_inputs, run_design
+from core.sketches import StreamingSummary
+from core.surrogate import (PILOT_SIZE, SURROGATE_THRESHOLD_ATM, PolynomialSurrogate,
+                            merge_reports, pilot_surrogate)
+
+DISTRIBUTIONS = ('fixed', 'normal', 'lognormal', 'uniform', 'triangular')
+PERCENTILES = (10, 50, 90)
+DESIGN_METRICS = ('pip_atm', 'tdh_m', 'void_fraction')
+STAGING_METRICS = ('stages', 'shaft_power_kw', 'motor_power_kw')
+
+# Physical bounds applied after sampling.
+_BOUNDS = {'waterCut': (0.0, 100.0), 'separatorEfficiency': (0.0, 100.0)}
+
+
+def sample_inputs(base: Mapping[str, Any], distributions: Mapping[str, Mapping[str, Any]],
+                  n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """Draw ``n`` realizations of the inputs (every input as ``n`` values).
+
+    ``distributions`` maps an input key to a spec such as
+    ``{'type': 'normal', 'std': 5.0}``; ``mean``/``mode``/``value`` default
+    to the base value. Supported types: fixed, normal (mean, std),
+    lognormal (mean, std of the variable itself), uniform (low, high) and
+    triangular (low, mode, high).
+    """
+    sampled: Dict[str, Any] = dict(DEFAULT_INPUTS)
+    sampled.update(base)
+    for key, spec in distributions.items():
+        if key not in DEFAULT_INPUTS:
+            raise ValueError(f"Unknown input: {key}")
+        center = float(sampled[key])
+        kind = spec.get('type', 'normal')
+        if kind == 'fixed':
+            values = np.full(n, float(spec.get('value', center)))
+        elif kind == 'normal':
+            values = rng.normal(spec.get('mean', center), spec['std'], n)
+        elif kind == 'lognormal':
+            mean = float(spec.get('mean', center))
+            sigma2 = np.log1p((float(spec['std']) / mean) ** 2)
+            values = rng.lognormal(np.log(mean) - 0.5 * sigma2, np.sqrt(sigma2), n)
+        elif kind == 'uniform':
+            values = rng.uniform(spec['low'], spec['high'], n)
+        elif kind == 'triangular':
+            values = rng.triangular(spec['low'], spec.get('mode', center), spec['high'], n)
+        else:
+            raise ValueError(f"Unknown distribution for {key}: {kind}")
+        low, high = _BOUNDS.get(key, (0.0, np.inf))
+        sampled[key] = np.clip(values, low, high)
+    # Fixed inputs become read-only views, so the batch has ``n`` rows even
+    # when nothing is uncertain.
+    return {key: np.broadcast_to(np.asarray(value, dtype=float), (n,)) for key, value in sampled.items()}
+
+
+def _evaluate(inputs: Mapping[str, Any], pump: Optional[Mapping[str, Any]] = None,
+              surrogate: Optional[PolynomialSurrogate] = None,
+              rng: Optional[np.random.Generator] = None,
+              threshold: float = SURROGATE_THRESHOLD_ATM) -> Tuple[Dict[str, np.ndarray],
+                                                                    Optional[Dict[str, Any]]]:
+    p = prepare_inputs(inputs)
+    report = None
+    if surrogate is None:
+        design = run_design(p)
+    else:
+        design, report = surrogate.design(p, rng=rng, threshold=threshold)
+    metrics = {key: design[key] for key in DESIGN_METRICS}
+    if pump is not None:
+        staging = calculate_staging(design, p, pump)
+        metrics.update({key: staging[key] for key in STAGING_METRICS})
+    feasible = design['inflow_feasible']
+    return {key: np.where(feasible, value, np.nan) for key, value in metrics.items()}, report
+
+
+def evaluate_realizations(inputs: Mapping[str, Any],
+                          pump: Optional[Mapping[str, Any]] = None,
+                          surrogate: Optional[PolynomialSurrogate] = None,
+                          rng: Optional[np.random.Generator] = None,
+                          threshold: float = SURROGATE_THRESHOLD_ATM) -> Dict[str, np.ndarray]:
+    """Design (and staging, when a pump is given) for a batch of realizations.
+
+    With a ``surrogate`` the pressure drop comes from it, checked against
+    ``run_design`` on a sample drawn with ``rng``. Realizations whose target
+    rate exceeds the inflow capacity are NaN.
+    """
+    return _evaluate(inputs, pump, surrogate, rng, threshold)[0]
+
+
+def _run_chunk(args) -> Tuple[Dict[str, np.ndarray], List[Dict[str, Any]]]:
+    base, distributions, n, seed, pump, surrogate, threshold = args
+    rng = np.random.default_rng(seed)
+    check_rng = np.random.default_rng(seed.spawn(1)[0])
+    metrics, report = _evaluate(sample_inputs(base, distributions, n, rng), pump,
+                                surrogate, check_rng, threshold)
+    return metrics, [report] if report is not None else []
+
+
+def _run_chunk_streaming(args) -> Tuple[StreamingSummary, List[Dict[str, Any]]]:
+    base, distributions, n, seed, pump, batch_size, histogram_ranges, surrogate, threshold = args
+    sample_seed, sketch_seed, check_seed = seed.spawn(3)
+    rng = np.random.default_rng(sample_seed)
+    check_rng = np.random.default_rng(check_seed)
+    summary = StreamingSummary(histogram_ranges, seed=sketch_seed)
+    reports = []
+    for start in range(0, n, batch_size):
+        size = min(batch_size, n - start)
+        metrics, report = _evaluate(sample_inputs(base, distributions, size, rng), pump,
+                                    surrogate, check_rng, threshold)
+        summary.update(metrics)
+        if report is not None:
+            reports.append(report)
+    return summary, reports
+
+
+def summarize(samples: Mapping[str, np.ndarray],
+              percentiles: Sequence[float] = PERCENTILES) -> Dict[str, Dict[str, float]]:
+    """P10/P50/P90 (10th/50th/90th percentiles), mean, std and IQR per metric.
+
+    NaN realizations are excluded and counted in ``failed_fraction``.
+    Rates just below the absolute open flow leave almost no intake pressure
+    and need enormous heads, so a few such realizations can dominate the
+    mean and std; the percentiles and the interquartile range ``iqr`` are
+    robust to them.
+    """
+    summary = {}
+    for key, values in samples.items():
+        finite = values[np.isfinite(values)]
+        if finite.size:
+            row = {f"P{int(q)}": float(v)
+                   for q, v in zip(percentiles, np.percentile(finite, percentiles))}
+            row['mean'] = float(finite.mean())
+            row['std'] = float(finite.std())
+            q25, q75 = np.percentile(finite, (25, 75))
+            row['iqr'] = float(q75 - q25)
+        else:
+            row = {f"P{int(q)}": float('nan') for q in percentiles}
+            row.update(mean=float('nan'), std=float('nan'), iqr=float('nan'))
+        row['failed_fraction'] = 1.0 - finite.size / max(values.size, 1)
+        summary[key] = row
+    return summary
+
+
+def run_monte_carlo(base: Optional[Mapping[str, Any]] = None,
+                    distributions: Optional[Mapping[str, Mapping[str, Any]]] = None,
+                    n: int = 10000, pump: Optional[Mapping[str, Any]] = None,
+                    seed: Optional[int] = None, workers: Optional[int] = None,
+                    chunk_size: int = 50000,
+                    keep_samples: bool = False, streaming: bool = False,
+                    batch_size: int = 50000,
+                    histogram_ranges: Optional[Mapping[str, tuple]] = None,
+                    surrogate: Union[None, bool, PolynomialSurrogate] = None,
+                    surrogate_threshold: float = SURROGATE_THRESHOLD_ATM) -> Dict[str, Any]:
+    """Probabilistic design: P10/P50/P90 of PIP, TDH, void fraction and staging.
+
+    Args:
+        base: Deterministic inputs (camelCase keys); defaults fill the rest.
+        distributions: Per-input distribution specs, see :func:`sample_inputs`.
+        n: Number of realizations.
+        pump: Catalog pump dict; enables stages and motor power metrics.
+        seed: Root seed; identical seeds give identical results.
+        workers: Worker processes; ``None`` or 1 evaluates in-process.
+        chunk_size: Realizations per chunk (and per random stream).
+        keep_samples: Also return the per-realization arrays.
+        streaming: Aggregate into mergeable sketches instead of keeping
+            every realization; memory no longer grows with ``n``.
+        batch_size: Realizations evaluated at once inside a streaming chunk.
+        histogram_ranges: Metric -> (low, high) for streaming histograms.
+        surrogate: Fitted surrogate for the tubing pressure drop, or
+            ``True`` to fit one on ``PILOT_SIZE`` extra realizations first
+            (no surrogate is used when the pilot is nearly all infeasible).
+        surrogate_threshold: Largest validation error (atm) before a batch
+            falls back to ``run_design``.
+
+    Returns:
+        Dict with ``n``, ``seed`` (the root entropy, to reproduce unseeded
+        runs) and ``summary`` (metric -> P10/P50/P90, mean, std, IQR; see
+        :func:`summarize` on the mean and std near the open flow), plus
+        ``samples`` when requested. Streaming runs return approximate
+        percentiles, min/max and the merged ``aggregate`` instead of samples.
+        Surrogate runs add ``surrogate``: per-batch validation totals,
+        ``fallback`` when any batch fell back, and the fit ``holdout``.
+    """
+    if n < 1:
+        raise ValueError(f"Need at least one realization, got n={n}")
+    base = dict(base or {})
+    distributions = dict(distributions or {})
+    root = np.random.SeedSequence(seed)
+    plan = chunk_plan(n, chunk_size, root)
+    if surrogate is True:
+        # Spawned after the chunks, so their random streams do not change.
+        pilot_seed, fit_seed = root.spawn(1)[0].spawn(2)
+        pilot = sample_inputs(base, distributions, PILOT_SIZE, np.random.default_rng(pilot_seed))
+        surrogate = pilot_surrogate(pilot, rng=np.random.default_rng(fit_seed))
+    elif surrogate is False:
+        surrogate = None
+
+    if streaming:
+        tasks = [(base, distributions, size, child, pump, batch_size, histogram_ranges,
+                  surrogate, surrogate_threshold) for size, child in plan]
+        parts = map_chunks(_run_chunk_streaming, tasks, workers)
+        aggregate = parts[0][0]
+        for part, _ in parts[1:]:
+            aggregate.merge(part)
+        result: Dict[str, Any] = {'n': n, 'seed': root.entropy, 'summary': aggregate.summary(),
+                                  'aggregate': aggregate}
+    else:
+        tasks = [(base, distributions, size, child, pump, surrogate, surrogate_threshold)
+                 for size, child in plan]
+        parts = map_chunks(_run_chunk, tasks, workers)
+        samples = {key: np.concatenate([chunk[key] for chunk, _ in parts]) for key in parts[0][0]}
+        result = {'n': n, 'seed': root.entropy, 'summary': summarize(samples)}
+        if keep_samples:
+            result['samples'] = samples
+    if surrogate is not None:
+        result['surrogate'] = merge_reports([report for _, reports in parts for report in reports],
+                                            surrogate.holdout)
+    return result
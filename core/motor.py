@@ -0,0 +1,143 @@
+"""Motor and cable sizing over every cable × supply voltage × motor combination.
+
+The electrical model is the one of ``calculate_staging``: three-phase
+current from the motor input power, cable losses ``3 I² R`` and a voltage
+drop ``√3 I R`` along the cable, with the copper resistance corrected for
+temperature as in ``MotorTab._get_cable_resistance``. All combinations are
+evaluated as one broadcast array with axes ``(..., cables, voltages,
+motors)``; the feasible ones are ranked by lifecycle cost (equipment plus
+the energy drawn over the service life).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from core.engine import MOTOR_EFFICIENCY, MOTOR_POWER_FACTOR, MOTOR_POWER_MARGIN, MOTOR_POWERS_KW
+
+# Copper cable resistance per conductor at 20 °C, Ω/km, by cross-section (mm²).
+CABLE_RESISTANCE_20_OHM_KM: Dict[str, float] = {
+    "Cu 4мм²": 4.61,
+    "Cu 6мм²": 3.08,
+    "Cu 10мм²": 1.83,
+    "Cu 16мм²": 1.15,
+    "Cu 25мм²": 0.727,
+}
+CABLE_SECTIONS_MM2 = (4.0, 6.0, 10.0, 16.0, 25.0)
+COPPER_TEMP_COEFF = 0.004
+SUPPLY_VOLTAGES_V = (1000.0, 1500.0, 2000.0, 3000.0, 5000.0)
+
+# Voltage drop above 5 % of the supply voltage is not acceptable.
+MAX_VOLTAGE_DROP = 0.05
+
+# Rough cost assumptions for ranking, $.
+MOTOR_COST_PER_KW = 300.0
+CABLE_COST_PER_MM2_KM = 250.0
+VOLTAGE_COST_PER_KV = 1500.0
+ENERGY_PRICE_PER_KWH = 0.08
+SERVICE_YEARS = 3.0
+HOURS_PER_YEAR = 8760.0
+
+
+def cable_resistance(r20_ohm_km: np.ndarray, length_m: np.ndarray,
+                     temp_c: np.ndarray) -> np.ndarray:
+    """Conductor resistance, Ω, for the cable length and temperature."""
+    return (np.asarray(r20_ohm_km, dtype=float) * (1.0 + COPPER_TEMP_COEFF * (np.asarray(temp_c) - 20.0))
+            * np.asarray(length_m, dtype=float) / 1000.0)
+
+
+def size_motor_cable(shaft_kw: Any, cable_length_m: Any, temp_c: Any = 20.0,
+                     r20_ohm_km: Sequence[float] = tuple(CABLE_RESISTANCE_20_OHM_KM.values()),
+                     sections_mm2: Sequence[float] = CABLE_SECTIONS_MM2,
+                     voltages_v: Sequence[float] = SUPPLY_VOLTAGES_V,
+                     motors_kw: Sequence[float] = MOTOR_POWERS_KW,
+                     motor_voltages_v: Optional[Sequence[float]] = None,
+                     motor_costs: Optional[Sequence[float]] = None,
+                     cable_costs_per_km: Optional[Sequence[float]] = None,
+                     motor_eff: float = MOTOR_EFFICIENCY,
+                     power_factor: float = MOTOR_POWER_FACTOR,
+                     power_margin: float = MOTOR_POWER_MARGIN,
+                     max_voltage_drop: float = MAX_VOLTAGE_DROP,
+                     energy_price: float = ENERGY_PRICE_PER_KWH,
+                     service_years: float = SERVICE_YEARS) -> Dict[str, np.ndarray]:
+    """Electrical parameters and lifecycle cost of every combination.
+
+    ``shaft_kw``, ``cable_length_m`` and ``temp_c`` may be per-well arrays;
+    they get three trailing axes ``(cables, voltages, motors)``. Catalog
+    motors (``core.equipment.motor_arrays``) pass their rated voltages, so
+    a motor only pairs with its own supply voltage, and their prices;
+    catalog cables pass ``price_per_km``. Without prices the
+    ``MOTOR_COST_PER_KW`` and ``CABLE_COST_PER_MM2_KM`` estimates apply.
+
+    Returns:
+        Dict with the candidate vectors and arrays of shape
+        ``(..., cables, voltages, motors)``: ``current_a``,
+        ``cable_resistance_ohm``, ``voltage_drop_v``, ``cable_losses_kw``,
+        ``input_kw``, ``total_efficiency``, ``load_factor``, ``capex``,
+        ``lifecycle_cost`` and ``feasible`` (motor covers the input power
+        with the margin and the voltage drop is within limits).
+    """
+    shaft = np.asarray(shaft_kw, dtype=float)[..., None, None, None]
+    length = np.asarray(cable_length_m, dtype=float)[..., None, None, None]
+    temp = np.asarray(temp_c, dtype=float)[..., None, None, None]
+    r20 = np.asarray(r20_ohm_km, dtype=float)[:, None, None]
+    sections = np.asarray(sections_mm2, dtype=float)[:, None, None]
+    voltage = np.asarray(voltages_v, dtype=float)[None, :, None]
+    motors = np.asarray(motors_kw, dtype=float)[None, None, :]
+
+    motor_input_kw = shaft / motor_eff
+    current = motor_input_kw * 1000.0 / (np.sqrt(3) * voltage * power_factor)
+    resistance = cable_resistance(r20, length, temp)
+    losses_kw = 3 * current ** 2 * resistance / 1000.0
+    drop = np.sqrt(3) * current * resistance
+    input_kw = motor_input_kw + losses_kw
+
+    feasible = (motors >= input_kw * power_margin) & (drop <= max_voltage_drop * voltage)
+    if motor_voltages_v is not None:
+        feasible &= np.asarray(motor_voltages_v, dtype=float)[None, None, :] == voltage
+    motor_cost = (MOTOR_COST_PER_KW * motors if motor_costs is None
+                  else np.asarray(motor_costs, dtype=float)[None, None, :])
+    cable_cost = (CABLE_COST_PER_MM2_KM * sections if cable_costs_per_km is None
+                  else np.asarray(cable_costs_per_km, dtype=float)[:, None, None])
+    capex = motor_cost + cable_cost * length / 1000.0 + VOLTAGE_COST_PER_KV * voltage / 1000.0
+    energy_cost = input_kw * HOURS_PER_YEAR * service_years * energy_price
+    lifecycle = capex + energy_cost
+    return {
+        'r20_ohm_km': np.asarray(r20_ohm_km, dtype=float),
+        'sections_mm2': np.asarray(sections_mm2, dtype=float),
+        'voltages_v': np.asarray(voltages_v, dtype=float),
+        'motors_kw': np.asarray(motors_kw, dtype=float),
+        'current_a': np.broadcast_to(current, lifecycle.shape),
+        'cable_resistance_ohm': np.broadcast_to(resistance, lifecycle.shape),
+        'voltage_drop_v': np.broadcast_to(drop, lifecycle.shape),
+        'cable_losses_kw': np.broadcast_to(losses_kw, lifecycle.shape),
+        'input_kw': np.broadcast_to(input_kw, lifecycle.shape),
+        'total_efficiency': np.broadcast_to(shaft / input_kw, lifecycle.shape),
+        'load_factor': np.broadcast_to(input_kw / motors, lifecycle.shape),
+        'capex': np.broadcast_to(capex, lifecycle.shape),
+        'lifecycle_cost': lifecycle,
+        'feasible': feasible,
+    }
+
+
+def best_combinations(sizing: Mapping[str, np.ndarray], well: Any = (),
+                      limit: Optional[int] = 5) -> List[Dict[str, float]]:
+    """Feasible combinations of one well, cheapest lifecycle cost first."""
+    cost = np.where(sizing['feasible'][well], sizing['lifecycle_cost'][well], np.inf)
+    order = np.argsort(cost, axis=None, kind='stable')
+    order = order[np.isfinite(cost.reshape(-1)[order])][:limit]
+    rows = []
+    for c, v, m in zip(*np.unravel_index(order, cost.shape)):
+        row = {
+            'section_mm2': float(sizing['sections_mm2'][c]),
+            'r20_ohm_km': float(sizing['r20_ohm_km'][c]),
+            'voltage_v': float(sizing['voltages_v'][v]),
+            'motor_kw': float(sizing['motors_kw'][m]),
+        }
+        for key in ('current_a', 'voltage_drop_v', 'cable_losses_kw', 'input_kw',
+                    'total_efficiency', 'load_factor', 'capex', 'lifecycle_cost'):
+            row[key] = float(sizing[key][well][c, v, m])
+        rows.append(row)
+    return rows
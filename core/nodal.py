@@ -0,0 +1,195 @@
+"""Nodal analysis at the pump intake node.
+
+The inflow (IPR) and outflow (tubing + pump VLP) curves are built as
+arrays over a per-well rate grid, intersections are located by vectorized
+sign-change detection and then refined by batched regula falsi. A whole
+portfolio of wells is solved in one call.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+
+from core.engine import (
+    G,
+    PA_PER_ATM,
+    InputArrays,
+    InputsLike,
+    intake_temperature,
+    prepare_inputs,
+    take_inputs,
+    tubing_pressure_drop,
+    void_fraction_and_rate,
+)
+from core.ipr import IPRCoefficients, build_ipr
+
+PumpLike = Optional[Mapping[str, Any]]
+
+
+def pump_head(q_m3: np.ndarray, pump: Mapping[str, Any], stages: np.ndarray,
+              head_factor: np.ndarray = 1.0) -> np.ndarray:
+    """Total pump head at downhole rate, m (curve shape from drawPumpChart)."""
+    q_ratio = q_m3 / np.asarray(pump['nominal_q_m3'], dtype=float)
+    shape = np.maximum(0.0, 1.0 - 0.05 * q_ratio ** 2 - 0.1 * q_ratio ** 3)
+    return shape * np.asarray(pump['head_per_stage_m'], dtype=float) * stages * head_factor
+
+
+def vlp_curve(q_m3: np.ndarray, p: InputArrays, pump: PumpLike = None,
+              stages: Optional[np.ndarray] = None, lift_table: Any = None,
+              ipr: Optional[IPRCoefficients] = None) -> np.ndarray:
+    """Outflow curve: intake pressure required to lift ``q_m3`` to the wellhead, atm.
+
+    Required pressure is wellhead pressure plus tubing pressure drop minus
+    the pump pressure rise. Without a pump this is the natural-flow VLP.
+    Free gas is evaluated at the inflow pressure of the same rate, which is
+    exact at the intersection. A single-well ``lift_table`` replaces the
+    tubing correlation.
+    """
+    ipr = build_ipr(p) if ipr is None else ipr
+    pip = ipr.pwf(q_m3)
+    void = void_fraction_and_rate(pip, intake_temperature(p, q_m3), q_m3, p)
+    dp_tubing = tubing_pressure_drop(q_m3, void, p, lift_table)
+    required = p['tubingHeadPressure'] + dp_tubing
+    if pump is not None:
+        head = pump_head(void['total_rate'], pump, stages, p['viscCorrHead'])
+        required = required - head * p['liquidDensity'] * G / PA_PER_ATM
+    return required
+
+
+def build_curves(inputs: InputsLike = None, pump: PumpLike = None,
+                 stages: Optional[np.ndarray] = None, points: int = 200,
+                 q_max: Optional[np.ndarray] = None,
+                 lift_table: Any = None) -> Dict[str, np.ndarray]:
+    """IPR and VLP on a ``(wells, points)`` rate grid.
+
+    The grid for each well spans up to its absolute open flow unless
+    ``q_max`` is given.
+    """
+    p = prepare_inputs(inputs)
+    p = {key: value.reshape(-1) for key, value in p.items()}
+    pump, stages = _prepare_pump(pump, stages, p)
+    ipr = build_ipr(p)
+    if q_max is None:
+        q_max = ipr.aof
+    q_max = np.broadcast_to(np.asarray(q_max, dtype=float), p['reservoirPressure'].shape)
+    # Start just above zero: at q = 0 the mixture velocity vanishes.
+    q_grid = q_max[:, None] * np.linspace(1e-3, 1.0, points)[None, :]
+    grid_p = {key: value[:, None] for key, value in p.items()}
+    grid_ipr = ipr.expand()
+    grid_pump = None if pump is None else {key: value[:, None] for key, value in pump.items()}
+    grid_stages = None if stages is None else stages[:, None]
+    return {
+        'q_grid': q_grid,
+        'ipr': grid_ipr.pwf(q_grid),
+        'vlp': vlp_curve(q_grid, grid_p, grid_pump, grid_stages, lift_table, grid_ipr),
+    }
+
+
+def find_operating_points(inputs: InputsLike = None, pump: PumpLike = None,
+                          stages: Optional[np.ndarray] = None, points: int = 200,
+                          q_max: Optional[np.ndarray] = None, iterations: int = 40,
+                          tolerance: float = 1e-6,
+                          lift_table: Any = None) -> Dict[str, np.ndarray]:
+    """All IPR × VLP intersections and the stable operating point per well.
+
+    Returns the curves plus ``roots_q``/``roots_p``/``roots_stable`` padded
+    with NaN/False to the largest root count in the batch, and ``q_op``/
+    ``p_op`` for the highest-rate stable intersection (NaN if none).
+    """
+    p = prepare_inputs(inputs)
+    p = {key: value.reshape(-1) for key, value in p.items()}
+    pump, stages = _prepare_pump(pump, stages, p)
+    curves = build_curves(p, pump, stages, points, q_max, lift_table)
+    q_grid = curves['q_grid']
+    f = curves['ipr'] - curves['vlp']
+    n_wells = q_grid.shape[0]
+
+    crossing = (np.sign(f[:, :-1]) * np.sign(f[:, 1:]) < 0) | (f[:, :-1] == 0)
+    well_idx, seg_idx = np.nonzero(crossing)
+
+    q_lo = q_grid[well_idx, seg_idx]
+    q_hi = q_grid[well_idx, seg_idx + 1]
+    f_lo = f[well_idx, seg_idx]
+    f_hi = f[well_idx, seg_idx + 1]
+    stable = f_lo > f_hi  # IPR above VLP to the left of the root
+
+    if well_idx.size:
+        sub_p = take_inputs(p, well_idx)
+        sub_ipr = build_ipr(p).take(well_idx)
+        sub_pump = None if pump is None else {key: value[well_idx] for key, value in pump.items()}
+        sub_stages = None if stages is None else stages[well_idx]
+
+        def residual(q: np.ndarray) -> np.ndarray:
+            return sub_ipr.pwf(q) - vlp_curve(q, sub_p, sub_pump, sub_stages, lift_table, sub_ipr)
+
+        root = _regula_falsi(residual, q_lo, q_hi, f_lo, f_hi, iterations, tolerance)
+        root_p = sub_ipr.pwf(root)
+    else:
+        root = root_p = np.empty(0)
+
+    counts = np.bincount(well_idx, minlength=n_wells)
+    width = max(int(counts.max()) if n_wells else 0, 1)
+    rank = np.cumsum(crossing, axis=1)[well_idx, seg_idx] - 1
+
+    roots_q = np.full((n_wells, width), np.nan)
+    roots_p = np.full((n_wells, width), np.nan)
+    roots_stable = np.zeros((n_wells, width), dtype=bool)
+    roots_q[well_idx, rank] = root
+    roots_p[well_idx, rank] = root_p
+    roots_stable[well_idx, rank] = stable
+
+    stable_q = np.where(roots_stable, roots_q, -np.inf)
+    best = np.argmax(stable_q, axis=1)
+    has_point = roots_stable.any(axis=1)
+    rows = np.arange(n_wells)
+    curves.update({
+        'roots_q': roots_q,
+        'roots_p': roots_p,
+        'roots_stable': roots_stable,
+        'n_roots': counts,
+        'q_op': np.where(has_point, roots_q[rows, best], np.nan),
+        'p_op': np.where(has_point, roots_p[rows, best], np.nan),
+        'has_operating_point': has_point,
+    })
+    return curves
+
+
+def _prepare_pump(pump: PumpLike, stages: Optional[np.ndarray],
+                  p: InputArrays):
+    if pump is None:
+        return None, None
+    if stages is None:
+        raise ValueError("stages must be given together with pump")
+    shape = p['reservoirPressure'].shape
+    pump = {
+        key: np.broadcast_to(np.asarray(pump[key], dtype=float), shape)
+        for key in ('nominal_q_m3', 'head_per_stage_m')
+    }
+    return pump, np.broadcast_to(np.asarray(stages, dtype=float), shape)
+
+
+def _regula_falsi(func, lo: np.ndarray, hi: np.ndarray, f_lo: np.ndarray, f_hi: np.ndarray,
+                  iterations: int, tolerance: float) -> np.ndarray:
+    """Batched Illinois regula falsi on independent brackets."""
+    lo, hi, f_lo, f_hi = lo.copy(), hi.copy(), f_lo.copy(), f_hi.copy()
+    mid = np.where(f_lo == 0, lo, 0.5 * (lo + hi))
+    side = np.zeros(lo.shape, dtype=np.int8)
+    for _ in range(iterations):
+        denom = f_hi - f_lo
+        mid = np.where(denom != 0, (lo * f_hi - hi * f_lo) / np.where(denom != 0, denom, 1.0),
+                       0.5 * (lo + hi))
+        f_mid = func(mid)
+        left = np.sign(f_mid) == np.sign(f_lo)
+        # Illinois modification: halve the stale endpoint to keep convergence superlinear.
+        f_hi = np.where(left & (side == 1), 0.5 * f_hi, f_hi)
+        f_lo = np.where(~left & (side == -1), 0.5 * f_lo, f_lo)
+        lo = np.where(left, mid, lo)
+        f_lo = np.where(left, f_mid, f_lo)
+        hi = np.where(left, hi, mid)
+        f_hi = np.where(left, f_hi, f_mid)
+        side = np.where(left, 1, -1).astype(np.int8)
+        if np.all(np.abs(f_mid) < tolerance) or np.all(hi - lo < tolerance):
+            break
+    return mid
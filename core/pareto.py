@@ -0,0 +1,178 @@
+"""Multi-objective design: Pareto front of pump/motor/cable/frequency candidates.
+
+Candidates for one well are every catalog pump at every drive frequency
+(affinity laws: rate range and NPSHr scale with ``f/50`` and ``(f/50)²``,
+head per stage with ``(f/50)²``, so the stage count follows from the TDH),
+combined with every catalog motor (available power scales with ``f/50``)
+and cable. Each feasible candidate is scored on capital cost, energy per
+cubic metre of liquid, NPSH margin and the gas head factor; the
+non-dominated ones are extracted with a vectorized sweep.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from core.bundles import PUMP_COST_PER_STAGE
+from core.catalog import catalog_arrays
+from core.cavitation import npsh_margin, npsh_required
+from core.engine import (G, MOTOR_POWER_MARGIN, SECONDS_PER_DAY, InputsLike, batch_size,
+                         prepare_inputs, run_design)
+from core.equipment import cable_arrays, motor_arrays
+from core.gas import gas_factors
+from core.motor import COPPER_TEMP_COEFF, MAX_VOLTAGE_DROP
+from core.viscosity import viscosity_corrections
+
+BASE_FREQUENCY_HZ = 50.0
+FREQUENCIES_HZ = (40.0, 45.0, 50.0, 55.0, 60.0)
+
+# Objective -> +1 to minimize, -1 to maximize.
+OBJECTIVES: Dict[str, int] = {
+    'capex': 1,
+    'kwh_per_m3': 1,
+    'npsh_margin': -1,
+    'gas_head_factor': -1,
+}
+
+
+def non_dominated(scores: np.ndarray) -> np.ndarray:
+    """Indices of the non-dominated rows of ``(n, objectives)`` scores (all minimized).
+
+    Rows are visited in order of their score sum; each kept row removes
+    every row it dominates in one vectorized comparison, so the cost grows
+    with the size of the front rather than with ``n²``. Of identical rows
+    only the first is kept.
+    """
+    scores = np.asarray(scores, dtype=float)
+    order = np.argsort(scores.sum(axis=1), kind='stable')
+    remaining = order
+    current = scores[order]
+    i = 0
+    while i < remaining.size:
+        keep = np.any(current < current[i], axis=1)
+        keep[i] = True
+        remaining = remaining[keep]
+        current = current[keep]
+        i = int(np.count_nonzero(keep[:i])) + 1
+    return np.sort(remaining)
+
+
+def non_dominated_sort(scores: np.ndarray) -> np.ndarray:
+    """Front rank of every row (0 for the Pareto front), peeling fronts in turn."""
+    scores = np.asarray(scores, dtype=float)
+    rank = np.full(scores.shape[0], -1)
+    left = np.arange(scores.shape[0])
+    front = 0
+    while left.size:
+        # Duplicates of a front row share its rank.
+        best = left[non_dominated(scores[left])]
+        same = (scores[left][:, None, :] == scores[best][None, :, :]).all(axis=2).any(axis=1)
+        rank[left[same]] = front
+        left = left[~same]
+        front += 1
+    return rank
+
+
+def generate_candidates(inputs: InputsLike = None,
+                        catalog: Optional[Sequence[Mapping[str, Any]]] = None,
+                        motors: Optional[Sequence[Mapping[str, Any]]] = None,
+                        cables: Optional[Sequence[Mapping[str, Any]]] = None,
+                        frequencies_hz: Sequence[float] = FREQUENCIES_HZ,
+                        max_voltage_drop: float = MAX_VOLTAGE_DROP) -> Dict[str, np.ndarray]:
+    """Feasible candidates of one well as flat columns.
+
+    Returns:
+        Dict of equal-length arrays: ``pump_index``, ``frequency_hz``,
+        ``motor_index``, ``cable_index``, ``stages``, ``shaft_power_kw``,
+        ``input_power_kw``, ``voltage_drop_v`` and the objectives
+        ``capex``, ``kwh_per_m3``, ``npsh_margin``, ``gas_head_factor``.
+    """
+    p = prepare_inputs(inputs)
+    if batch_size(p) != 1:
+        raise ValueError("generate_candidates expects the inputs of a single well")
+    p = {key: value.reshape(()) for key, value in p.items()}
+    pumps_a = catalog_arrays(catalog)
+    motors_a = motor_arrays(motors)
+    cables_a = cable_arrays(cables)
+    design = run_design(p)
+    q = design['downhole_q_m3']
+
+    # (pumps, frequencies)
+    ratio = np.asarray(frequencies_hz, dtype=float)[None, :] / BASE_FREQUENCY_HZ
+    factors = viscosity_corrections(p, pumps_a, q)
+    c_q, c_h, c_eff = (factors[key][:, None] for key in ('c_q', 'c_h', 'c_eff'))
+    head_f, eff_f = gas_factors(pumps_a['gas_tolerance_code'], design['void_fraction'])
+    head = (pumps_a['head_per_stage_m'] * p['viscCorrHead'] * head_f)[:, None] * c_h * ratio ** 2
+    efficiency = (pumps_a['base_eff'] * p['viscCorrEff'] * eff_f)[:, None] * c_eff
+    stages = np.ceil(design['tdh_m'] / head)
+    hydraulic_kw = q / SECONDS_PER_DAY * p['liquidDensity'] * G * design['tdh_m'] / 1000.0
+    shaft = np.broadcast_to(hydraulic_kw / efficiency, stages.shape)
+    in_range = ((q >= pumps_a['min_q_m3'][:, None] * c_q * ratio)
+                & (q <= pumps_a['max_q_m3'][:, None] * c_q * ratio))
+    required = npsh_required(pumps_a, q / (c_q * ratio).T).T * ratio ** 2
+    margin = npsh_margin(design['pip_atm'], design['temp_bottom_c'], p['bubblePointPressure'],
+                         0.0, required)['cavitation_margin']
+
+    # (pumps, frequencies, motors, cables)
+    shaft4 = shaft[:, :, None, None]
+    ratio4 = ratio[:, :, None, None]
+    eff_m = motors_a['efficiency'][:, None]
+    voltage = motors_a['voltage_v'][:, None] * ratio4
+    motor_input = shaft4 / eff_m
+    current = motor_input * 1000.0 / (np.sqrt(3) * voltage * motors_a['power_factor'][:, None])
+    length_km = p['pumpDepth'] / 1000.0
+    resistance = (cables_a['r20_ohm_km'] * (1.0 + COPPER_TEMP_COEFF * (design['temp_bottom_c'] - 20.0))
+                  * length_km)
+    losses = 3 * current ** 2 * resistance / 1000.0
+    drop = np.sqrt(3) * current * resistance
+    input_kw = motor_input + losses
+    feasible = ((in_range & np.isfinite(shaft))[:, :, None, None]
+                & (motors_a['power_kw'][:, None] * ratio4 >= input_kw * MOTOR_POWER_MARGIN)
+                & (drop <= max_voltage_drop * voltage))
+
+    k, f, m, c = np.nonzero(feasible)
+    price_per_stage = np.broadcast_to(pumps_a.get('price_per_stage', PUMP_COST_PER_STAGE),
+                                      pumps_a['min_q_m3'].shape)
+    capex = (stages[k, f] * price_per_stage[k] + motors_a['price'][m]
+             + cables_a['price_per_km'][c] * length_km)
+    return {
+        'pump_index': k,
+        'frequency_hz': np.asarray(frequencies_hz, dtype=float)[f],
+        'motor_index': m,
+        'cable_index': c,
+        'stages': stages[k, f],
+        'shaft_power_kw': shaft[k, f],
+        'input_power_kw': input_kw[k, f, m, c],
+        'voltage_drop_v': drop[k, f, m, c],
+        'capex': capex,
+        'kwh_per_m3': input_kw[k, f, m, c] * 24.0 / p['targetFlowRate'],
+        'npsh_margin': margin[k, f],
+        'gas_head_factor': head_f[k],
+    }
+
+
+def pareto_front(candidates: Mapping[str, np.ndarray],
+                 objectives: Mapping[str, int] = OBJECTIVES) -> np.ndarray:
+    """Indices of the non-dominated candidates, cheapest first."""
+    scores = np.column_stack([sign * np.asarray(candidates[key], dtype=float)
+                              for key, sign in objectives.items()])
+    front = non_dominated(scores)
+    return front[np.argsort(candidates['capex'][front], kind='stable')]
+
+
+def pareto_rows(candidates: Mapping[str, np.ndarray], front: np.ndarray,
+                catalog: Optional[Sequence[Mapping[str, Any]]] = None,
+                motors: Optional[Sequence[Mapping[str, Any]]] = None,
+                cables: Optional[Sequence[Mapping[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Front candidates as rows with equipment names."""
+    pumps_a, motors_a, cables_a = catalog_arrays(catalog), motor_arrays(motors), cable_arrays(cables)
+    rows = []
+    for i in front:
+        row = {key: values[i].item() for key, values in candidates.items()}
+        row['pump'] = pumps_a['name'][row['pump_index']]
+        row['motor'] = motors_a['model'][row['motor_index']]
+        row['cable'] = cables_a['model'][row['cable_index']]
+        rows.append(row)
+    return rows
@@ -0,0 +1,297 @@
+"""Field-wide equipment forecast on a persistent pool of shared-memory workers.
+
+Per-well inputs, the numeric catalog columns and the output arrays live in
+``multiprocessing.shared_memory`` blocks. Tasks sent to the workers carry
+only block descriptors and a well range; each worker attaches the blocks,
+runs :func:`core.forecast.equipment_forecast` on its slice and writes the
+results in place. The parent reads them back as views of shared memory, so
+nothing but a few bytes per task is pickled (plus the coefficients of an
+optional pressure-drop surrogate, see ``core.surrogate``).
+"""
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from core.catalog import catalog_arrays, numeric_columns
+from core.engine import DEFAULT_INPUTS, InputsLike, prepare_inputs
+from core.forecast import (NO_PUMP_NAME, STATUS_NO_PUMP, equipment_forecast, forecast_surrogate,
+                           selected_pump_index)
+from core.surrogate import PolynomialSurrogate, merge_reports
+
+_ALIGNMENT = 64
+# Fields smaller than this are forecast in-process: dispatching to the pool
+# costs about 7-10 ms per run, more than the ~55 µs per well of a five-year
+# forecast that a few workers could save (measured on the default catalog).
+PARALLEL_MIN_WELLS = 500
+# Largest default chunk, which bounds the per-task (wells, months) temporaries.
+MAX_CHUNK_WELLS = 4096
+
+# Output layout: name -> (dtype, per-month?)
+OUTPUT_FIELDS: Dict[str, Tuple[str, bool]] = {
+    'flow_rate': ('f8', True),
+    'pip_atm': ('f8', True),
+    'void_fraction': ('f8', True),
+    'tdh_m': ('f8', True),
+    'pump_index': ('i4', True),
+    'stages': ('f8', True),
+    'motor_power_kw': ('f8', True),
+    'status': ('i1', True),
+    'month_of_pump_change': ('i4', False),
+}
+
+ArraySpec = Tuple[str, List[Tuple[str, str, Tuple[int, ...], int]]]
+
+
+class SharedArrays:
+    """A group of NumPy arrays packed into one shared memory block."""
+
+    def __init__(self, shm: shared_memory.SharedMemory,
+                 layout: List[Tuple[str, str, Tuple[int, ...], int]], owner: bool) -> None:
+        self.shm = shm
+        self.layout = layout
+        self.owner = owner
+        self.arrays: Dict[str, np.ndarray] = {
+            key: np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            for key, dtype, shape, offset in layout
+        }
+
+    @classmethod
+    def allocate(cls, fields: Mapping[str, Tuple[Any, Tuple[int, ...]]]) -> 'SharedArrays':
+        """New zero-filled block for ``{name: (dtype, shape)}``."""
+        layout, offset = [], 0
+        for key, (dtype, shape) in fields.items():
+            dtype = np.dtype(dtype)
+            layout.append((key, dtype.str, tuple(int(n) for n in shape), offset))
+            size = dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+            offset += -(-size // _ALIGNMENT) * _ALIGNMENT
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, _ALIGNMENT))
+        block = cls(shm, layout, owner=True)
+        for array in block.arrays.values():
+            array.fill(0)
+        return block
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray]) -> 'SharedArrays':
+        """New block holding copies of ``arrays``."""
+        arrays = {key: np.ascontiguousarray(value) for key, value in arrays.items()}
+        block = cls.allocate({key: (value.dtype, value.shape) for key, value in arrays.items()})
+        for key, value in arrays.items():
+            block.arrays[key][...] = value
+        return block
+
+    @classmethod
+    def attach(cls, spec: ArraySpec) -> 'SharedArrays':
+        name, layout = spec
+        return cls(shared_memory.SharedMemory(name=name), layout, owner=False)
+
+    @property
+    def spec(self) -> ArraySpec:
+        """Picklable descriptor used to attach from another process."""
+        return self.shm.name, self.layout
+
+    def close(self) -> None:
+        self.arrays = {}
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # views are still referenced; the mapping goes away with them
+        if self.owner:
+            self.shm.unlink()
+
+
+# Catalog blocks attached by this worker process, most recently used last.
+_ATTACHED: 'OrderedDict[str, SharedArrays]' = OrderedDict()
+_MAX_ATTACHED = 2
+
+
+def _attached(spec: ArraySpec) -> Dict[str, np.ndarray]:
+    name = spec[0]
+    if name in _ATTACHED:
+        _ATTACHED.move_to_end(name)
+    else:
+        _ATTACHED[name] = SharedArrays.attach(spec)
+        while len(_ATTACHED) > _MAX_ATTACHED:
+            _ATTACHED.popitem(last=False)[1].close()
+    return _ATTACHED[name].arrays
+
+
+def _forecast_into(inputs: Mapping[str, np.ndarray], catalog: Mapping[str, np.ndarray],
+                   outputs: Mapping[str, np.ndarray], start: int, stop: int,
+                   decline_type: str, period: int,
+                   surrogate: Optional[PolynomialSurrogate] = None) -> Optional[Dict[str, Any]]:
+    p = {key: inputs[key][start:stop] for key in DEFAULT_INPUTS}
+    # Validation samples are drawn per well range, so runs are repeatable.
+    result = equipment_forecast(p, decline_type, inputs['decline_rate'][start:stop],
+                                inputs['hyperbolic_n'][start:stop], period, catalog,
+                                inputs['selected_index'][start:stop], surrogate=surrogate,
+                                rng=np.random.default_rng(start))
+    for key in OUTPUT_FIELDS:
+        outputs[key][start:stop] = result[key]
+    return result.get('surrogate')
+
+
+def _forecast_slice(task) -> Optional[Dict[str, Any]]:
+    """Worker entry point: attach the blocks, fill one well range, detach."""
+    inputs_spec, catalog_spec, output_spec, start, stop, decline_type, period, surrogate = task
+    inputs = SharedArrays.attach(inputs_spec)
+    outputs = SharedArrays.attach(output_spec)
+    try:
+        return _forecast_into(inputs.arrays, _attached(catalog_spec), outputs.arrays,
+                              start, stop, decline_type, period, surrogate)
+    finally:
+        inputs.close()
+        outputs.close()
+
+
+class PortfolioResult:
+    """Forecast arrays of a field, backed by shared memory until released."""
+
+    def __init__(self, block: SharedArrays, months: np.ndarray, pump_names: np.ndarray,
+                 surrogate: Optional[Dict[str, Any]] = None) -> None:
+        self._block = block
+        self.months = months
+        self.pump_names = pump_names
+        # Merged check report of the pressure-drop surrogate, when one was used.
+        self.surrogate = surrogate
+
+    @property
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """``(wells, months)`` outputs (``month_of_pump_change`` is per well)."""
+        return self._block.arrays
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._block.arrays[key]
+
+    def pump_name(self, index: np.ndarray) -> np.ndarray:
+        """Pump names for catalog indices (``Нет подходящего`` for -1)."""
+        index = np.asarray(index)
+        safe = np.clip(index, 0, self.pump_names.size - 1)
+        return np.where(index >= 0, self.pump_names[safe], NO_PUMP_NAME)
+
+    def summary(self) -> Dict[str, Any]:
+        """Field totals per month for budget planning."""
+        change = self['month_of_pump_change']
+        return {
+            'months': self.months,
+            'field_rate': self['flow_rate'].sum(axis=0),
+            'first_changes': np.bincount(change[change >= 0], minlength=self.months.size),
+            'wells_without_pump': (self['status'] == STATUS_NO_PUMP).sum(axis=0),
+            'pump_wells': np.stack([(self['pump_index'] == i).sum(axis=0)
+                                    for i in range(self.pump_names.size)]),
+        }
+
+    def release(self) -> None:
+        """Unlink the shared memory; it is freed once no views of it remain."""
+        self._block.close()
+
+    def __enter__(self) -> 'PortfolioResult':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class PortfolioForecaster:
+    """Runs equipment forecasts for many wells on a persistent process pool.
+
+    The catalog is placed in shared memory once; the pool is started on
+    the first run and reused until :meth:`close`.
+    """
+
+    def __init__(self, catalog: Optional[List[Mapping[str, Any]]] = None,
+                 workers: Optional[int] = None) -> None:
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        arrays = catalog_arrays(catalog)
+        self.pump_names = arrays['name']
+        self._catalog_arrays = arrays
+        self._catalog = SharedArrays.from_arrays(numeric_columns(arrays))
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 1:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def run(self, inputs: InputsLike, decline_type: str = 'exponential',
+            decline_rate: Any = 0.02, hyperbolic_n: Any = 0.5, forecast_period: int = 60,
+            selected_pump: Any = None, chunk_size: Optional[int] = None,
+            surrogate: Union[None, bool, PolynomialSurrogate] = None) -> PortfolioResult:
+        """Forecast every well of ``inputs`` (a dict of per-well arrays or a list of dicts).
+
+        ``decline_rate``, ``hyperbolic_n`` and ``selected_pump`` may be
+        scalars or per-well arrays (e.g. from ``core.decline.forecast_parameters``).
+        ``surrogate`` is a fitted pressure-drop surrogate, or ``True`` to fit
+        one on the field first (:func:`core.forecast.forecast_surrogate`);
+        every well range is still checked against ``run_design``.
+        Fields below ``PARALLEL_MIN_WELLS`` run in-process; ``chunk_size``
+        (wells per task) defaults to an even split over the workers, at
+        most ``MAX_CHUNK_WELLS``. The caller releases the returned result.
+        """
+        p = {key: value.reshape(-1) for key, value in prepare_inputs(inputs).items()}
+        n_wells = p['targetFlowRate'].size
+        per_well = {
+            'decline_rate': np.broadcast_to(np.asarray(decline_rate, dtype=float), (n_wells,)),
+            'hyperbolic_n': np.broadcast_to(np.asarray(hyperbolic_n, dtype=float), (n_wells,)),
+            'selected_index': np.broadcast_to(
+                selected_pump_index(self._catalog_arrays, selected_pump), (n_wells,)),
+        }
+        months = np.arange(forecast_period + 1)
+        workers = self.workers if n_wells >= PARALLEL_MIN_WELLS else 1
+        if chunk_size is None:
+            chunk_size = max(min(-(-n_wells // max(workers, 1)), MAX_CHUNK_WELLS), 1)
+        if surrogate is True:
+            surrogate = forecast_surrogate(p, decline_type, per_well['decline_rate'],
+                                           per_well['hyperbolic_n'], forecast_period,
+                                           np.random.default_rng(0))
+        elif surrogate is False:
+            surrogate = None
+        inputs_block = SharedArrays.from_arrays({**p, **per_well})
+        output_block = SharedArrays.allocate({
+            key: (dtype, (n_wells, months.size) if monthly else (n_wells,))
+            for key, (dtype, monthly) in OUTPUT_FIELDS.items()
+        })
+        try:
+            bounds = [(start, min(start + chunk_size, n_wells))
+                      for start in range(0, n_wells, chunk_size)]
+            pool = self._executor() if workers > 1 else None
+            if pool is None or len(bounds) <= 1:
+                reports = [_forecast_into(inputs_block.arrays, self._catalog.arrays,
+                                          output_block.arrays, start, stop, decline_type,
+                                          forecast_period, surrogate)
+                           for start, stop in bounds]
+            else:
+                tasks = [(inputs_block.spec, self._catalog.spec, output_block.spec,
+                          start, stop, decline_type, forecast_period, surrogate)
+                         for start, stop in bounds]
+                reports = list(pool.map(_forecast_slice, tasks))
+        except BaseException:
+            output_block.close()
+            raise
+        finally:
+            inputs_block.close()
+        report = None if surrogate is None else merge_reports(reports, surrogate.holdout)
+        return PortfolioResult(output_block, months, self.pump_names, report)
+
+    def close(self) -> None:
+        """Shut down the pool and free the shared catalog."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._catalog is not None:
+            self._catalog.close()
+            self._catalog = None
+
+    def __enter__(self) -> 'PortfolioForecaster':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
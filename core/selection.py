@@ -0,0 +1,99 @@
+"""Pump selection: every catalog pump evaluated for every well in one pass.
+
+Port of the catalog filter of the JS ``runFullCalculation`` plus
+``calculateStaging`` for each suitable pump. Arrays carry a trailing pump
+axis, ``(wells, pumps)``; viscosity corrections come from the cached HI
+tables of ``core.viscosity`` and each pump's NPSHr at its own rate from the
+catalog curves of ``core.cavitation``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from core.cavitation import STATUS_DANGER, npsh_margin, npsh_required
+from core.catalog import CatalogArrays, catalog_arrays
+from core.engine import InputsLike, calculate_staging, prepare_inputs, run_design
+from core.viscosity import viscosity_corrections
+
+
+def evaluate_candidates(inputs: InputsLike = None,
+                        catalog: Optional[Sequence[Mapping[str, Any]]] = None,
+                        design: Optional[Dict[str, np.ndarray]] = None,
+                        viscosity_correction: bool = True,
+                        arrays: Optional[CatalogArrays] = None,
+                        cavitation_check: bool = True,
+                        separator_loss: float = 0.0) -> Dict[str, Any]:
+    """Staging of every catalog pump at each well's design point.
+
+    With ``viscosity_correction`` the HI factors multiply the user
+    ``viscCorrHead``/``viscCorrEff`` inputs and the operating range of
+    each pump shifts with ``C_Q``. NPSHr comes from each pump's curve at
+    its water-equivalent rate; with ``cavitation_check`` pumps whose margin
+    is in the "ОПАСНО" band are not suitable.
+
+    Returns:
+        Dict with ``design`` (per well), ``catalog`` arrays and
+        ``(wells, pumps)`` arrays: ``suitable``, ``stages``,
+        ``shaft_power_kw``, ``motor_power_kw``, the correction factors
+        ``visc_head``/``visc_rate``/``visc_eff``, ``npsh_required``,
+        ``npsh_margin``, ``cavitation_status`` and ``recommended`` (index
+        of the suitable pump with the lowest shaft power, -1 if none).
+    """
+    p = prepare_inputs(inputs)
+    design = run_design(p) if design is None else design
+    arrays = catalog_arrays(catalog) if arrays is None else arrays
+    q = np.asarray(design['downhole_q_m3'])[..., None]
+
+    pump_p = {key: value[..., None] for key, value in p.items()}
+    if viscosity_correction:
+        factors = viscosity_corrections(p, arrays, design['downhole_q_m3'])
+    else:
+        ones = np.ones(q.shape[:-1] + arrays['min_q_m3'].shape)
+        factors = {'c_q': ones, 'c_h': ones, 'c_eff': ones}
+    pump_p['viscCorrHead'] = pump_p['viscCorrHead'] * factors['c_h']
+    pump_p['viscCorrEff'] = pump_p['viscCorrEff'] * factors['c_eff']
+
+    pump_design = {key: np.asarray(value)[..., None] for key, value in design.items()}
+    staging = calculate_staging(pump_design, pump_p, arrays)
+    suitable = (q >= arrays['min_q_m3'] * factors['c_q']) & (q <= arrays['max_q_m3'] * factors['c_q'])
+
+    required = npsh_required(arrays, q / factors['c_q'])
+    cavitation = npsh_margin(pump_design['pip_atm'], pump_design['temp_bottom_c'],
+                             pump_p['bubblePointPressure'], separator_loss, required)
+    if cavitation_check:
+        suitable &= cavitation['status'] != STATUS_DANGER
+
+    shaft = np.where(suitable, staging['shaft_power_kw'], np.inf)
+    best = np.argmin(shaft, axis=-1)
+    return {
+        'design': design,
+        'catalog': arrays,
+        'suitable': suitable,
+        'stages': staging['stages'],
+        'shaft_power_kw': staging['shaft_power_kw'],
+        'motor_power_kw': staging['motor_power_kw'],
+        'visc_head': factors['c_h'],
+        'visc_rate': factors['c_q'],
+        'visc_eff': factors['c_eff'],
+        'npsh_required': required,
+        'npsh_margin': cavitation['cavitation_margin'],
+        'cavitation_status': cavitation['status'],
+        'recommended': np.where(suitable.any(axis=-1), best, -1),
+    }
+
+
+def suitable_pumps(candidates: Mapping[str, Any], well: Any = ()) -> list:
+    """Suitable pumps of one well as catalog rows with staging, in catalog order."""
+    arrays = candidates['catalog']
+    rows = []
+    for i in np.flatnonzero(candidates['suitable'][well]):
+        row = {key: (value[i].tolist() if hasattr(value[i], 'tolist') else value[i])
+               for key, value in arrays.items()}
+        for key in ('stages', 'shaft_power_kw', 'motor_power_kw', 'visc_head', 'visc_eff',
+                    'npsh_required', 'npsh_margin'):
+            row[key] = float(candidates[key][well][i])
+        rows.append(row)
+    return rows
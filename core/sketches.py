@@ -0,0 +1,208 @@
+"""Mergeable streaming summaries for large batch and probabilistic runs.
+
+Each summary is updated chunk by chunk with NumPy arrays and can be merged
+with a summary built on another worker, so percentiles over millions of
+realizations are reported in bounded memory:
+
+* ``RunningStats``  - count, min, max, mean and variance (Chan et al.);
+* ``Histogram``     - fixed-edge counts with under/overflow bins;
+* ``QuantileSketch`` - KLL-style compactor hierarchy with rank error of
+  roughly ``log2(n / k) / k``.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class RunningStats:
+    """Count, min, max, mean and variance of a stream."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float).reshape(-1)
+        if not values.size:
+            return
+        other = RunningStats()
+        other.count = values.size
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        self.merge(other)
+
+    def merge(self, other: 'RunningStats') -> None:
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else float('nan')
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+
+class Histogram:
+    """Counts over fixed bin edges plus underflow and overflow."""
+
+    def __init__(self, low: float, high: float, bins: int = 100) -> None:
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float).reshape(-1)
+        self.counts += np.histogram(values, self.edges)[0]
+        self.underflow += int((values < self.edges[0]).sum())
+        self.overflow += int((values > self.edges[-1]).sum())
+
+    def merge(self, other: 'Histogram') -> None:
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different edges")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch (KLL-style compactors).
+
+    Level ``h`` holds items of weight ``2**h``. When a level exceeds ``k``
+    items it is sorted and every other item, from a random offset, is
+    promoted to the next level, so the total weight stays exact.
+    """
+
+    def __init__(self, k: int = 2048, seed=None) -> None:
+        self.k = k
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    @property
+    def count(self) -> int:
+        return int(sum(level.size << h for h, level in enumerate(self.levels)))
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float).reshape(-1)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self._compress()
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if level.size > self.k:
+                level = np.sort(level)
+                even = level.size - (level.size % 2)
+                offset = int(self.rng.integers(2))
+                promoted = level[offset:even:2]
+                self.levels[h] = level[even:]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def quantile(self, q: Sequence[float]) -> np.ndarray:
+        """Approximate quantiles for fractions ``q`` in [0, 1]."""
+        items = np.concatenate(self.levels)
+        if not items.size:
+            return np.full(np.shape(q), np.nan)
+        weights = np.concatenate([np.full(level.size, 1 << h, dtype=np.int64)
+                                  for h, level in enumerate(self.levels)])
+        order = np.argsort(items)
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        target = np.asarray(q, dtype=float) * cumulative[-1]
+        idx = np.clip(np.searchsorted(cumulative, target, side='left'), 0, items.size - 1)
+        return items[idx]
+
+
+class StreamingSummary:
+    """Per-metric stats, quantile sketch and optional histogram."""
+
+    def __init__(self, histogram_ranges: Optional[Mapping[str, Tuple[float, float]]] = None,
+                 bins: int = 100, k: int = 2048, seed=None) -> None:
+        self.histogram_ranges = dict(histogram_ranges or {})
+        self.bins = bins
+        self.k = k
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self._seeds = seed
+        self.stats: Dict[str, RunningStats] = {}
+        self.sketches: Dict[str, QuantileSketch] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.failed: Dict[str, int] = {}
+
+    def _ensure(self, key: str) -> None:
+        if key in self.stats:
+            return
+        self.stats[key] = RunningStats()
+        self.sketches[key] = QuantileSketch(self.k, self._seeds.spawn(1)[0])
+        self.failed[key] = 0
+        if key in self.histogram_ranges:
+            low, high = self.histogram_ranges[key]
+            self.histograms[key] = Histogram(low, high, self.bins)
+
+    def update(self, samples: Mapping[str, np.ndarray]) -> None:
+        """Add one chunk of per-realization metric arrays; NaNs count as failed."""
+        for key, values in samples.items():
+            self._ensure(key)
+            values = np.asarray(values, dtype=float).reshape(-1)
+            finite = values[np.isfinite(values)]
+            self.failed[key] += values.size - finite.size
+            self.stats[key].update(finite)
+            self.sketches[key].update(finite)
+            if key in self.histograms:
+                self.histograms[key].update(finite)
+
+    def merge(self, other: 'StreamingSummary') -> None:
+        for key in other.stats:
+            self._ensure(key)
+            self.stats[key].merge(other.stats[key])
+            self.sketches[key].merge(other.sketches[key])
+            self.failed[key] += other.failed[key]
+            if key in other.histograms:
+                self.histograms[key].merge(other.histograms[key])
+
+    def summary(self, percentiles: Sequence[float] = (10, 50, 90)) -> Dict[str, Dict[str, float]]:
+        """Same layout as ``core.montecarlo.summarize`` plus min and max."""
+        result = {}
+        for key, stats in self.stats.items():
+            fractions = np.r_[np.asarray(percentiles, dtype=float), 25.0, 75.0] / 100.0
+            *values, q25, q75 = self.sketches[key].quantile(fractions)
+            row = {f"P{int(q)}": float(v) for q, v in zip(percentiles, values)}
+            total = stats.count + self.failed[key]
+            row.update(
+                mean=float(stats.mean) if stats.count else float('nan'),
+                std=stats.std,
+                iqr=float(q75 - q25),
+                min=float(stats.min) if stats.count else float('nan'),
+                max=float(stats.max) if stats.count else float('nan'),
+                failed_fraction=self.failed[key] / total if total else 0.0,
+            )
+            result[key] = row
+        return result
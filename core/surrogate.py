@@ -0,0 +1,368 @@
+"""Polynomial surrogate of the design pressure drop for batch runs.
+
+``run_design`` evaluates the Beggs-Brill correlation twice per row (once
+in ``calculate_pip`` and once for the reported drop), with its friction
+factor. For the same inputs the surrogate predicts that pressure drop
+directly, so batch, forecast and Monte Carlo runs get the ``run_design``
+result faster; a surrogate that passes its checks only changes the speed,
+not the answer beyond the threshold.
+
+It is a polynomial-chaos style regressor over the variables the
+correlation itself sees: the no-slip liquid holdup and mixture velocity at
+the intake, plus the correlation inputs (pump depth, tubing, fluid
+properties) that vary across the training batch. Well inputs such as the
+reservoir pressure or the water cut act only through the intake rates, so
+they are not features and need no training range of their own. Features
+are scaled to ``[-1, 1]`` and expanded in products of Legendre polynomials
+up to a total degree; the coefficients come from least-squares fits to
+``run_design`` pressure drops, one per holdup case of the correlation (see
+``core.engine.liquid_holdup``) with and without free gas, since the drop
+jumps between cases.
+
+``design`` builds the ``run_design`` result around the predicted drop. The
+intake pressure needs no model: ``calculate_pip`` converges to the IPR
+flowing pressure, which is evaluated in closed form, and the void fraction,
+flow pattern, holdup and mixture density follow from it exactly. Every call
+checks the surrogate against ``run_design`` on a random sample of its rows
+and falls back to ``run_design`` for the whole batch when the largest error
+exceeds the threshold. Rows outside the training range of their case (or
+with fixed correlation inputs that differ) and rates within
+``NEAR_AOF_RATIO`` of the open flow, where the drawdown makes the drop
+steep, always go to ``run_design``; they are not fitted either.
+"""
+
+from __future__ import annotations
+
+import math
+from itertools import combinations_with_replacement
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.engine import (G, HOLDUP_CASES, PA_PER_ATM, InputArrays, InputsLike, batch_size,
+                         intake_temperature, liquid_holdup, prepare_inputs, run_design, take_inputs,
+                         void_fraction_and_rate)
+from core.ipr import build_ipr
+
+SURROGATE_DEGREE = 3
+# Largest pressure-drop error on the validation sample before falling back, atm.
+SURROGATE_THRESHOLD_ATM = 2.0
+VALIDATION_SIZE = 64
+HOLDOUT_FRACTION = 0.2
+# Rows a surrogate is fitted on when a batch mode fits its own.
+PILOT_SIZE = 2000
+# Rates at or above this share of the open flow are left to ``run_design``.
+NEAR_AOF_RATIO = 0.9
+# Features from the intake flow state, then the correlation inputs that vary.
+FLOW_FEATURES = ('no_slip_holdup', 'mixture_velocity')
+CORRELATION_INPUTS = ('pumpDepth', 'tubingId', 'liquidDensity', 'gasSpecificGravity', 'viscosity')
+# One fit per holdup case (and the "no case" code), without and with free gas.
+REGIMES = 2 * (HOLDUP_CASES + 1)
+
+
+def _intake(p: InputArrays) -> Dict[str, Any]:
+    """IPR, intake pressure and temperature, free gas and tubing flow state of ``run_design``."""
+    q = p['targetFlowRate']
+    ipr = build_ipr(p)
+    pip = ipr.pwf(q)
+    temp = intake_temperature(p, q)
+    void = void_fraction_and_rate(pip, temp, q, p)
+    flow = liquid_holdup(void['total_rate'], void['gas_rate'], p)
+    regime = 2 * flow['holdup_case'] + (void['gas_rate'] > 0)
+    return {'ipr': ipr, 'pip': pip, 'temp': temp, 'void': void, 'flow': flow,
+            'regime': regime.reshape(-1), 'values': {**p, **flow}}
+
+
+def _assemble(p: InputArrays, intake: Mapping[str, Any],
+              pressure_drop: np.ndarray) -> Dict[str, np.ndarray]:
+    """``run_design`` result from the intake state and the tubing pressure drop (atm)."""
+    q, void, flow = p['targetFlowRate'], intake['void'], intake['flow']
+    return {
+        'flow_rate': q.copy(),
+        'pip_atm': intake['pip'],
+        'temp_bottom_c': intake['temp'],
+        'void_fraction': void['void_fraction'],
+        'downhole_q_m3': void['total_rate'],
+        'gas_rate_m3': void['gas_rate'],
+        'tdh_m': np.maximum(0.0, pressure_drop) * PA_PER_ATM / (p['liquidDensity'] * G),
+        'pressure_drop': pressure_drop,
+        'inflow_feasible': q < intake['ipr'].aof,
+        'flow_pattern': flow['flow_pattern'],
+        'liquid_holdup': flow['liquid_holdup'],
+        'mixture_density': flow['mixture_density'],
+    }
+
+
+def merge_reports(reports: Sequence[Mapping[str, Any]],
+                  holdout: Optional[Mapping[str, float]] = None) -> Dict[str, Any]:
+    """Totals of the per-batch reports of :meth:`PolynomialSurrogate.design`."""
+    return {
+        'batches': len(reports),
+        'fallback_batches': sum(report['fallback'] for report in reports),
+        'fallback': any(report['fallback'] for report in reports),
+        'validated': sum(report['validated'] for report in reports),
+        'max_error': max((report['max_error'] for report in reports), default=0.0),
+        'engine_rows': sum(report['engine_rows'] for report in reports),
+        'holdout': dict(holdout or {}),
+    }
+
+
+def _legendre(x: np.ndarray, degree: int) -> np.ndarray:
+    """Legendre polynomials ``P_0..P_degree`` of ``x`` (``P_0`` as the scalar 1)."""
+    values: List[Any] = [1.0, x]
+    for n in range(1, degree):
+        values.append(((2 * n + 1) * x * values[n] - n * values[n - 1]) / (n + 1))
+    return values[:degree + 1]
+
+
+class PolynomialSurrogate:
+    """Total-degree Legendre expansions of the pressure drop over the flow features.
+
+    ``coefficients`` has one row per regime (``2 * holdup_case + gas``) and
+    ``lower``/``upper`` the training range of every feature in each regime;
+    regimes without a fit have NaN rows. Features are scaled over the range
+    of all regimes together.
+    """
+
+    def __init__(self, features: Tuple[str, ...], lower: np.ndarray, upper: np.ndarray,
+                 fixed: Mapping[str, float], degree: int, terms: np.ndarray,
+                 coefficients: np.ndarray, holdout: Mapping[str, float]) -> None:
+        self.features = tuple(features)
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        self.fixed = dict(fixed)
+        self.degree = degree
+        # terms[t]: feature index of each factor of term t (len(features) is the constant).
+        self.terms = np.asarray(terms, dtype=np.intp)
+        self.coefficients = np.asarray(coefficients, dtype=float)
+        self.holdout = dict(holdout)
+        with np.errstate(invalid='ignore'):
+            self._low = np.nanmin(self.lower, axis=0)[:, None]
+            self._span = np.nanmax(self.upper, axis=0)[:, None] - self._low
+        self._span[~(self._span > 0)] = 1.0
+        self._fixed_keys = list(self.fixed)
+        self._fixed_values = np.array([self.fixed[key] for key in self._fixed_keys])
+        # A feature repeated k times in a term contributes P_k once.
+        counts = np.zeros((self.terms.shape[0], len(self.features) + 1), dtype=np.intp)
+        np.add.at(counts, (np.arange(self.terms.shape[0])[:, None], self.terms), 1)
+        factors = [tuple((int(f), int(counts[t, f])) for f in np.flatnonzero(counts[t, :-1]))
+                   for t in range(self.terms.shape[0])]
+        # Each term is the term of its leading factors times one Legendre
+        # polynomial, so basis rows are built shortest first: (term, prefix, f, k).
+        index = {key: t for t, key in enumerate(factors)}
+        self._constant = index[()]
+        self._steps = [(t, index.get(factors[t][:-1], -1), *factors[t][-1])
+                       for t in sorted(range(len(factors)), key=lambda t: len(factors[t]))
+                       if factors[t]]
+
+    @staticmethod
+    def basis_terms(features: int, degree: int) -> np.ndarray:
+        """Feature index of each factor of each term, ``(terms, degree)``.
+
+        Index ``features`` stands for the constant 1, so every term has
+        exactly ``degree`` factors.
+        """
+        return np.array(list(combinations_with_replacement(range(features + 1), degree)),
+                        dtype=np.intp)
+
+    def _scaled(self, values: Mapping[str, np.ndarray],
+                regime: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Scaled features ``(features, rows)`` and the in-domain mask of the rows."""
+        x = np.stack([np.asarray(values[name], dtype=float).reshape(-1) for name in self.features])
+        inside = np.all((x >= self.lower[regime].T) & (x <= self.upper[regime].T), axis=0)
+        for key, fixed in zip(self._fixed_keys, self._fixed_values.tolist()):
+            column = np.asarray(values[key], dtype=float)
+            if not column.size:
+                continue
+            # Fixed inputs are usually constant over the batch (broadcast
+            # scalars have zero strides); compare per row only if not.
+            bounds = (column.flat[0],) if not any(column.strides) else (column.min(), column.max())
+            if all(math.isclose(bound, fixed, rel_tol=1e-9, abs_tol=1e-12) for bound in bounds):
+                continue
+            inside &= np.isclose(column.reshape(-1), fixed, rtol=1e-9, atol=1e-12)
+        return 2.0 * (x - self._low) / self._span - 1.0, inside
+
+    def features_matrix(self, scaled: np.ndarray) -> np.ndarray:
+        """Basis values ``(terms, rows)`` for scaled inputs ``(features, rows)``."""
+        legendre = _legendre(scaled, self.degree)
+        matrix = np.empty((self.terms.shape[0], scaled.shape[1]))
+        matrix[self._constant] = 1.0
+        for t, prefix, f, power in self._steps:
+            if prefix < 0:
+                matrix[t] = legendre[power][f]
+            else:
+                np.multiply(matrix[prefix], legendre[power][f], out=matrix[t])
+        return matrix
+
+    def _evaluate(self, scaled: np.ndarray, regime: np.ndarray, block: int = 8192) -> np.ndarray:
+        """Expansion at scaled inputs, in row blocks so the basis stays small."""
+        parts = []
+        for start in range(0, scaled.shape[1], block):
+            matrix = self.features_matrix(scaled[:, start:start + block])
+            coefficients = self.coefficients[regime[start:start + block]]
+            parts.append(np.einsum('tr,rt->r', matrix, coefficients))
+        return np.concatenate(parts) if parts else np.zeros(0)
+
+    def _state(self, p: InputArrays) -> Dict[str, Any]:
+        """Intake state, clipped scaled features, regime and domain of every row."""
+        state = _intake(p)
+        scaled, inside = self._scaled(state['values'], state['regime'])
+        state['scaled'] = np.clip(scaled, -1.0, 1.0, out=scaled)
+        # Regimes without a fit fail the range check (NaN bounds); rates
+        # near the open flow go to ``run_design`` as well.
+        near_aof = p['targetFlowRate'] >= NEAR_AOF_RATIO * state['ipr'].aof
+        state['inside'] = inside & ~near_aof.reshape(-1)
+        return state
+
+    def predict(self, inputs: InputsLike = None) -> Dict[str, np.ndarray]:
+        """Predicted ``pressure_drop`` (atm) and ``in_domain`` mask, in the batch shape.
+
+        Rows outside the domain get an extrapolated (or NaN) drop.
+        """
+        p = prepare_inputs(inputs)
+        shape = p['targetFlowRate'].shape
+        state = self._state(p)
+        prediction = self._evaluate(state['scaled'], state['regime'])
+        return {'pressure_drop': prediction.reshape(shape), 'in_domain': state['inside'].reshape(shape)}
+
+    def design(self, inputs: InputsLike = None, rng: Optional[np.random.Generator] = None,
+               threshold: float = SURROGATE_THRESHOLD_ATM,
+               validation_size: int = VALIDATION_SIZE,
+               flow_rate: Optional[np.ndarray] = None) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """``run_design`` with the surrogate pressure drop, and a check report.
+
+        ``flow_rate`` overrides ``targetFlowRate`` as in ``run_design``.
+
+        Returns:
+            The ``run_design`` dict and a report with ``validated``
+            (sample size), ``max_error`` (atm), ``fallback`` (the whole batch
+            came from ``run_design``, also when the holdout error of the fit
+            exceeds the threshold) and ``engine_rows``.
+        """
+        p = prepare_inputs(inputs)
+        if flow_rate is not None:
+            p = prepare_inputs(dict(p, targetFlowRate=flow_rate))
+        if self.holdout.get('max_error', 0.0) > threshold:
+            # The fit itself missed its holdout rows; no sample can vouch for it.
+            report = {'validated': 0, 'max_error': self.holdout['max_error'], 'fallback': True,
+                      'engine_rows': batch_size(p)}
+            return run_design(p), report
+        rng = np.random.default_rng() if rng is None else rng
+        shape = p['targetFlowRate'].shape
+        state = self._state(p)
+        inside, scaled, regime = state['inside'], state['scaled'], state['regime']
+        candidates = np.flatnonzero(inside)
+        sample = rng.choice(candidates, size=min(validation_size, candidates.size), replace=False)
+        outside = np.flatnonzero(~inside)
+        # The sample and the rows outside the domain go through ``run_design``
+        # together, before the whole batch is predicted, so a fallback costs
+        # little more than ``run_design`` alone.
+        flat = {key: value.reshape(-1) for key, value in p.items()}
+        exact = run_design(take_inputs(flat, np.concatenate([sample, outside])))['pressure_drop']
+        max_error = 0.0
+        if sample.size:
+            predicted = self._evaluate(scaled[:, sample], regime[sample])
+            max_error = float(np.max(np.abs(predicted - exact[:sample.size])))
+        fallback = bool(max_error > threshold or not candidates.size)
+        report = {'validated': int(sample.size), 'max_error': max_error, 'fallback': fallback,
+                  'engine_rows': int(inside.size if fallback else outside.size)}
+        if fallback:
+            return run_design(p), report
+
+        pressure_drop = self._evaluate(scaled, regime)
+        pressure_drop[outside] = exact[sample.size:]
+        return _assemble(p, state, pressure_drop.reshape(shape)), report
+
+    def save(self, path) -> None:
+        np.savez_compressed(
+            path, features=np.array(self.features), lower=self.lower, upper=self.upper,
+            fixed_keys=np.array(self._fixed_keys), fixed_values=self._fixed_values,
+            degree=self.degree, terms=self.terms, coefficients=self.coefficients,
+            holdout_keys=np.array(list(self.holdout)),
+            holdout_values=np.array(list(self.holdout.values()), dtype=float),
+        )
+
+    @classmethod
+    def load(cls, path) -> 'PolynomialSurrogate':
+        with np.load(path) as data:
+            return cls(
+                features=tuple(str(name) for name in data['features']),
+                lower=data['lower'], upper=data['upper'],
+                fixed=dict(zip((str(key) for key in data['fixed_keys']), data['fixed_values'].tolist())),
+                degree=int(data['degree']), terms=data['terms'], coefficients=data['coefficients'],
+                holdout=dict(zip((str(key) for key in data['holdout_keys']),
+                                 data['holdout_values'].tolist())),
+            )
+
+
+def fit_surrogate(inputs: InputsLike, degree: int = SURROGATE_DEGREE,
+                  rng: Optional[np.random.Generator] = None,
+                  holdout_fraction: float = HOLDOUT_FRACTION) -> PolynomialSurrogate:
+    """Fit the ``run_design`` pressure drop of a training batch (e.g. Monte Carlo realizations).
+
+    The features are the intake no-slip holdup and mixture velocity plus the
+    correlation inputs that vary across the batch; the other correlation
+    inputs are fixed. Each regime (holdup case, with or without free gas) is
+    fitted separately over its own range, and a regime with too few rows is
+    left to ``run_design`` (NaN coefficients). A random ``holdout_fraction``
+    of the rows is kept out of the fit to report ``max_error`` and ``rmse``
+    (atm). Rates at or above ``NEAR_AOF_RATIO`` of the open flow are not used.
+    """
+    p = prepare_inputs(inputs)
+    flat = {key: value.reshape(-1) for key, value in p.items()}
+    flat = take_inputs(flat, flat['targetFlowRate'] < NEAR_AOF_RATIO * build_ipr(flat).aof)
+    if not flat['targetFlowRate'].size:
+        raise ValueError("No training rows: every rate is at or near the open flow")
+    target = run_design(flat)['pressure_drop']
+    state = _intake(flat)
+
+    varying = tuple(key for key in CORRELATION_INPUTS if np.ptp(flat[key]) > 0)
+    features = FLOW_FEATURES + varying
+    fixed = {key: float(flat[key][0]) for key in CORRELATION_INPUTS if key not in varying}
+    x = np.stack([state['values'][name] for name in features])
+    terms = PolynomialSurrogate.basis_terms(len(features), degree)
+    lower = np.full((REGIMES, len(features)), np.nan)
+    upper = np.full((REGIMES, len(features)), np.nan)
+
+    rng = np.random.default_rng() if rng is None else rng
+    splits = {}
+    for regime in range(REGIMES):
+        rows = rng.permutation(np.flatnonzero(state['regime'] == regime))
+        if rows.size <= terms.shape[0]:
+            continue
+        split = int(rows.size * holdout_fraction)
+        holdout, train = rows[:split], rows[split:]
+        if train.size <= terms.shape[0]:
+            train, holdout = rows, rows[:0]
+        splits[regime] = train, holdout
+        lower[regime], upper[regime] = x[:, rows].min(axis=1), x[:, rows].max(axis=1)
+    if not splits:
+        raise ValueError(f"Need more than {terms.shape[0]} training rows in one flow regime, "
+                         f"got {target.size} in all")
+
+    coefficients = np.full((REGIMES, terms.shape[0]), np.nan)
+    surrogate = PolynomialSurrogate(features, lower, upper, fixed, degree, terms, coefficients, {})
+    scaled, _ = surrogate._scaled(state['values'], state['regime'])
+    matrix = surrogate.features_matrix(scaled).T
+    errors = []
+    for regime, (train, holdout) in splits.items():
+        coefficients[regime] = np.linalg.lstsq(matrix[train], target[train], rcond=None)[0]
+        errors.append(matrix[holdout] @ coefficients[regime] - target[holdout])
+    error = np.concatenate(errors)
+    if error.size:
+        surrogate.holdout = {'max_error': float(np.abs(error).max()),
+                             'rmse': float(np.sqrt(np.mean(error ** 2)))}
+    return surrogate
+
+
+def pilot_surrogate(inputs: InputsLike, rng: Optional[np.random.Generator] = None,
+                    degree: int = SURROGATE_DEGREE) -> Optional[PolynomialSurrogate]:
+    """Surrogate fitted on a pilot batch, or ``None`` when it has too few feasible rows.
+
+    Used by the batch modes that fit their own surrogate, where the run
+    then simply goes through ``run_design``.
+    """
+    try:
+        return fit_surrogate(inputs, degree=degree, rng=rng)
+    except ValueError:
+        return None
@@ -0,0 +1,124 @@
+"""Directional survey: TVD and inclination along measured depth.
+
+Stations ``(MD, inclination, azimuth)`` are joined by circular arcs
+(minimum curvature). Station positions and unit tangents are computed once
+when the survey is built; any measured depth is then located with one
+``searchsorted`` over the station depths and placed exactly on its arc, so
+lookups cost O(log n) per point and vectorize over arrays of depths.
+
+Depths below the last station continue straight along its tangent. A
+survey describes one well and broadcasts over any batch of that well
+(rates, grid points, months).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+def _tangent(inclination: np.ndarray, azimuth: np.ndarray) -> np.ndarray:
+    """Unit tangents ``(..., 3)`` in (north, east, down) coordinates."""
+    return np.stack([np.sin(inclination) * np.cos(azimuth),
+                     np.sin(inclination) * np.sin(azimuth),
+                     np.cos(inclination)], axis=-1)
+
+
+def _ratio_factor(dogleg: np.ndarray) -> np.ndarray:
+    """Minimum-curvature ratio factor ``tan(β/2) / (β/2)`` (1 for a straight course)."""
+    half = 0.5 * np.asarray(dogleg, dtype=float)
+    safe = np.where(half > 1e-9, half, 1.0)
+    return np.where(half > 1e-9, np.tan(safe) / safe, 1.0 + half ** 2 / 3.0)
+
+
+class Survey:
+    """Minimum-curvature well path with indexed measured-depth lookups."""
+
+    def __init__(self, md: np.ndarray, inclination_deg: np.ndarray,
+                 azimuth_deg: np.ndarray = 0.0) -> None:
+        md, inc, azi = np.broadcast_arrays(np.asarray(md, dtype=float),
+                                           np.asarray(inclination_deg, dtype=float),
+                                           np.asarray(azimuth_deg, dtype=float))
+        if md.ndim != 1 or md.size == 0:
+            raise ValueError("Survey stations must be a non-empty 1-D sequence")
+        if np.any(np.diff(md) <= 0) or md[0] < 0:
+            raise ValueError("Survey measured depths must be non-negative and increasing")
+        if md[0] > 0:
+            # Straight course from the surface to the first station.
+            md, inc, azi = np.r_[0.0, md], np.r_[inc[0], inc], np.r_[azi[0], azi]
+        self.md = md
+        self.inclination = np.radians(inc)
+        self.azimuth = np.radians(azi)
+        self.tangent = _tangent(self.inclination, self.azimuth)
+
+        cos_dogleg = np.einsum('ij,ij->i', self.tangent[:-1], self.tangent[1:])
+        self.dogleg = np.arccos(np.clip(cos_dogleg, -1.0, 1.0))
+        step = (0.5 * np.diff(md) * _ratio_factor(self.dogleg))[:, None] * (
+            self.tangent[:-1] + self.tangent[1:])
+        self.position = np.vstack([np.zeros((1, 3)), np.cumsum(step, axis=0)])
+
+    @property
+    def tvd(self) -> np.ndarray:
+        """True vertical depth of the stations, m."""
+        return self.position[:, 2]
+
+    def locate(self, md: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Position ``(..., 3)`` and unit tangent ``(..., 3)`` at measured depths."""
+        md = np.asarray(md, dtype=float)
+        last = self.md.size - 1
+        i = np.clip(np.searchsorted(self.md, md, side='right') - 1, 0, max(last - 1, 0))
+        s = md - self.md[i]
+        if last == 0:
+            tangent = np.broadcast_to(self.tangent[0], md.shape + (3,))
+            return self.position[0] + s[..., None] * tangent, tangent
+
+        length = self.md[i + 1] - self.md[i]
+        within = np.clip(s, 0.0, length)
+        beyond = s - within
+        dogleg = self.dogleg[i]
+        partial = dogleg * within / length
+        t1, t2 = self.tangent[i], self.tangent[i + 1]
+        # Spherical interpolation of the tangent along the arc.
+        sin_dogleg = np.sin(dogleg)
+        curved = sin_dogleg > 1e-9
+        safe = np.where(curved, sin_dogleg, 1.0)
+        w1 = np.where(curved, np.sin(dogleg - partial) / safe, 1.0 - within / length)
+        w2 = np.where(curved, np.sin(partial) / safe, within / length)
+        tangent = w1[..., None] * t1 + w2[..., None] * t2
+        tangent /= np.linalg.norm(tangent, axis=-1, keepdims=True)
+        position = (self.position[i]
+                    + (0.5 * within * _ratio_factor(partial))[..., None] * (t1 + tangent)
+                    + beyond[..., None] * tangent)
+        return position, tangent
+
+    def tvd_at(self, md: np.ndarray) -> np.ndarray:
+        """True vertical depth at measured depths, m."""
+        return self.locate(md)[0][..., 2]
+
+    def inclination_at(self, md: np.ndarray) -> np.ndarray:
+        """Inclination from vertical at measured depths, degrees."""
+        return np.degrees(np.arccos(np.clip(self.locate(md)[1][..., 2], -1.0, 1.0)))
+
+    def segment_geometry(self, md_bottom: np.ndarray, segments: int) -> Dict[str, np.ndarray]:
+        """Equal-MD segments from the surface to ``md_bottom``.
+
+        Returns:
+            Dict with boundary arrays ``md``, ``tvd`` and
+            ``inclination_deg`` of shape ``(..., segments + 1)`` and
+            per-segment ``length`` (MD), ``height`` (TVD) and ``tvd_mid``
+            of shape ``(..., segments)``.
+        """
+        md_bottom = np.asarray(md_bottom, dtype=float)
+        fractions = np.arange(2 * segments + 1) / (2.0 * segments)
+        points = md_bottom[..., None] * fractions
+        position, tangent = self.locate(points)
+        tvd = position[..., 2]
+        return {
+            'md': points[..., ::2],
+            'tvd': tvd[..., ::2],
+            'inclination_deg': np.degrees(np.arccos(np.clip(tangent[..., ::2, 2], -1.0, 1.0))),
+            'length': np.diff(points[..., ::2], axis=-1),
+            'height': np.diff(tvd[..., ::2], axis=-1),
+            'tvd_mid': tvd[..., 1::2],
+        }
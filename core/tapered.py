@@ -0,0 +1,142 @@
+"""Tapered (multi-section) pump string design by dynamic programming.
+
+The pressure rise from PIP to the discharge pressure is cut into a grid of
+pressure steps. At each step the free gas is re-evaluated at the local
+pressure (gas compresses and goes back into solution as the pressure
+rises), which gives the local in-situ rate and void fraction. For every
+catalog pump the stages and shaft power needed to climb one step follow
+from its head and efficiency degraded at that void fraction.
+
+A section is a run of consecutive steps on one pump type. The cheapest
+string of up to ``max_sections`` sections is a shortest path over
+``(step, sections used, current pump)``, solved step by step for all pumps
+at once with back-pointers for the reconstruction.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from core.catalog import catalog_arrays
+from core.engine import (G, PA_PER_ATM, SECONDS_PER_DAY, InputsLike, batch_size, prepare_inputs,
+                         run_design, void_fraction_and_rate)
+from core.gas import gas_factors
+
+
+def _step_costs(p: Mapping[str, np.ndarray], arrays: Mapping[str, np.ndarray],
+                pressure: np.ndarray, temp_c: np.ndarray) -> Dict[str, np.ndarray]:
+    """Stages and shaft power of every pump for every pressure step, ``(pumps, steps)``."""
+    mid = 0.5 * (pressure[:-1] + pressure[1:])
+    void = void_fraction_and_rate(mid, temp_c, p['targetFlowRate'], p)
+    head_f, eff_f = gas_factors(arrays['gas_tolerance_code'][:, None], void['void_fraction'][None, :])
+    rho_g = p['liquidDensity'] * G
+    step_pa = np.diff(pressure) * PA_PER_ATM
+    stage_pa = arrays['head_per_stage_m'][:, None] * p['viscCorrHead'] * head_f * rho_g
+    efficiency = arrays['base_eff'][:, None] * p['viscCorrEff'] * eff_f
+    rate = void['total_rate']
+    power_kw = rate / SECONDS_PER_DAY * step_pa / efficiency / 1000.0
+    in_range = (rate >= arrays['min_q_m3'][:, None]) & (rate <= arrays['max_q_m3'][:, None])
+    return {
+        'pressure': mid,
+        'rate': rate,
+        'void_fraction': void['void_fraction'],
+        'stages': step_pa / stage_pa,
+        'power_kw': np.where(in_range, power_kw, np.inf),
+    }
+
+
+def design_tapered(inputs: InputsLike = None,
+                   catalog: Optional[Sequence[Mapping[str, Any]]] = None,
+                   max_sections: int = 3, steps: int = 200,
+                   switch_penalty_kw: float = 0.0) -> Dict[str, Any]:
+    """Tapered string with the lowest shaft power for one well.
+
+    Args:
+        inputs: Inputs of a single well.
+        catalog: Pump catalog rows (defaults to ``BORETS_CATALOG``).
+        max_sections: Largest number of sections (1 gives the best single
+            pump type with gas tracked along the string).
+        steps: Number of pressure steps between PIP and discharge.
+        switch_penalty_kw: Power added per extra section, to keep gains too
+            small to justify another section from splitting the string.
+
+    Returns:
+        Dict with ``sections`` (bottom to top: ``pump``, ``pump_index``,
+        ``stages``, inlet/outlet pressure, void fraction and rate, and
+        ``power_kw``), ``total_stages``, ``total_power_kw`` and the step
+        ``profile`` (``pressure``, ``void_fraction``, ``rate``,
+        ``pump_index``). ``sections`` is empty when no pump sequence can
+        cover the whole rise.
+    """
+    p = prepare_inputs(inputs)
+    if batch_size(p) != 1:
+        raise ValueError("design_tapered expects the inputs of a single well")
+    p = {key: value.reshape(()) for key, value in p.items()}
+    arrays = catalog_arrays(catalog)
+    design = run_design(p)
+    pip = float(design['pip_atm'])
+    discharge = pip + float(design['tdh_m']) * p['liquidDensity'] * G / PA_PER_ATM
+    pressure = np.linspace(pip, discharge, steps + 1)
+    costs = _step_costs(p, arrays, pressure, design['temp_bottom_c'])
+    power = costs['power_kw']
+    pumps = power.shape[0]
+
+    # cost[j, k]: lowest power to the current step with j + 1 sections, ending on pump k.
+    cost = np.full((max_sections, pumps), np.inf)
+    cost[0] = power[:, 0]
+    came_from = np.full((steps, max_sections, pumps), -1, dtype=np.int32)
+    rows = np.arange(pumps)
+    for i in range(1, steps):
+        stay = cost
+        if max_sections > 1 and pumps > 1:
+            # Best and second-best pump of each layer, to switch to any other pump.
+            order = np.argsort(cost[:-1], axis=1)[:, :2]
+            best = np.take_along_axis(cost[:-1], order, axis=1)
+            use_second = order[:, :1] == rows[None, :]
+            from_pump = np.where(use_second, order[:, 1:2], order[:, :1])
+            switch = np.where(use_second, best[:, 1:2], best[:, :1])
+            switch = np.vstack([np.full((1, pumps), np.inf), switch + switch_penalty_kw])
+            from_pump = np.vstack([np.full((1, pumps), -1), from_pump])
+        else:
+            switch = np.full_like(cost, np.inf)
+            from_pump = np.full(cost.shape, -1)
+        take_switch = switch < stay
+        came_from[i] = np.where(take_switch, from_pump, -1)
+        cost = np.where(take_switch, switch, stay) + power[:, i]
+
+    result: Dict[str, Any] = {'sections': [], 'total_stages': 0.0, 'total_power_kw': np.inf,
+                              'profile': {key: costs[key] for key in ('pressure', 'void_fraction', 'rate')}}
+    if not np.isfinite(cost).any():
+        result['profile']['pump_index'] = np.full(steps, -1)
+        return result
+
+    layer, pump = np.unravel_index(np.argmin(cost), cost.shape)
+    path = np.empty(steps, dtype=np.intp)
+    for i in range(steps - 1, -1, -1):
+        path[i] = pump
+        previous = came_from[i, layer, pump]
+        if previous >= 0:
+            pump, layer = previous, layer - 1
+    result['profile']['pump_index'] = path
+
+    starts = np.flatnonzero(np.r_[True, path[1:] != path[:-1]])
+    ends = np.r_[starts[1:], steps]
+    for start, end in zip(starts, ends):
+        k = path[start]
+        result['sections'].append({
+            'pump': arrays['name'][k],
+            'pump_index': int(k),
+            'stages': float(np.ceil(costs['stages'][k, start:end].sum())),
+            'inlet_pressure_atm': float(pressure[start]),
+            'outlet_pressure_atm': float(pressure[end]),
+            'inlet_void_fraction': float(costs['void_fraction'][start]),
+            'outlet_void_fraction': float(costs['void_fraction'][end - 1]),
+            'inlet_rate_m3': float(costs['rate'][start]),
+            'outlet_rate_m3': float(costs['rate'][end - 1]),
+            'power_kw': float(power[k, start:end].sum()),
+        })
+    result['total_stages'] = sum(section['stages'] for section in result['sections'])
+    result['total_power_kw'] = sum(section['power_kw'] for section in result['sections'])
+    return result
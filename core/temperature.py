@@ -0,0 +1,116 @@
+"""Wellbore temperature: geothermal gradient with a flowing-fluid correction.
+
+Fluid enters the well at the formation temperature of the inflow depth and
+cools on its way up by losing heat to the colder rock. Ramey's solution
+(with the Hasan-Kabir form of the relaxation length) gives, at a true
+vertical depth ``z`` above the inflow depth ``z_b``::
+
+    T(z) = T_geo(z) + g A (1 - exp(-(z_b - z) / A))
+
+where ``g`` is the geothermal gradient and ``A`` the relaxation length
+
+    A = w c_p / (2 pi) * (f(t) / k_e + 1 / (r U)),
+    f(t) = ln(2 sqrt(alpha t) / r) - 0.29.
+
+``A`` depends on the well and its rate only, so it is computed once per
+batch; temperatures at any array of depths (traverse segments, grid
+points) are then one ``exp``. With ``A = 0`` (or no flow) the profile is
+the plain geothermal line used by the JS engine.
+
+The engine takes the pump intake temperature from the flowing profile with
+the inflow at the perforations (``perforationDepth``, see
+``core.engine.intake_temperature``), so PVT, vapor pressure and motor
+cooling see the fluid warmed by the deeper inflow. With the perforations at
+the pump the intake temperature is geothermal.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+import numpy as np
+
+SECONDS_PER_DAY = 24 * 3600
+
+TEMPERATURE_MODELS = ('geothermal', 'flowing')
+
+FORMATION_CONDUCTIVITY_W_MK = 2.0
+FORMATION_DIFFUSIVITY_M2_S = 1.0e-6
+OVERALL_HEAT_TRANSFER_W_M2K = 30.0
+WELLBORE_RADIUS_M = 0.073
+PRODUCTION_DAYS = 30.0
+WATER_HEAT_CAPACITY_J_KGK = 4186.0
+OIL_HEAT_CAPACITY_J_KGK = 2100.0
+
+
+@dataclass(frozen=True)
+class TemperatureProfile:
+    """Per-well profile coefficients; every field broadcasts with the others."""
+
+    surface_c: np.ndarray
+    gradient_c_m: np.ndarray
+    bottom_tvd: np.ndarray
+    relaxation_m: np.ndarray
+
+    def geothermal(self, tvd: np.ndarray) -> np.ndarray:
+        """Undisturbed formation temperature, °C."""
+        return self.surface_c + self.gradient_c_m * tvd
+
+    def at(self, tvd: np.ndarray) -> np.ndarray:
+        """Flowing fluid temperature at true vertical depths, °C.
+
+        Below the inflow depth the well is static and at formation
+        temperature.
+        """
+        tvd = np.asarray(tvd, dtype=float)
+        height = np.maximum(self.bottom_tvd - tvd, 0.0)
+        a = self.relaxation_m
+        safe = np.where(a > 0, a, 1.0)
+        excess = np.where(a > 0, self.gradient_c_m * a * -np.expm1(-height / safe), 0.0)
+        return self.geothermal(tvd) + excess
+
+    def expand(self) -> 'TemperatureProfile':
+        """Add a trailing axis so the profile broadcasts against depth grids."""
+        return TemperatureProfile(*(np.asarray(value)[..., None] for value in
+                                    (self.surface_c, self.gradient_c_m, self.bottom_tvd,
+                                     self.relaxation_m)))
+
+
+def relaxation_length(p: Mapping[str, np.ndarray], q_m3: np.ndarray,
+                      production_days: float = PRODUCTION_DAYS) -> np.ndarray:
+    """Ramey relaxation length of the flowing liquid column, m."""
+    wc = p['waterCut'] / 100.0
+    heat_capacity = wc * WATER_HEAT_CAPACITY_J_KGK + (1.0 - wc) * OIL_HEAT_CAPACITY_J_KGK
+    mass_rate = np.maximum(np.asarray(q_m3, dtype=float), 0.0) * p['liquidDensity'] / SECONDS_PER_DAY
+    time_s = production_days * SECONDS_PER_DAY
+    transient = np.log(2.0 * np.sqrt(FORMATION_DIFFUSIVITY_M2_S * time_s) / WELLBORE_RADIUS_M) - 0.29
+    resistance = (np.maximum(transient, 0.0) / FORMATION_CONDUCTIVITY_W_MK
+                  + 1.0 / (WELLBORE_RADIUS_M * OVERALL_HEAT_TRANSFER_W_M2K))
+    return mass_rate * heat_capacity / (2.0 * np.pi) * resistance
+
+
+def temperature_profile(p: Mapping[str, np.ndarray], q_m3: Optional[np.ndarray] = None,
+                        bottom_tvd: Optional[np.ndarray] = None, model: str = 'flowing',
+                        production_days: float = PRODUCTION_DAYS) -> TemperatureProfile:
+    """Profile for the wells of ``p`` producing ``q_m3`` from ``bottom_tvd``.
+
+    Args:
+        p: Prepared inputs.
+        q_m3: Surface liquid rate (defaults to ``targetFlowRate``).
+        bottom_tvd: Inflow depth, m (defaults to ``pumpDepth``).
+        model: ``'flowing'`` (Ramey) or ``'geothermal'``.
+        production_days: Time on production for the transient conduction.
+    """
+    if model not in TEMPERATURE_MODELS:
+        raise ValueError(f"Unknown temperature model: {model}")
+    q = p['targetFlowRate'] if q_m3 is None else np.asarray(q_m3, dtype=float)
+    bottom = p['pumpDepth'] if bottom_tvd is None else np.asarray(bottom_tvd, dtype=float)
+    relaxation = (relaxation_length(p, q, production_days) if model == 'flowing'
+                  else np.zeros(()))
+    return TemperatureProfile(
+        surface_c=np.asarray(p['surfaceTemperature'], dtype=float),
+        gradient_c_m=np.asarray(p['tempGradient'], dtype=float) / 100.0,
+        bottom_tvd=bottom,
+        relaxation_m=relaxation,
+    )
@@ -0,0 +1,135 @@
+"""Segmented pressure traverse along the tubing.
+
+Marches from the wellhead down to the pump discharge, re-evaluating the
+free gas and the Beggs-Brill gradient in every segment at the local
+pressure and temperature. ``casing_traverse`` marches the other way, from
+the perforations up the casing below the pump. The march is sequential
+over segments but vectorized over any batch shape (wells, rates, grid
+points).
+
+With a :class:`core.survey.Survey` the depths are measured depths: the
+segment lengths (friction), TVD increments (gravity) and mid-segment TVDs
+(temperature) are taken from the survey once, before the march. The
+temperature of every segment likewise comes from one evaluation of the
+wellbore profile of ``core.temperature`` (geothermal by default, or the
+flowing-fluid profile with the inflow at the bottom of the traverse or at
+the perforations, whichever is deeper).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from core.engine import (G, PA_PER_ATM, InputArrays, beggs_brill, inflow_depth,
+                         void_fraction_and_rate)
+from core.survey import Survey
+from core.temperature import temperature_profile
+
+
+def segment_geometry(depth: np.ndarray, segments: int,
+                     survey: Optional[Survey] = None) -> Dict[str, np.ndarray]:
+    """Segment boundaries down to ``depth``, vertical unless a survey is given.
+
+    See :meth:`core.survey.Survey.segment_geometry` for the keys.
+    """
+    if survey is not None:
+        return survey.segment_geometry(depth, segments)
+    dz = np.asarray(depth, dtype=float)[..., None] / segments
+    boundaries = dz * np.arange(segments + 1)
+    length = np.broadcast_to(dz, boundaries.shape[:-1] + (segments,))
+    return {
+        'md': boundaries,
+        'tvd': boundaries,
+        'inclination_deg': np.zeros_like(boundaries),
+        'length': length,
+        'height': length,
+        'tvd_mid': dz * (np.arange(segments) + 0.5),
+    }
+
+
+def pressure_traverse(q_m3: np.ndarray, p: InputArrays, segments: int = 50,
+                      whp: Optional[np.ndarray] = None,
+                      depth: Optional[np.ndarray] = None,
+                      survey: Optional[Survey] = None,
+                      temperature_model: str = 'geothermal') -> Dict[str, np.ndarray]:
+    """Pressure profile from the wellhead to ``depth`` (pump depth by default).
+
+    Returns ``depth`` (measured), ``tvd``, ``pressure`` and ``temperature``
+    with a trailing axis of ``segments + 1`` boundaries, and the total
+    ``pressure_drop`` in atm.
+    """
+    whp = p['tubingHeadPressure'] if whp is None else np.asarray(whp, dtype=float)
+    depth = p['pumpDepth'] if depth is None else np.asarray(depth, dtype=float)
+    shape = np.broadcast(q_m3, whp, depth, p['reservoirPressure']).shape
+    geometry = segment_geometry(np.broadcast_to(depth, shape), segments, survey)
+    inflow = np.maximum(geometry['tvd'][..., -1], inflow_depth(p, survey))
+    profile = temperature_profile(p, q_m3, inflow, temperature_model).expand()
+    temp_mid = profile.at(geometry['tvd_mid'])
+
+    pressure = np.empty(shape + (segments + 1,))
+    pressure[..., 0] = whp
+    for i in range(segments):
+        top = pressure[..., i]
+        temp, dz, dh = temp_mid[..., i], geometry['length'][..., i], geometry['height'][..., i]
+        # Predictor-corrector: gradient at the top, then at the segment midpoint.
+        dp_top = _segment_drop(q_m3, top, temp, dz, dh, p)
+        dp_mid = _segment_drop(q_m3, top + 0.5 * dp_top, temp, dz, dh, p)
+        pressure[..., i + 1] = top + dp_mid
+    return {
+        'depth': geometry['md'],
+        'tvd': geometry['tvd'],
+        'pressure': pressure,
+        'temperature': profile.at(geometry['tvd']),
+        'pressure_drop': pressure[..., -1] - pressure[..., 0],
+    }
+
+
+def _segment_drop(q_m3: np.ndarray, pressure: np.ndarray, temp: np.ndarray,
+                  dz: np.ndarray, dh: np.ndarray, p: InputArrays) -> np.ndarray:
+    void = void_fraction_and_rate(pressure, temp, q_m3, p)
+    return beggs_brill(void['total_rate'], void['gas_rate'], p, length=dz, height=dh)['pressure_drop']
+
+
+def casing_traverse(q_m3: np.ndarray, p: InputArrays, bottom_pressure: np.ndarray,
+                    bottom_depth: np.ndarray, segments: int = 50,
+                    survey: Optional[Survey] = None,
+                    temperature_model: str = 'geothermal') -> Dict[str, np.ndarray]:
+    """Pressure in the casing from the perforations up to the surface.
+
+    The casing carries the whole production with no slip between gas and
+    liquid; friction in the wide annulus is neglected. Uses the same
+    boundaries as :func:`pressure_traverse` down to ``bottom_depth``, so
+    the two profiles can be read off at any pump depth on the grid. The
+    pressure is floored at zero above the dynamic fluid level.
+    """
+    bottom_depth = np.asarray(bottom_depth, dtype=float)
+    shape = np.broadcast(q_m3, bottom_pressure, bottom_depth, p['reservoirPressure']).shape
+    geometry = segment_geometry(np.broadcast_to(bottom_depth, shape), segments, survey)
+    inflow = np.maximum(geometry['tvd'][..., -1], inflow_depth(p, survey))
+    profile = temperature_profile(p, q_m3, inflow, temperature_model).expand()
+    temp_mid = profile.at(geometry['tvd_mid'])
+
+    pressure = np.empty(shape + (segments + 1,))
+    pressure[..., segments] = bottom_pressure
+    for i in range(segments, 0, -1):
+        bottom = pressure[..., i]
+        temp, dh = temp_mid[..., i - 1], geometry['height'][..., i - 1]
+        dp_bottom = _casing_drop(q_m3, bottom, temp, dh, p)
+        dp_mid = _casing_drop(q_m3, np.maximum(bottom - 0.5 * dp_bottom, 0.0), temp, dh, p)
+        pressure[..., i - 1] = np.maximum(bottom - dp_mid, 0.0)
+    return {
+        'depth': geometry['md'],
+        'tvd': geometry['tvd'],
+        'pressure': pressure,
+        'temperature': profile.at(geometry['tvd']),
+    }
+
+
+def _casing_drop(q_m3: np.ndarray, pressure: np.ndarray, temp: np.ndarray,
+                 dh: np.ndarray, p: InputArrays) -> np.ndarray:
+    void = void_fraction_and_rate(pressure, temp, q_m3, p)
+    gas = void['void_fraction'] / 100.0
+    rho_mix = p['liquidDensity'] * (1.0 - gas) + p['gasSpecificGravity'] * 1.225 * gas
+    return rho_mix * G * dh / PA_PER_ATM
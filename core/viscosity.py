@@ -0,0 +1,125 @@
+"""Viscosity correction of pump head, rate and efficiency (HI 9.6.7 method).
+
+The correction parameter
+
+    B = 16.5 * ν^0.50 * H_bep^0.0625 / (Q_bep^0.375 * N^0.25)
+
+(ν in cSt, H in m per stage, Q in m³/h, N in rpm) gives the rate and
+efficiency factors ``C_Q`` and ``C_η``; the head factor at a rate ratio
+``q / Q_bep`` is ``1 - (1 - C_Q) (q / Q_bep)^0.75``. Factors are 1 for
+``B <= 1``.
+
+Tables of ``C_Q`` and ``C_η`` over a log-spaced viscosity grid are built
+once per catalog (one row per pump) and cached, so correcting every
+candidate pump for a batch of wells is a single interpolation.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from core.catalog import CatalogArrays
+
+# Shaft speed of a two-pole motor at 50 Hz, rpm.
+PUMP_SPEED_RPM = 2910.0
+# HI method applies up to B = 40; beyond that factors are held constant.
+B_MAX = 40.0
+
+VISCOSITY_GRID_CST = np.logspace(-1, 4, 501)
+
+
+def kinematic_viscosity_cst(viscosity_cp: np.ndarray, density_kg_m3: np.ndarray) -> np.ndarray:
+    """Kinematic viscosity, cSt, from dynamic viscosity (cP) and density."""
+    return np.asarray(viscosity_cp, dtype=float) / (np.asarray(density_kg_m3, dtype=float) / 1000.0)
+
+
+def correction_parameter(nu_cst: np.ndarray, q_bep_m3_day: np.ndarray,
+                         head_bep_m: np.ndarray, speed_rpm: float = PUMP_SPEED_RPM) -> np.ndarray:
+    """HI parameter B for kinematic viscosity and BEP rate/head per stage."""
+    q_m3_h = np.asarray(q_bep_m3_day, dtype=float) / 24.0
+    return (16.5 * np.sqrt(np.maximum(nu_cst, 0.0)) * np.asarray(head_bep_m, dtype=float) ** 0.0625
+            / (q_m3_h ** 0.375 * speed_rpm ** 0.25))
+
+
+def correction_factors(b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Rate (``C_Q``, also head at BEP) and efficiency (``C_η``) factors from B."""
+    b = np.clip(b, 1.0, B_MAX)
+    c_q = np.exp(-0.165 * np.log10(b) ** 3.15 * np.log(2.71))
+    c_eff = b ** (-0.0547 * b ** 0.69)
+    return c_q, c_eff
+
+
+def head_factor(c_q: np.ndarray, rate_ratio: np.ndarray) -> np.ndarray:
+    """Head factor at ``q / Q_bep`` (HI: ``1 - (1 - C_Q) (q/Q_bep)^0.75``).
+
+    The HI curves are defined up to 120 % of the BEP rate; the ratio is
+    held there beyond it.
+    """
+    return 1.0 - (1.0 - c_q) * np.clip(rate_ratio, 0.0, 1.2) ** 0.75
+
+
+class ViscosityCorrectionTable:
+    """``C_Q`` and ``C_η`` per pump over a log-spaced viscosity grid."""
+
+    def __init__(self, q_bep_m3_day: np.ndarray, head_bep_m: np.ndarray,
+                 speed_rpm: float = PUMP_SPEED_RPM,
+                 grid_cst: np.ndarray = VISCOSITY_GRID_CST) -> None:
+        self.q_bep = np.asarray(q_bep_m3_day, dtype=float)
+        self.head_bep = np.asarray(head_bep_m, dtype=float)
+        self.grid = np.asarray(grid_cst, dtype=float)
+        self.log_grid = np.log(self.grid)
+        b = correction_parameter(self.grid[None, :], self.q_bep[:, None],
+                                 self.head_bep[:, None], speed_rpm)
+        self.c_q, self.c_eff = correction_factors(b)
+
+    def factors(self, nu_cst: np.ndarray) -> Dict[str, np.ndarray]:
+        """``C_Q`` and ``C_η`` with a trailing pump axis: ``(..., pumps)``."""
+        x = np.log(np.clip(np.asarray(nu_cst, dtype=float), self.grid[0], self.grid[-1]))
+        position = np.interp(x, self.log_grid, np.arange(self.grid.size, dtype=float))
+        left = np.minimum(position.astype(np.intp), self.grid.size - 2)
+        weight = (position - left)[..., None]
+
+        def gather(table: np.ndarray) -> np.ndarray:
+            lo = np.moveaxis(table[:, left], 0, -1)
+            hi = np.moveaxis(table[:, left + 1], 0, -1)
+            return lo * (1.0 - weight) + hi * weight
+
+        return {'c_q': gather(self.c_q), 'c_eff': gather(self.c_eff)}
+
+
+_TABLES: Dict[str, ViscosityCorrectionTable] = {}
+
+
+def catalog_table(arrays: CatalogArrays, speed_rpm: float = PUMP_SPEED_RPM) -> ViscosityCorrectionTable:
+    """Cached table for a catalog, keyed by its BEP rates and heads."""
+    digest = hashlib.sha1()
+    for column in ('nominal_q_m3', 'head_per_stage_m'):
+        digest.update(np.ascontiguousarray(arrays[column], dtype=float).tobytes())
+    digest.update(repr(speed_rpm).encode())
+    key = digest.hexdigest()
+    if key not in _TABLES:
+        _TABLES[key] = ViscosityCorrectionTable(arrays['nominal_q_m3'], arrays['head_per_stage_m'],
+                                                speed_rpm)
+    return _TABLES[key]
+
+
+def viscosity_corrections(p: Mapping[str, np.ndarray], arrays: CatalogArrays,
+                          rate_m3_day: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Correction factors for every (well, pump) pair, shape ``(..., pumps)``.
+
+    ``rate_m3_day`` is the downhole rate of each well (defaults to each
+    pump's BEP, where the head factor equals ``C_Q``).
+    """
+    table = catalog_table(arrays)
+    nu = kinematic_viscosity_cst(p['viscosity'], p['liquidDensity'])
+    factors = table.factors(nu)
+    if rate_m3_day is None:
+        ratio = np.ones_like(factors['c_q'])
+    else:
+        # Water-equivalent rate for the head correction.
+        ratio = np.asarray(rate_m3_day, dtype=float)[..., None] / (factors['c_q'] * table.q_bep)
+    factors['c_h'] = head_factor(factors['c_q'], ratio)
+    return factors
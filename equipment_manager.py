@@ -0,0 +1,292 @@
+"""
+Motor and cable management for IrkPUMP.
+Handles motor/cable data import from Excel and data persistence, like PumpManager.
+"""
+
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.equipment import CableIndex, MotorIndex, cable_arrays, motor_arrays
+
+
+def _normalize_header(col: Any) -> str:
+    """Strip, lowercase and collapse separators of an Excel column header."""
+    return (
+        str(col)
+        .strip()
+        .replace('\n', ' ')
+        .replace('\t', ' ')
+        .replace(',', '.')
+        .lower()
+    )
+
+
+class EquipmentManager:
+    """Common import/persistence logic; subclasses describe the schema."""
+
+    file_name = ""
+    id_prefix = ""
+    # Column name -> default (None marks a required column)
+    numeric_columns: Dict[str, Optional[float]] = {}
+    text_columns: Tuple[str, ...] = ('model', 'manufacturer', 'notes')
+    # Russian header -> internal name
+    ru_to_en: Dict[str, str] = {}
+    # Column -> (lower bound, upper bound, error message); valid values lie in (lower, upper]
+    limits: Dict[str, Tuple[float, float, str]] = {}
+    # Columnar store builder from core.equipment (item dicts, or None for the built-in defaults)
+    array_builder: Callable[[Optional[List[Dict[str, Any]]]], Dict[str, np.ndarray]]
+
+    def __init__(self, data_dir: Path = None):
+        """Initialize manager.
+
+        Args:
+            data_dir: Directory to store data files. Defaults to current directory.
+        """
+        self.data_dir = data_dir or Path(__file__).parent
+        self.catalog_dir = self.data_dir / "catalog"
+        self.catalog_dir.mkdir(exist_ok=True)
+        self.data_file = self.data_dir / self.file_name
+        self.items: List[Dict[str, Any]] = []
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+        self.load()
+
+    def load(self) -> None:
+        """Load items from pickle file."""
+        self._arrays = None
+        if self.data_file.exists():
+            try:
+                with open(self.data_file, 'rb') as f:
+                    self.items = pickle.load(f)
+            except (pickle.PickleError, IOError) as e:
+                print(f"Error loading {self.file_name}: {e}", file=sys.stderr)
+                self.items = []
+        else:
+            self.items = []
+
+    def save(self) -> None:
+        """Save items to pickle file."""
+        self._arrays = None
+        try:
+            with open(self.data_file, 'wb') as f:
+                pickle.dump(self.items, f)
+        except IOError as e:
+            print(f"Error saving {self.file_name}: {e}", file=sys.stderr)
+
+    def _resolve_path(self, excel_path: str) -> Optional[str]:
+        if Path(excel_path).is_absolute():
+            return excel_path
+        for base in (self.catalog_dir, self.data_dir):
+            if (base / excel_path).exists():
+                return str(base / excel_path)
+        return None
+
+    def _validate(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+        """Coerce numeric columns and drop invalid rows using column masks."""
+        errors: List[str] = []
+        for col, default in self.numeric_columns.items():
+            if col in df.columns:
+                values = pd.to_numeric(df[col], errors='coerce')
+            else:
+                values = pd.Series(np.nan, index=df.index)
+            df[col] = values if default is None else values.fillna(default)
+        for col in self.text_columns:
+            df[col] = df[col].fillna('').astype(str).str.strip() if col in df.columns else ''
+
+        bad = pd.Series(False, index=df.index)
+        required = [col for col, default in self.numeric_columns.items() if default is None]
+        masks = [(df[required].isna().any(axis=1), "Missing or non-numeric values")]
+        masks += [(~((df[col] > lo) & (df[col] <= hi)) & df[col].notna(), message)
+                  for col, (lo, hi, message) in self.limits.items()]
+        masks.append((df['model'] == '', "Empty model name"))
+        for mask, message in masks:
+            new = mask & ~bad
+            errors += [f"Row {index + 2}: {message}" for index in df.index[new]]
+            bad |= mask
+        return df[~bad], errors
+
+    def import_from_excel(self, excel_path: str) -> Dict[str, Any]:
+        """Import items from Excel file.
+
+        Args:
+            excel_path: Path to Excel file (can be relative to catalog dir or absolute)
+
+        Returns:
+            Dict with import results: {'success': bool, 'imported': int, 'errors': List[str]}
+        """
+        try:
+            path = self._resolve_path(excel_path)
+            if path is None:
+                return {'success': False, 'imported': 0, 'errors': [f"File not found: {excel_path}"]}
+
+            df = pd.read_excel(path, engine='openpyxl')
+            known = set(self.numeric_columns) | set(self.text_columns)
+            rename_map: Dict[str, str] = {}
+            for col in df.columns:
+                n = _normalize_header(col)
+                if n in known:
+                    rename_map[col] = n
+                elif n in self.ru_to_en:
+                    rename_map[col] = self.ru_to_en[n]
+            df = df.rename(columns=rename_map)
+
+            missing_cols = [col for col, default in self.numeric_columns.items()
+                            if default is None and col not in df.columns]
+            if 'model' not in df.columns:
+                missing_cols.insert(0, 'model')
+            if missing_cols:
+                return {
+                    'success': False,
+                    'imported': 0,
+                    'errors': [f"Missing required columns: {', '.join(missing_cols)}"]
+                }
+
+            valid, errors = self._validate(df)
+            records = valid[list(self.numeric_columns) + list(self.text_columns)].to_dict('records')
+            start = len(self.items)
+            for i, item in enumerate(records, 1):
+                item['id'] = f"{self.id_prefix}_{start + i}"
+                self.items.append(item)
+
+            if records:
+                self.save()
+
+            return {'success': True, 'imported': len(records), 'errors': errors}
+
+        except Exception as e:
+            return {
+                'success': False,
+                'imported': 0,
+                'errors': [f"Error reading Excel file: {str(e)}"]
+            }
+
+    def get_items(self) -> List[Dict[str, Any]]:
+        """Get all items."""
+        return self.items.copy()
+
+    def get_item_by_id(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Get item by ID."""
+        for item in self.items:
+            if item['id'] == item_id:
+                return item
+        return None
+
+    def delete_item(self, item_id: str) -> bool:
+        """Delete item by ID."""
+        for i, item in enumerate(self.items):
+            if item['id'] == item_id:
+                del self.items[i]
+                self.save()
+                return True
+        return False
+
+    def clear(self) -> None:
+        """Clear all items from memory and file."""
+        self.items = []
+        self.save()
+
+    def get_count(self) -> int:
+        """Get total number of items."""
+        return len(self.items)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Columnar store of the items (built-in defaults when empty), cached until changed."""
+        if self._arrays is None:
+            items = [{key: value for key, value in item.items()
+                      if not (isinstance(value, float) and np.isnan(value))}
+                     for item in self.items]
+            self._arrays = self.array_builder(items or None)
+        return self._arrays
+
+
+class MotorManager(EquipmentManager):
+    """Manages submersible motor data."""
+
+    file_name = "motors.pkl"
+    id_prefix = "motor"
+    numeric_columns = {
+        'power_kw': None,
+        'voltage_v': None,
+        'efficiency': 88.0,
+        'power_factor': 0.85,
+        'od_mm': 117.0,
+        'price': np.nan,
+        'length_m': np.nan,
+        'max_winding_temp_c': np.nan,
+    }
+    ru_to_en = {
+        'модель': 'model',
+        'модель двигателя': 'model',
+        'производитель': 'manufacturer',
+        'заметки': 'notes',
+        'примечания': 'notes',
+        'мощность. квт': 'power_kw',
+        'мощность': 'power_kw',
+        'напряжение. в': 'voltage_v',
+        'напряжение': 'voltage_v',
+        'кпд': 'efficiency',
+        'кпд. %': 'efficiency',
+        'cos φ': 'power_factor',
+        'коэффициент мощности': 'power_factor',
+        'диаметр. мм': 'od_mm',
+        'цена': 'price',
+        'длина. м': 'length_m',
+        'допустимая температура обмотки. °c': 'max_winding_temp_c',
+        'температура обмотки. °c': 'max_winding_temp_c',
+    }
+    limits = {
+        'power_kw': (0.0, np.inf, "Invalid power"),
+        'voltage_v': (0.0, np.inf, "Invalid voltage"),
+        'efficiency': (0.0, 100.0, "Invalid efficiency value"),
+        'power_factor': (0.0, 1.0, "Invalid power factor"),
+        'od_mm': (0.0, np.inf, "Invalid outer diameter"),
+        'length_m': (0.0, np.inf, "Invalid length"),
+    }
+
+    array_builder = staticmethod(motor_arrays)
+
+    def index(self) -> MotorIndex:
+        """Sorted (voltage, power) index of the motors."""
+        return MotorIndex.from_arrays(self.arrays())
+
+
+class CableManager(EquipmentManager):
+    """Manages power cable data."""
+
+    file_name = "cables.pkl"
+    id_prefix = "cable"
+    numeric_columns = {
+        'section_mm2': None,
+        'r20_ohm_km': None,
+        'max_current_a': np.nan,
+        'price_per_km': np.nan,
+    }
+    ru_to_en = {
+        'марка': 'model',
+        'модель': 'model',
+        'марка кабеля': 'model',
+        'производитель': 'manufacturer',
+        'заметки': 'notes',
+        'примечания': 'notes',
+        'сечение. мм²': 'section_mm2',
+        'сечение. мм2': 'section_mm2',
+        'сечение': 'section_mm2',
+        'сопротивление. ом/км': 'r20_ohm_km',
+        'сопротивление': 'r20_ohm_km',
+        'допустимый ток. а': 'max_current_a',
+        'цена за км': 'price_per_km',
+    }
+    limits = {
+        'section_mm2': (0.0, np.inf, "Invalid cross-section"),
+        'r20_ohm_km': (0.0, np.inf, "Invalid resistance"),
+    }
+
+    array_builder = staticmethod(cable_arrays)
+
+    def index(self) -> CableIndex:
+        """Cables sorted by resistance."""
+        return CableIndex.from_arrays(self.arrays())
@@ -10,6 +10,8 @@ from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
+from core.cavitation import format_npsh_curve, parse_npsh_curve
+
 
 class PumpManager:
     """Manages pump data import and export operations."""
@@ -63,6 +65,8 @@ class PumpManager:
         - stages: Number of stages
         - manufacturer: Manufacturer name
         - notes: Additional notes
+        - npsh_req: Required NPSH (m), optional
+        - npsh_curve: NPSHr vs Q as "q:npsh; q:npsh", optional
         
         Args:
             excel_path: Path to Excel file (can be relative to catalog dir or absolute)
@@ -141,6 +145,10 @@ class PumpManager:
                 'кпд': 'efficiency',
                 'макс. ступеней': 'stages',
                 'ступени': 'stages',
+                # NPSH
+                'npsh треб., м': 'npsh_req',
+                'npsh, м': 'npsh_req',
+                'кривая npsh': 'npsh_curve',
             }
 
             rename_map: Dict[str, str] = {}
@@ -149,7 +157,8 @@ class PumpManager:
                 if n in {
                     'model', 'nominal_q_m3', 'min_q_m3', 'max_q_m3',
                     'nominal_head_m', 'min_head_m', 'max_head_m',
-                    'nominal_power_kw', 'efficiency', 'stages', 'manufacturer', 'notes'
+                    'nominal_power_kw', 'efficiency', 'stages', 'manufacturer', 'notes',
+                    'npsh_req', 'npsh_curve'
                 }:
                     rename_map[col] = n
                     continue
@@ -209,6 +218,13 @@ class PumpManager:
                         'notes': str(row.get('notes', '')).strip()
                     }
 
+                    # Optional NPSH data
+                    if 'npsh_req' in df.columns and pd.notna(row['npsh_req']):
+                        pump['npsh_req'] = float(row['npsh_req'])
+                    if 'npsh_curve' in df.columns and pd.notna(row['npsh_curve']):
+                        q, npsh = parse_npsh_curve(str(row['npsh_curve']))
+                        pump['npsh_curve'] = list(zip(q.tolist(), npsh.tolist()))
+
                     # Convert efficiency 0..1 to percent if needed
                     if pump['efficiency'] <= 1:
                         pump['efficiency'] *= 100.0
@@ -288,6 +304,12 @@ class PumpManager:
                 return False
             
             df = pd.DataFrame(self.pumps)
+            if 'npsh_curve' in df.columns:
+                # Same "q:npsh; q:npsh" text as import_from_excel reads.
+                df['npsh_curve'] = [
+                    format_npsh_curve(pump['npsh_curve']) if pump.get('npsh_curve') is not None else None
+                    for pump in self.pumps
+                ]
             df.to_excel(output_path, index=False, engine='openpyxl')
             return True
         except Exception as e:
@@ -0,0 +1,101 @@
+import json
+
+import numpy as np
+import pytest
+
+from core.atlas import (ATLAS_METRICS, ATLAS_TOLERANCES, ERROR_SAFETY_FACTOR, DesignAtlas,
+                        build_atlas)
+from core.engine import run_design
+
+AXES = {
+    'targetFlowRate': np.linspace(30.0, 150.0, 9),
+    'pumpDepth': np.linspace(1500.0, 2600.0, 6),
+    'gasOilRatio': np.linspace(100.0, 400.0, 5),
+    'waterCut': np.linspace(0.0, 90.0, 6),
+    'productivityIndex': np.linspace(1.0, 4.0, 5),
+}
+
+
+@pytest.fixture(scope='module')
+def atlas(tmp_path_factory):
+    return build_atlas(tmp_path_factory.mktemp('atlas'), AXES)
+
+
+def random_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {name: rng.uniform(axis[0], axis[-1], n) for name, axis in AXES.items()}
+
+
+def test_batch_matches_engine(atlas):
+    points = random_points(4000)
+    result = atlas.query(points)
+    design = run_design(points)
+    accepted = result['from_atlas']
+    assert 0.05 < accepted.mean() < 1.0
+    for metric in ATLAS_METRICS:
+        expected = np.where(design['inflow_feasible'], design[metric], np.nan)
+        error = np.abs(result[metric] - expected)
+        assert np.all(error[accepted] <= ATLAS_TOLERANCES[metric])
+        np.testing.assert_array_equal(result[metric][~accepted], expected[~accepted])
+    assert np.all(result['error_estimate'][accepted] <= 1.0)
+    assert np.all(result['error_estimate'][~accepted] == 0.0)
+
+
+def test_single_points_match_batch(atlas):
+    points = random_points(200, seed=1)
+    batch = atlas.query(points)
+    for i in range(200):
+        single = atlas.query({name: float(values[i]) for name, values in points.items()})
+        assert single['from_atlas'] == batch['from_atlas'][i]
+        assert single['error_estimate'] == pytest.approx(batch['error_estimate'][i])
+        for metric in ATLAS_METRICS:
+            assert single[metric] == pytest.approx(batch[metric][i], nan_ok=True)
+
+
+def test_grid_nodes_are_exact(atlas):
+    mesh = np.meshgrid(*AXES.values(), indexing='ij')
+    nodes = {name: values.reshape(-1)[::7] for name, values in zip(AXES, mesh)}
+    design = run_design(nodes)
+    result = atlas.query(nodes, tolerances={metric: np.inf for metric in ATLAS_METRICS})
+    for metric in ATLAS_METRICS:
+        expected = np.where(design['inflow_feasible'], design[metric], np.nan)
+        np.testing.assert_allclose(result[metric], expected, rtol=1e-10, atol=1e-9)
+
+
+@pytest.mark.parametrize("point", [
+    {'targetFlowRate': 200.0},
+    {'pumpDepth': 1000.0},
+    {'tubingHeadPressure': 30.0},
+    {'viscosity': 5.0},
+])
+def test_outside_the_atlas_uses_the_engine(atlas, point):
+    inputs = dict({name: float(axis[len(axis) // 2]) for name, axis in AXES.items()}, **point)
+    single = atlas.query(inputs)
+    assert not single['from_atlas'] and single['error_estimate'] == 0.0
+    design = run_design(inputs)
+    for metric in ATLAS_METRICS:
+        expected = float(design[metric]) if design['inflow_feasible'] else np.nan
+        assert single[metric] == pytest.approx(expected, nan_ok=True)
+    batch = atlas.query({key: np.array([value]) for key, value in inputs.items()})
+    assert not batch['from_atlas'][0]
+
+
+def test_error_scale_and_load(atlas, tmp_path):
+    build_atlas(tmp_path, AXES)
+    meta = json.loads((tmp_path / "atlas.json").read_text(encoding='utf-8'))
+    assert len(meta['error_scale']) == len(ATLAS_METRICS)
+    assert min(meta['error_scale']) >= ERROR_SAFETY_FACTOR
+    loaded = DesignAtlas.load(tmp_path)
+    point = {name: float(axis[1] + 0.3 * (axis[2] - axis[1])) for name, axis in AXES.items()}
+    assert loaded.query(point) == atlas.query(point)
+    meta['version'] = 1
+    (tmp_path / "atlas.json").write_text(json.dumps(meta), encoding='utf-8')
+    with pytest.raises(ValueError):
+        DesignAtlas.load(tmp_path)
+
+
+def test_axes_validated(tmp_path):
+    with pytest.raises(ValueError):
+        build_atlas(tmp_path, {'targetFlowRate': [50.0, 40.0]})
+    with pytest.raises(ValueError):
+        build_atlas(tmp_path, {'porosity': [0.1, 0.2]})
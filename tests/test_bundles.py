@@ -0,0 +1,58 @@
+import itertools
+
+import pytest
+
+from core.bundles import SEPARATOR_CATALOG, optimize_bundle
+from core.catalog import BORETS_CATALOG
+from core.equipment import DEFAULT_CABLES
+
+WELL = {'reservoirPressure': 220, 'productivityIndex': 1.5, 'bubblePointPressure': 90,
+        'gasOilRatio': 120, 'waterCut': 30, 'liquidDensity': 950, 'boFactor': 1.2,
+        'viscosity': 2, 'gasSpecificGravity': 0.8, 'tubingId': 62, 'pumpDepth': 1800,
+        'tubingHeadPressure': 15, 'surfaceTemperature': 10, 'tempGradient': 2.5,
+        'targetFlowRate': 60}
+
+# Two voltage groups, with prices and efficiencies that do not follow power,
+# so the cheapest bundle is not simply the smallest motor.
+MOTORS = [
+    {'model': "M28-1000", 'power_kw': 28, 'voltage_v': 1000, 'efficiency': 80, 'price': 9000},
+    {'model': "M32-1000", 'power_kw': 32, 'voltage_v': 1000, 'efficiency': 86, 'price': 9500},
+    {'model': "M45-1000", 'power_kw': 45, 'voltage_v': 1000, 'efficiency': 90, 'price': 14000},
+    {'model': "M32-2000", 'power_kw': 32, 'voltage_v': 2000, 'efficiency': 84, 'price': 10500},
+    {'model': "M40-2000", 'power_kw': 40, 'voltage_v': 2000, 'efficiency': 91, 'price': 12000},
+    {'model': "M63-2000", 'power_kw': 63, 'voltage_v': 2000, 'efficiency': 92, 'price': 21000},
+]
+
+
+def brute_force(**kwargs):
+    """Cheapest bundle by costing every combination on its own."""
+    best = None
+    for separator, pump, motor, cable in itertools.product(SEPARATOR_CATALOG, BORETS_CATALOG,
+                                                           MOTORS, DEFAULT_CABLES):
+        single = optimize_bundle(WELL, [pump], [motor], [cable], [separator], **kwargs)['best']
+        if single is not None and (best is None or single['lifecycle_cost'] < best['lifecycle_cost']):
+            best = single
+    return best
+
+
+@pytest.mark.parametrize("kwargs", [{}, {'energy_price': 0.02, 'max_voltage_drop': 0.03},
+                                    {'max_stages': 240, 'thermal_check': False}])
+def test_matches_brute_force(kwargs):
+    result = optimize_bundle(WELL, BORETS_CATALOG, MOTORS, DEFAULT_CABLES, **kwargs)
+    expected = brute_force(**kwargs)
+    assert result['cross_product'] == (len(SEPARATOR_CATALOG) * len(BORETS_CATALOG)
+                                       * len(MOTORS) * len(DEFAULT_CABLES))
+    assert expected is not None
+    assert result['best']['lifecycle_cost'] == pytest.approx(expected['lifecycle_cost'], rel=1e-12)
+    assert result['evaluated'] < result['cross_product']
+
+
+def test_infeasible_well_has_no_bundle():
+    result = optimize_bundle(dict(WELL, targetFlowRate=1e4))
+    assert result['best'] is None
+    assert result['evaluated'] == 0
+
+
+def test_rejects_batches():
+    with pytest.raises(ValueError):
+        optimize_bundle({'targetFlowRate': [40.0, 60.0]})
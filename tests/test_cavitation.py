@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from core.cavitation import (MARGIN_THRESHOLDS, MIN_VAPOR_PRESSURE_ATM, STATUS_DANGER, STATUS_SAFE,
+                             STATUS_WARNING, npsh_map, npsh_margin, status_codes, vapor_pressure)
+
+
+def test_status_thresholds_and_nan():
+    codes = status_codes([np.nan, -1.0, 0.2, 0.5, 0.9, 1.0, 2.0, np.inf])
+    assert codes.tolist() == [STATUS_DANGER, STATUS_DANGER, STATUS_DANGER, STATUS_WARNING,
+                              STATUS_WARNING, STATUS_SAFE, STATUS_SAFE, STATUS_SAFE]
+    assert status_codes(np.nan) == STATUS_DANGER
+
+
+def test_vapor_pressure_is_clamped():
+    assert vapor_pressure(-150.0, 100.0) == MIN_VAPOR_PRESSURE_ATM
+    assert vapor_pressure(400.0, 5.0) == 5.0
+    assert np.all(np.diff(vapor_pressure(np.linspace(0.0, 150.0, 16), 1e3)) >= 0)
+
+
+def test_map_matches_pointwise_margin():
+    npsh_req = np.array([2.5, 3.8])
+    grid = npsh_map(40.0, separator_loss=0.5, npsh_req=npsh_req,
+                    pip_grid=np.linspace(0.0, 20.0, 41), temp_grid=np.linspace(20.0, 140.0, 13))
+    assert grid['cavitation_margin'].shape == (2, 13, 41)
+    pump, temp, pip = np.meshgrid(npsh_req, grid['temp_grid'], grid['pip_grid'], indexing='ij')
+    point = npsh_margin(pip, temp, 40.0, 0.5, pump)
+    np.testing.assert_allclose(grid['cavitation_margin'], point['cavitation_margin'])
+    np.testing.assert_array_equal(grid['status'], point['status'])
+
+
+def test_min_safe_pip_is_the_safe_boundary():
+    grid = npsh_map(40.0, npsh_req=3.0, temp_grid=np.array([30.0, 90.0]))
+    for i, boundary in enumerate(grid['min_safe_pip']):
+        safe_pips = grid['pip_grid'][grid['status'][i] == STATUS_SAFE]
+        assert safe_pips.min() >= boundary - 1e-12
+        assert npsh_margin(boundary, grid['temp_grid'][i], 40.0, 0.5, 3.0)['cavitation_margin'] \
+            == pytest.approx(MARGIN_THRESHOLDS[1])
@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+import pytest
+
+from core.cooling import (CASING_ID_MM, FILM_COEFF_W_M2K, WINDING_RISE_RATED_C, motor_length,
+                          motor_temperatures)
+from core.engine import prepare_inputs
+from core.equipment import motor_arrays
+
+MOTORS = motor_arrays([
+    {'model': "A", 'power_kw': 45, 'voltage_v': 1000, 'efficiency': 84},
+    {'model': "B", 'power_kw': 90, 'voltage_v': 1000, 'efficiency': 88, 'length_m': 9.0},
+    {'model': "C", 'power_kw': 180, 'voltage_v': 2000, 'efficiency': 90, 'od_mm': 103,
+     'max_winding_temp_c': 140},
+    {'model': "D", 'power_kw': 250, 'voltage_v': 2000, 'od_mm': 140},
+])
+
+
+def reference(shaft, q_downhole, intake, p, m):
+    """Winding temperature and load of one motor, written out term by term."""
+    od = MOTORS['od_mm'][m] / 1000.0
+    annulus = math.pi / 4 * ((CASING_ID_MM / 1000.0) ** 2 - od ** 2)
+    velocity = q_downhole / 86400.0 / annulus
+    eff = MOTORS['efficiency'][m]
+    losses = shaft * (1 / eff - 1)
+    wc = float(p['waterCut']) / 100.0
+    cp = wc * 4186.0 + (1 - wc) * 2100.0
+    mass = float(p['targetFlowRate'] * p['boFactor'] * p['liquidDensity']) / 86400.0
+    length = motor_length(MOTORS)[m]
+    film = FILM_COEFF_W_M2K * velocity ** 0.8 * math.pi * od * length
+    load = shaft / MOTORS['power_kw'][m]
+    winding = intake + losses * 1000 / (mass * cp) + losses * 1000 / film + WINDING_RISE_RATED_C * load
+    return velocity, winding, load
+
+
+@pytest.mark.parametrize("shaft, q_downhole", [(40.0, 120.0), (80.0, 60.0), (150.0, 300.0)])
+def test_matches_reference(shaft, q_downhole):
+    p = prepare_inputs(None)
+    result = motor_temperatures(shaft, q_downhole, 85.0, p, MOTORS)
+    for m in range(3):
+        velocity, winding, load = reference(shaft, q_downhole, 85.0, p, m)
+        assert result['velocity_m_s'][m] == pytest.approx(velocity)
+        assert result['winding_temp_c'][m] == pytest.approx(winding)
+        assert result['load'][m] == pytest.approx(load)
+
+
+def test_full_load_is_rated_output():
+    result = motor_temperatures(MOTORS['power_kw'], 150.0, 80.0, prepare_inputs(None), MOTORS)
+    np.testing.assert_allclose(np.diagonal(result['load']), 1.0)
+
+
+def test_oversized_motor_does_not_fit():
+    result = motor_temperatures(100.0, 150.0, 80.0, prepare_inputs(None), MOTORS)
+    assert not result['ok'][3] and result['velocity_m_s'][3] == 0.0
+    assert np.isinf(result['winding_temp_c'][3])
+    wider = motor_temperatures(100.0, 150.0, 80.0, prepare_inputs(None), MOTORS, casing_id_mm=150.0)
+    assert wider['velocity_m_s'][3] > 0.0
+
+
+def test_limits():
+    p = prepare_inputs(None)
+    slow = motor_temperatures(20.0, 5.0, 80.0, p, MOTORS)
+    assert not slow['ok'][:3].any()
+    hot = motor_temperatures(40.0, 200.0, 135.0, p, MOTORS)
+    assert hot['winding_temp_c'][2] > 140.0 and not hot['ok'][2]
+    assert motor_temperatures(40.0, 200.0, 60.0, p, MOTORS)['ok'][:3].all()
+
+
+def test_batch_broadcasts():
+    p = prepare_inputs({'waterCut': [20.0, 60.0, 90.0]})
+    shaft = np.array([30.0, 60.0, 90.0])
+    q = np.array([100.0, 150.0, 200.0])
+    batch = motor_temperatures(shaft, q, 80.0, p, MOTORS)
+    assert batch['winding_temp_c'].shape == (3, 4)
+    for w in range(3):
+        single = motor_temperatures(shaft[w], q[w], 80.0,
+                                    prepare_inputs({'waterCut': p['waterCut'][w]}), MOTORS)
+        np.testing.assert_allclose(batch['winding_temp_c'][w], single['winding_temp_c'])
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from core.decline import arps_rate, fit_decline, forecast_parameters, pack_history
+
+TRUE = {
+    'A': (120.0, 0.04, 0.0),   # exponential
+    'B': (80.0, 0.08, 0.5),    # hyperbolic
+    'C': (200.0, 0.03, 1.0),   # harmonic
+}
+
+
+def synthetic_history(noise=0.0, months=36, seed=0):
+    rng = np.random.default_rng(seed)
+    wells, t, q = [], [], []
+    for well, (qi, di, b) in TRUE.items():
+        month = np.arange(months, dtype=float)
+        rate = arps_rate(month, qi, di, b) * (1.0 + noise * rng.normal(size=months))
+        wells += [well] * months
+        t.append(month + 5.0)  # history starting at month 5
+        q.append(rate)
+    # Rows in random order, as a long table might come.
+    order = rng.permutation(len(wells))
+    return {'well': np.array(wells)[order], 'month': np.concatenate(t)[order],
+            'rate': np.concatenate(q)[order]}
+
+
+def test_recovers_exact_parameters():
+    fit = fit_decline(synthetic_history())
+    assert fit['wells'].tolist() == ['A', 'B', 'C']
+    np.testing.assert_array_equal(fit['n_points'], 36)
+    np.testing.assert_allclose(fit['exponential']['di'][0], 0.04, rtol=1e-6)
+    np.testing.assert_allclose(fit['hyperbolic']['qi'][1], 80.0, rtol=1e-4)
+    np.testing.assert_allclose(fit['hyperbolic']['di'][1], 0.08, rtol=1e-4)
+    np.testing.assert_allclose(fit['hyperbolic']['b'][1], 0.5, rtol=1e-4)
+    np.testing.assert_allclose(fit['harmonic']['di'][2], 0.03, rtol=1e-6)
+    assert fit['model'][1] == 'hyperbolic'
+
+
+def test_noisy_data_close_to_truth():
+    fit = fit_decline(synthetic_history(noise=0.02, seed=3))
+    for i, (qi, di, _) in enumerate(TRUE.values()):
+        rate = arps_rate(np.arange(36.0), fit['qi'][i], fit['di'][i], fit['b'][i])
+        np.testing.assert_allclose(rate, arps_rate(np.arange(36.0), qi, di, TRUE['ABC'[i]][2]),
+                                   rtol=0.05)
+
+
+def test_chunks_and_workers_agree():
+    history = synthetic_history(noise=0.02, seed=1)
+    single = fit_decline(history)
+    split = fit_decline(history, chunk_size=1, workers=2)
+    np.testing.assert_allclose(split['qi'], single['qi'])
+    np.testing.assert_array_equal(split['model'], single['model'])
+
+
+def test_dates_and_short_wells():
+    history = {
+        'well': np.array(['A', 'A', 'A', 'B']),
+        'month': np.array(['2024-01', '2024-02', '2024-04', '2024-03'], dtype='datetime64[M]'),
+        'rate': np.array([100.0, 95.0, 86.0, 50.0]),
+    }
+    packed = pack_history(history)
+    np.testing.assert_array_equal(packed['t'][0], [0.0, 1.0, 3.0])
+    fit = fit_decline(history, models=('exponential',))
+    assert np.isfinite(fit['qi'][0])
+    assert np.isnan(fit['qi'][1]) and fit['model'][1] is None
+
+
+def test_empty_history():
+    fit = fit_decline({'well': np.array([]), 'month': np.array([]), 'rate': np.array([])})
+    assert fit['wells'].size == 0 and fit['model'].size == 0
+    assert fit['hyperbolic']['qi'].size == 0
+    assert forecast_parameters(fit)['targetFlowRate'].size == 0
+
+
+def test_unknown_model():
+    with pytest.raises(ValueError):
+        fit_decline(synthetic_history(), models=('linear',))
+
+
+def test_forecast_parameters_continue_the_curve():
+    fit = fit_decline(synthetic_history())
+    params = forecast_parameters(fit)
+    np.testing.assert_allclose(params['targetFlowRate'],
+                               arps_rate(fit['t_last'], fit['qi'], fit['di'], fit['b']))
+    # One month later the shifted curve matches the original one.
+    later = arps_rate(1.0, params['targetFlowRate'], params['decline_rate'], params['hyperbolic_n'])
+    np.testing.assert_allclose(later, arps_rate(fit['t_last'] + 1.0, fit['qi'], fit['di'], fit['b']))
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from core.depth import optimize_setting_depth
+from core.engine import prepare_inputs, void_fraction_and_rate
+from core.selection import evaluate_candidates
+
+
+def candidates_at(result, i, inputs=None):
+    """Selection of one grid depth, staged on its own."""
+    p = prepare_inputs(dict(inputs or {}, pumpDepth=float(result['depth'][i])))
+    void = void_fraction_and_rate(result['pip_atm'][i], result['temp_c'][i], p['targetFlowRate'], p)
+    design = {'pip_atm': result['pip_atm'][i], 'temp_bottom_c': result['temp_c'][i],
+              'void_fraction': void['void_fraction'], 'downhole_q_m3': void['total_rate'],
+              'tdh_m': result['tdh_m'][i]}
+    return evaluate_candidates(p, design=design)
+
+
+def test_default_well_has_a_depth():
+    result = optimize_setting_depth(None)
+    assert result['best_feasible'] and np.isfinite(result['best_depth'])
+    assert result['best_pump_index'] == evaluate_candidates(None)['recommended']
+    best = result['depth'] == result['best_depth']
+    assert result['void_fraction'][best] > 40.0
+
+
+def test_matches_selection_depth_by_depth():
+    result = optimize_setting_depth(None, depth_min=1500.0, segments=40)
+    for i, depth in enumerate(result['depth']):
+        candidates = candidates_at(result, i)
+        power = np.where(candidates['suitable'], candidates['shaft_power_kw'], np.inf).reshape(-1)
+        if depth < 1500.0 or result['pip_atm'][i] <= 0.0 or not np.isfinite(power).any():
+            assert result['pump_index'][i] == -1 and np.isnan(result['shaft_power_kw'][i])
+            continue
+        assert result['pump_index'][i] == np.argmin(power)
+        assert result['shaft_power_kw'][i] == pytest.approx(power.min())
+    best = np.nanargmin(result['shaft_power_kw'])
+    assert result['best_depth'] == result['depth'][best]
+    assert result['best_shaft_power_kw'] == result['shaft_power_kw'][best]
+
+
+def test_cap_leaves_least_gassy_depth():
+    result = optimize_setting_depth(None, depth_min=1000.0, max_void_fraction=10.0)
+    assert not result['best_feasible'] and not result['feasible'].any()
+    in_bounds = result['depth'] >= 1000.0
+    least = result['depth'][in_bounds][np.argmin(result['void_fraction'][in_bounds])]
+    assert result['best_depth'] == least
+    assert result['best_pump_index'] == -1 and np.isnan(result['best_shaft_power_kw'])
+
+
+def test_per_pump_cap():
+    limits = np.full(10, 10.0)
+    limits[8] = 100.0
+    result = optimize_setting_depth(None, max_void_fraction=limits)
+    assert result['best_feasible'] and result['best_pump_index'] == 8
+    assert set(np.unique(result['pump_index'])) <= {-1, 8}
+
+
+def test_batch_matches_single_wells():
+    wells = {'pumpDepth': [2630.0, 2400.0, 2000.0], 'perforationDepth': 2630.0,
+             'targetFlowRate': [80.0, 100.0, 60.0]}
+    batch = optimize_setting_depth(wells, segments=50)
+    for w in range(3):
+        single = optimize_setting_depth({key: np.asarray(value).reshape(-1)[min(w, np.size(value) - 1)]
+                                         for key, value in wells.items()}, segments=50)
+        for key in ('best_depth', 'best_pump_index', 'best_shaft_power_kw', 'best_feasible'):
+            np.testing.assert_allclose(batch[key][w], single[key])
+        np.testing.assert_allclose(batch['shaft_power_kw'][w], single['shaft_power_kw'])
+    assert np.all(batch['best_depth'] <= wells['pumpDepth'])
+
+
+def test_fixed_pump():
+    result = optimize_setting_depth(None, pump="ЭЦНД 8-320")
+    assert result['best_pump_index'] == 9
+    assert set(np.unique(result['pump_index'])) <= {-1, 9}
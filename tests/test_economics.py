@@ -0,0 +1,57 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from core.economics import BBL_PER_M3, decline_type_key, run_scenarios, scenario_rows
+from core.forecast import decline_rates
+
+PRICES = [40.0, 70.0]
+COSTS = [20.0, 55.0, 80.0]
+DECLINES = [0.01, 0.05]
+DISCOUNTS = [0.0, 0.1]
+
+
+def scenario_loop(price, cost, decline, discount, months=24):
+    npv, cumulative, breakeven = 0.0, 0.0, -1
+    for month in range(months + 1):
+        rate = float(decline_rates(100.0, month, 'exponential', decline))
+        profit = rate * BBL_PER_M3 * (price - cost)
+        npv += profit / (1.0 + discount) ** (month / 12.0)
+        cumulative += profit
+        if breakeven < 0 and cumulative >= 0:
+            breakeven = month
+    return npv, cumulative, breakeven
+
+
+def test_matches_scenario_loop():
+    result = run_scenarios(100.0, 24, PRICES, COSTS, DECLINES, DISCOUNTS)
+    table = result['scenarios']
+    assert table['npv'].size == len(PRICES) * len(COSTS) * len(DECLINES) * len(DISCOUNTS)
+    assert np.all(np.diff(table['npv']) <= 0)
+    found = {}
+    for i in range(table['npv'].size):
+        key = tuple(float(table[name][i]) for name in
+                    ('oil_price', 'operating_cost', 'decline_rate', 'discount_rate'))
+        found[key] = (table['npv'][i], table['total_profit'][i], table['breakeven_month'][i])
+    for combination in itertools.product(PRICES, COSTS, DECLINES, DISCOUNTS):
+        npv, profit, breakeven = scenario_loop(*combination)
+        assert found[combination][0] == pytest.approx(npv, rel=1e-12)
+        assert found[combination][1] == pytest.approx(profit, rel=1e-12)
+        assert found[combination][2] == breakeven
+
+
+def test_monthly_arrays_follow_scenario_order():
+    result = run_scenarios(100.0, 12, PRICES, COSTS, DECLINES, DISCOUNTS, keep_monthly=True)
+    np.testing.assert_allclose(result['discounted_profits'].sum(axis=1), result['scenarios']['npv'])
+    np.testing.assert_allclose(result['rates'][:, -1], result['scenarios']['final_rate'])
+
+
+def test_tab_labels_and_rows():
+    assert decline_type_key("Гармоническое") == 'harmonic'
+    assert decline_type_key('hyperbolic') == 'hyperbolic'
+    result = run_scenarios(100.0, 12, [30.0], [50.0], [0.02], [0.1])
+    rows = scenario_rows(result['scenarios'])
+    assert rows[0]['breakeven_month'] is None
+    assert len(scenario_rows(run_scenarios(100.0, 12, PRICES, COSTS, DECLINES, DISCOUNTS)['scenarios'],
+                             limit=5)) == 5
@@ -0,0 +1,66 @@
+"""run_design against the JS engine of ``IrkPUMP v6.html``.
+
+Reference values were produced by running the page's calculation functions
+under node. The JS page inverts the IPR by stepping the intake pressure in
+0.5 psi, so PIP (and what follows from it) agrees to a few hundredths of an
+atmosphere rather than to round-off.
+"""
+
+import numpy as np
+import pytest
+
+from core.engine import DEFAULT_INPUTS, run_design
+
+CASES = [
+    # (inputs, JS pip_atm, void_fraction, downhole_q_m3, pressure_drop, tdh_m)
+    ({}, 50.20152422427873, 46.08702662495367, 243.35515514476526, 229.57510927848344,
+     2333.8809373813406),
+    ({'reservoirPressure': 220, 'productivityIndex': 1.5, 'bubblePointPressure': 90,
+      'gasOilRatio': 120, 'waterCut': 30, 'liquidDensity': 950, 'boFactor': 1.2,
+      'viscosity': 2, 'gasSpecificGravity': 0.8, 'tubingId': 62, 'pumpDepth': 1800,
+      'tubingHeadPressure': 15, 'surfaceTemperature': 10, 'tempGradient': 2.5,
+      'targetFlowRate': 60},
+     179.98911268372348, 0.0, 72.0, 167.58452524649596, 1822.0400258169645),
+    ({'reservoirPressure': 150, 'productivityIndex': 0.8, 'bubblePointPressure': 120,
+      'gasOilRatio': 60, 'waterCut': 80, 'liquidDensity': 1050, 'boFactor': 1.1,
+      'viscosity': 1, 'gasSpecificGravity': 0.7, 'tubingId': 76, 'pumpDepth': 2200,
+      'tubingHeadPressure': 20, 'surfaceTemperature': 15, 'tempGradient': 3,
+      'targetFlowRate': 40},
+     99.6801850843767, 2.394584588843471, 45.079465944233554, 218.8184388257149,
+     2152.495346246839),
+]
+
+
+@pytest.mark.parametrize("inputs, pip, void, downhole_q, drop, tdh", CASES)
+def test_run_design_matches_js(inputs, pip, void, downhole_q, drop, tdh):
+    design = run_design(inputs)
+    assert design['inflow_feasible']
+    assert design['pip_atm'] == pytest.approx(pip, abs=0.05)
+    assert design['void_fraction'] == pytest.approx(void, abs=0.05)
+    assert design['downhole_q_m3'] == pytest.approx(downhole_q, rel=1e-3)
+    assert design['pressure_drop'] == pytest.approx(drop, rel=1e-3)
+    assert design['tdh_m'] == pytest.approx(tdh, rel=1e-3)
+
+
+def test_batch_matches_single_wells():
+    batch = {key: np.array([dict(DEFAULT_INPUTS, **inputs)[key] for inputs, *_ in CASES])
+             for key in DEFAULT_INPUTS}
+    design = run_design(batch)
+    for i, (inputs, *_) in enumerate(CASES):
+        single = run_design(inputs)
+        for key in ('pip_atm', 'void_fraction', 'pressure_drop', 'tdh_m'):
+            assert design[key][i] == pytest.approx(float(single[key]), rel=1e-12)
+
+
+def test_flow_rate_override_broadcasts():
+    rates = np.array([20.0, 40.0, 80.0])
+    design = run_design({}, flow_rate=rates)
+    assert design['tdh_m'].shape == rates.shape
+    for rate, tdh in zip(rates, design['tdh_m']):
+        assert tdh == pytest.approx(float(run_design({'targetFlowRate': rate})['tdh_m']))
+
+
+def test_rate_beyond_open_flow_is_infeasible():
+    design = run_design({'targetFlowRate': 1e4})
+    assert not design['inflow_feasible']
+    assert design['pip_atm'] == 0.0
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from core.engine import MOTOR_EFFICIENCY, MOTOR_POWERS_KW
+from core.equipment import (DEFAULT_CABLES, DEFAULT_MOTORS, CableIndex, MotorIndex, cable_arrays,
+                            motor_arrays)
+
+
+def smallest_brute_force(power, voltage, p, v, clamp):
+    """Catalog indices acceptable for one query (``{-1}`` when none fits)."""
+    group = [i for i in range(power.size) if voltage[i] == v]
+    fits = [i for i in group if power[i] >= max(p, 0.0)]
+    if fits:
+        best = min(power[i] for i in fits)
+        return {min(i for i in fits if power[i] == best)}
+    if clamp and group:
+        largest = max(power[i] for i in group)
+        return {i for i in group if power[i] == largest}
+    return {-1}
+
+
+@pytest.mark.parametrize("clamp", [False, True])
+def test_motor_index_matches_brute_force(clamp):
+    rng = np.random.default_rng(3)
+    power = rng.choice([22.0, 37.0, 45.0, 63.0, 90.0, 125.0, 180.0], 60)
+    voltage = rng.choice([700.0, 1000.0, 1400.0, 2300.0], 60)
+    queries = np.column_stack([rng.uniform(-10.0, 220.0, 500),
+                               rng.choice([700.0, 1000.0, 1400.0, 2300.0, 3000.0], 500)])
+    found = MotorIndex(power, voltage).smallest(queries[:, 0], queries[:, 1], clamp=clamp)
+    for index, (p, v) in zip(found, queries):
+        assert index in smallest_brute_force(power, voltage, p, v, clamp)
+
+
+def test_motor_index_defaults_and_empty():
+    index = MotorIndex.from_arrays(motor_arrays())
+    found = index.smallest(np.array([50.0, 400.0]), 1000.0)
+    assert found[0] == MOTOR_POWERS_KW.index(55) and found[1] == -1
+    assert index.smallest(400.0, 1000.0, clamp=True) == len(MOTOR_POWERS_KW) - 1
+    assert MotorIndex(np.empty(0), np.empty(0)).smallest(np.array([10.0]), 1000.0).tolist() == [-1]
+
+
+def test_cable_index_matches_brute_force():
+    rng = np.random.default_rng(4)
+    resistance = rng.choice([0.5, 0.727, 1.15, 1.83, 3.08, 4.61], 30)
+    index = CableIndex(resistance)
+    for r in rng.uniform(0.0, 5.0, 200):
+        fits = np.flatnonzero(resistance <= r)
+        assert sorted(index.at_most(r)) == sorted(fits)
+        assert index.count_at_most(r) == fits.size
+        thinnest = index.thinnest(r)
+        if fits.size:
+            assert resistance[thinnest] == resistance[fits].max()
+        else:
+            assert thinnest == -1
+
+
+def test_arrays_defaults():
+    motors = motor_arrays()
+    assert motors['power_kw'].tolist() == [row['power_kw'] for row in DEFAULT_MOTORS]
+    assert np.all(motors['efficiency'] == MOTOR_EFFICIENCY)
+    assert np.isnan(motors['length_m']).all()
+    cables = cable_arrays()
+    assert cables['r20_ohm_km'].tolist() == [row['r20_ohm_km'] for row in DEFAULT_CABLES]
+    assert np.isnan(cables['max_current_a']).all()
+
+
+def test_arrays_fill_missing_columns():
+    motors = motor_arrays([{'model': "M", 'power_kw': 90.0, 'voltage_v': 2000.0, 'efficiency': 84.0}])
+    assert motors['efficiency'][0] == pytest.approx(0.84)
+    assert motors['price'][0] > 0 and motors['model'][0] == "M"
+    cables = cable_arrays([{'model': "C", 'section_mm2': 16.0, 'r20_ohm_km': 1.15}])
+    assert cables['price_per_km'][0] > 0
+
+
+def test_motor_manager_import(tmp_path):
+    pd = pytest.importorskip('pandas')
+    pytest.importorskip('openpyxl')
+    from equipment_manager import MotorManager
+
+    source = tmp_path / "motors.xlsx"
+    pd.DataFrame({
+        'Модель': ["ПЭД-90", "ПЭД-45", "плохой"],
+        'Мощность, кВт': [90, 45, -1],
+        'Напряжение, В': [2000, 1000, 1000],
+        'КПД, %': [85, 84, 80],
+    }).to_excel(source, index=False, engine='openpyxl')
+    manager = MotorManager(tmp_path)
+    result = manager.import_from_excel(str(source))
+    assert result['imported'] == 2 and len(result['errors']) == 1
+    arrays = manager.arrays()
+    np.testing.assert_allclose(arrays['efficiency'], [0.85, 0.84])
+    assert manager.index().smallest(50.0, 2000.0) == 0
+    assert manager.index().smallest(50.0, 1000.0) == -1
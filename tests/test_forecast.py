@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from core.catalog import BORETS_CATALOG, PumpEnvelopeIndex, catalog_arrays
+from core.engine import calculate_staging, run_design
+from core.forecast import (NO_PUMP_NAME, STATUS_NO_PUMP, STATUS_OK, STATUS_PUMP_CHANGE,
+                           decline_rates, equipment_demand, forecast_rows, run_forecast)
+
+
+def first_cover(q):
+    for i, pump in enumerate(BORETS_CATALOG):
+        if pump['min_q_m3'] <= q <= pump['max_q_m3']:
+            return i
+    return -1
+
+
+def test_decline_models():
+    t = np.arange(0, 61, 12)
+    np.testing.assert_allclose(decline_rates(100.0, t, 'exponential', 0.05), 100.0 * np.exp(-0.05 * t))
+    np.testing.assert_allclose(decline_rates(100.0, t, 'harmonic', 0.05), 100.0 / (1 + 0.05 * t))
+    np.testing.assert_allclose(decline_rates(100.0, t, 'hyperbolic', 0.05, 1.0),
+                               decline_rates(100.0, t, 'harmonic', 0.05))
+    # n = 0 is the exponential limit.
+    np.testing.assert_allclose(decline_rates(100.0, t, 'hyperbolic', 0.05, 0.0),
+                               decline_rates(100.0, t, 'exponential', 0.05))
+    with pytest.raises(ValueError):
+        decline_rates(100.0, t, 'linear')
+
+
+def test_envelope_index_matches_scan():
+    arrays = catalog_arrays()
+    edges = np.concatenate([arrays['min_q_m3'], arrays['max_q_m3']])
+    q = np.concatenate([edges, edges - 1e-9, edges + 1e-9,
+                        np.random.default_rng(0).uniform(0.0, 400.0, 500)])
+    expected = [first_cover(value) for value in q]
+    np.testing.assert_array_equal(PumpEnvelopeIndex.from_arrays(arrays).lookup(q), expected)
+
+
+def test_matches_month_by_month_loop():
+    inputs = {'targetFlowRate': 150.0, 'reservoirPressure': 200.0, 'bubblePointPressure': 90.0,
+              'productivityIndex': 2.0, 'gasOilRatio': 80.0}
+    forecast = run_forecast(inputs, 'hyperbolic', 0.04, 0.7, forecast_period=36)
+    for month in forecast['months']:
+        rate = float(decline_rates(150.0, month, 'hyperbolic', 0.04, 0.7))
+        month_inputs = dict(inputs, targetFlowRate=rate)
+        design = run_design(month_inputs)
+        assert forecast['tdh_m'][month] == pytest.approx(float(design['tdh_m']), rel=1e-12)
+        index = first_cover(float(design['downhole_q_m3']))
+        assert forecast['pump_index'][month] == index
+        if index < 0:
+            assert forecast['pump_name'][month] == NO_PUMP_NAME
+            assert forecast['status'][month] == STATUS_NO_PUMP
+            continue
+        staging = calculate_staging(design, month_inputs, BORETS_CATALOG[index])
+        assert forecast['stages'][month] == staging['stages']
+        assert forecast['motor_power_kw'][month] == staging['motor_power_kw']
+        assert forecast['status'][month] == STATUS_OK
+
+
+def test_pump_change_status():
+    forecast = run_forecast({'targetFlowRate': 150.0}, decline_rate=0.05, forecast_period=48)
+    initial = forecast['pump_name'][0]
+    changed = run_forecast({'targetFlowRate': 150.0}, decline_rate=0.05, forecast_period=48,
+                           selected_pump=initial)
+    other = (forecast['pump_name'] != initial) & (forecast['pump_index'] >= 0)
+    assert other.any()
+    np.testing.assert_array_equal(changed['status'] == STATUS_PUMP_CHANGE, other)
+    assert changed['month_of_pump_change'] == np.argmax(other)
+    assert forecast['month_of_pump_change'] == -1
+
+
+def test_batch_of_wells_matches_single_wells():
+    rates = np.array([60.0, 120.0, 200.0])
+    batch = run_forecast({'targetFlowRate': rates}, forecast_period=24)
+    assert batch['tdh_m'].shape == (3, 25)
+    for i, rate in enumerate(rates):
+        single = run_forecast({'targetFlowRate': rate}, forecast_period=24)
+        np.testing.assert_array_equal(batch['pump_index'][i], single['pump_index'])
+        np.testing.assert_allclose(batch['tdh_m'][i], single['tdh_m'], rtol=1e-12)
+
+
+def test_rows_and_demand():
+    forecast = run_forecast({'targetFlowRate': 150.0}, decline_rate=0.05, forecast_period=24)
+    rows = forecast_rows(forecast)
+    assert len(rows) == 25 and rows[0]['month'] == 0
+    demand = equipment_demand(forecast)
+    named = [name for name in forecast['pump_name'] if name != NO_PUMP_NAME]
+    assert set(demand['pumps']) == set(named)
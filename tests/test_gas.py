@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from core.gas import (GAS_DEGRADATION_COEFFICIENTS, GAS_TOLERANCE_CLASSES, GasDegradationTable,
+                      degradation_formula, gas_factors, tolerance_codes, tolerance_names)
+
+
+def test_table_matches_formula():
+    vf = np.random.default_rng(0).uniform(0.0, 70.0, 2000)
+    for code, name in enumerate(GAS_TOLERANCE_CLASSES):
+        head, eff = gas_factors(code, vf)
+        (head_coef, eff_coef) = GAS_DEGRADATION_COEFFICIENTS[name]
+        # Exact except within one grid step of the 0.2 floor.
+        np.testing.assert_allclose(head, degradation_formula(vf, *head_coef), atol=2e-3)
+        np.testing.assert_allclose(eff, degradation_formula(vf, *eff_coef), atol=2e-3)
+
+
+def test_breakpoints_are_exact():
+    vf = np.array([0.0, 5.0, 15.0, 30.0, 50.0, 80.0])
+    head, _ = GasDegradationTable().lookup(np.zeros(vf.size, dtype=int), vf)
+    np.testing.assert_allclose(head, degradation_formula(vf, 0.5, 0.45, 0.3), atol=1e-12)
+
+
+def test_names_and_codes():
+    codes = tolerance_codes(["Высокая", "Низкая", "неизвестно"])
+    assert codes.tolist() == [2, 0, 1]
+    assert tolerance_names(codes).tolist() == ["Высокая", "Низкая", "Средняя"]
+    np.testing.assert_array_equal(tolerance_codes(np.array([0, 2])), [0, 2])
+
+
+@pytest.mark.parametrize("codes", [7, -1, [0, 3], 1.5])
+def test_invalid_codes(codes):
+    with pytest.raises(ValueError):
+        tolerance_codes(codes)
+
+
+def test_nan_void_fraction():
+    head, efficiency = gas_factors(['Низкая', 'Высокая'], np.array([np.nan, 5.0]))
+    assert np.isnan(head[0]) and np.isnan(efficiency[0])
+    assert head[1] == 1.0 and efficiency[1] == 1.0
+    head, efficiency = gas_factors('Низкая', np.nan)
+    assert np.isnan(head) and np.isnan(efficiency)
+
+
+def test_broadcast_pumps_by_void_fraction():
+    head, _ = gas_factors(np.array([0, 2])[:, None], np.linspace(0.0, 50.0, 11)[None, :])
+    assert head.shape == (2, 11)
+    assert np.all(head[1] >= head[0])
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from core.engine import prepare_inputs
+from core.ipr import build_ipr
+
+MODELS = ('linear', 'vogel', 'composite')
+
+
+@pytest.fixture
+def wells():
+    rng = np.random.default_rng(7)
+    n = 500
+    pr = rng.uniform(50.0, 300.0, n)
+    return prepare_inputs({
+        'reservoirPressure': pr,
+        'bubblePointPressure': pr * rng.uniform(0.0, 1.2, n),
+        'productivityIndex': rng.uniform(0.1, 5.0, n),
+        'waterCut': rng.uniform(0.0, 99.0, n),
+    })
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_pwf_inverts_rate(wells, model):
+    ipr = build_ipr(wells, model)
+    pwf = np.random.default_rng(1).uniform(0.0, 1.0, wells['reservoirPressure'].shape) * ipr.pr
+    np.testing.assert_allclose(ipr.pwf(ipr.rate(pwf)), pwf, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_rate_decreases_to_open_flow(wells, model):
+    ipr = build_ipr(wells, model)
+    pwf = np.linspace(0.0, 1.0, 51)[:, None] * ipr.pr
+    rate = ipr.rate(pwf)
+    assert np.all(np.diff(rate, axis=0) <= 1e-12)
+    np.testing.assert_allclose(rate[0], ipr.aof, rtol=1e-12)
+    np.testing.assert_allclose(rate[-1], 0.0, atol=1e-9)
+
+
+def test_pwf_is_zero_beyond_open_flow(wells):
+    ipr = build_ipr(wells)
+    np.testing.assert_array_equal(ipr.pwf(2.0 * ipr.aof), 0.0)
+
+
+def test_model_per_well():
+    p = prepare_inputs({'reservoirPressure': 200.0, 'bubblePointPressure': 100.0,
+                        'productivityIndex': 1.0, 'waterCut': 50.0})
+    mixed = build_ipr(p, np.array([0, 1, 2]))
+    for i, model in enumerate(MODELS):
+        assert mixed.take(i).aof == pytest.approx(float(build_ipr(p, model).aof))
+    # Linear: Darcy line to zero pressure.
+    assert mixed.take(0).aof == pytest.approx(200.0)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from core.engine import run_design
+from core.lift_tables import LiftTableCache, generate_lift_table, lift_table_key, table_axes
+from core.survey import Survey
+
+
+@pytest.fixture(scope='module')
+def lift_table():
+    return generate_lift_table({}, rates=np.linspace(10.0, 400.0, 40))
+
+
+def test_nan_beyond_open_flow(lift_table):
+    # The composite IPR's open flow depends on water cut, so check the full grid.
+    q, gor, wc = np.meshgrid(*lift_table.axes, indexing='ij')
+    feasible = run_design({'targetFlowRate': q, 'gasOilRatio': gor,
+                           'waterCut': wc})['inflow_feasible']
+    assert not feasible.all()
+    assert np.all(np.isnan(lift_table.values[~feasible]))
+    assert np.all(np.isfinite(lift_table.values[feasible]))
+
+
+def test_inside_grid_close_to_correlation(lift_table):
+    rates = np.array([30.0, 60.0, 80.0])
+    exact = run_design({}, flow_rate=rates)
+    tabulated = run_design({}, flow_rate=rates, lift_table=lift_table)
+    np.testing.assert_allclose(tabulated['pressure_drop'], exact['pressure_drop'], rtol=0.02)
+
+
+def test_drop_does_not_depend_on_wellhead_pressure(lift_table):
+    drops = [run_design({'tubingHeadPressure': whp})['pressure_drop'] for whp in (5.0, 25.0, 60.0)]
+    assert drops[0] == drops[1] == drops[2]
+    tabulated = run_design({'tubingHeadPressure': 60.0}, lift_table=lift_table)
+    assert float(tabulated['pressure_drop']) == pytest.approx(float(drops[0]), rel=0.02)
+
+
+def test_outside_grid_uses_correlation(lift_table):
+    # Outside the rate axis, past the open flow, and outside the GOR axis.
+    for inputs in ({'targetFlowRate': 5.0}, {'targetFlowRate': 390.0},
+                   {'gasOilRatio': 2000.0}):
+        exact = run_design(inputs)
+        tabulated = run_design(inputs, lift_table=lift_table)
+        assert float(tabulated['pressure_drop']) == float(exact['pressure_drop'])
+
+
+def test_rejects_survey(lift_table):
+    with pytest.raises(ValueError):
+        run_design({}, lift_table=lift_table, survey=Survey([0.0, 3000.0], [0.0, 30.0]))
+
+
+def test_key_depends_on_grid_and_well():
+    axes = table_axes({})
+    assert lift_table_key({}, axes) == lift_table_key({}, table_axes({}))
+    assert lift_table_key({}, axes) != lift_table_key({'tubingId': 76}, axes)
+    assert lift_table_key({}, axes) != lift_table_key({}, table_axes({}, gors=[0.0, 100.0]))
+
+
+def test_cache_round_trip(tmp_path):
+    cache = LiftTableCache(tmp_path)
+    table = cache.get({}, gors=np.array([0.0, 250.0, 500.0]))
+    assert cache.path_for(table.key).exists()
+    reloaded = LiftTableCache(tmp_path).get({}, gors=np.array([0.0, 250.0, 500.0]))
+    assert reloaded.key == table.key
+    np.testing.assert_array_equal(reloaded.values, table.values)
+    cache.clear()
+    assert not cache.path_for(table.key).exists()
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from core.catalog import BORETS_CATALOG
+from core.engine import run_design
+from core.montecarlo import run_monte_carlo, sample_inputs, summarize
+
+DISTRIBUTIONS = {
+    'waterCut': {'type': 'uniform', 'low': 40.0, 'high': 60.0},
+    'reservoirPressure': {'type': 'normal', 'std': 5.0},
+}
+
+
+@pytest.mark.parametrize("n", [0, -5])
+def test_needs_realizations(n):
+    with pytest.raises(ValueError):
+        run_monte_carlo(n=n)
+
+
+def test_without_distributions():
+    result = run_monte_carlo(n=7, seed=1, keep_samples=True)
+    np.testing.assert_allclose(result['samples']['tdh_m'], float(run_design({})['tdh_m']))
+    assert result['summary']['tdh_m']['std'] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_samples_match_run_design():
+    result = run_monte_carlo(distributions=DISTRIBUTIONS, n=300, seed=5, chunk_size=300,
+                             keep_samples=True)
+    rng = np.random.default_rng(np.random.SeedSequence(5).spawn(1)[0])
+    design = run_design(sample_inputs({}, DISTRIBUTIONS, 300, rng))
+    np.testing.assert_allclose(result['samples']['tdh_m'], design['tdh_m'])
+
+
+def test_reproducible_across_workers():
+    first = run_monte_carlo(distributions=DISTRIBUTIONS, n=500, seed=3, chunk_size=128)
+    second = run_monte_carlo(distributions=DISTRIBUTIONS, n=500, seed=3, chunk_size=128,
+                             workers=2)
+    assert first['summary'] == second['summary']
+
+
+def test_staging_metrics_with_pump():
+    result = run_monte_carlo(distributions=DISTRIBUTIONS, n=200, seed=2, pump=BORETS_CATALOG[6])
+    assert {'stages', 'motor_power_kw'} <= set(result['summary'])
+
+
+def test_sample_inputs_rejects_unknown():
+    rng = np.random.default_rng(0)
+    with pytest.raises(ValueError):
+        sample_inputs({}, {'noSuchInput': {'std': 1.0}}, 10, rng)
+    with pytest.raises(ValueError):
+        sample_inputs({}, {'waterCut': {'type': 'weibull'}}, 10, rng)
+
+
+def test_summarize_all_nan():
+    summary = summarize({'tdh_m': np.full(4, np.nan), 'pip_atm': np.array([1.0, np.nan])})
+    assert np.isnan(summary['tdh_m']['P50']) and np.isnan(summary['tdh_m']['iqr'])
+    assert summary['tdh_m']['failed_fraction'] == 1.0
+    assert summary['pip_atm']['failed_fraction'] == 0.5
+    assert summary['pip_atm']['iqr'] == 0.0
@@ -0,0 +1,86 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from core.engine import MOTOR_EFFICIENCY, MOTOR_POWER_FACTOR, MOTOR_POWER_MARGIN, MOTOR_POWERS_KW
+from core.motor import (CABLE_COST_PER_MM2_KM, CABLE_RESISTANCE_20_OHM_KM, CABLE_SECTIONS_MM2,
+                        ENERGY_PRICE_PER_KWH, HOURS_PER_YEAR, MAX_VOLTAGE_DROP, MOTOR_COST_PER_KW,
+                        SERVICE_YEARS, SUPPLY_VOLTAGES_V, VOLTAGE_COST_PER_KV, best_combinations,
+                        size_motor_cable)
+
+
+def brute_force(shaft_kw, length_m, temp_c):
+    """Every feasible combination of one well by a plain loop, cheapest first."""
+    rows = []
+    for (r20, section), voltage, motor in itertools.product(
+            zip(CABLE_RESISTANCE_20_OHM_KM.values(), CABLE_SECTIONS_MM2), SUPPLY_VOLTAGES_V,
+            MOTOR_POWERS_KW):
+        motor_input = shaft_kw / MOTOR_EFFICIENCY
+        current = motor_input * 1000.0 / (math.sqrt(3) * voltage * MOTOR_POWER_FACTOR)
+        resistance = r20 * (1.0 + 0.004 * (temp_c - 20.0)) * length_m / 1000.0
+        input_kw = motor_input + 3 * current ** 2 * resistance / 1000.0
+        drop = math.sqrt(3) * current * resistance
+        if motor < input_kw * MOTOR_POWER_MARGIN or drop > MAX_VOLTAGE_DROP * voltage:
+            continue
+        capex = (MOTOR_COST_PER_KW * motor + CABLE_COST_PER_MM2_KM * section * length_m / 1000.0
+                 + VOLTAGE_COST_PER_KV * voltage / 1000.0)
+        cost = capex + input_kw * HOURS_PER_YEAR * SERVICE_YEARS * ENERGY_PRICE_PER_KWH
+        rows.append((cost, section, voltage, float(motor), current, drop, input_kw))
+    return sorted(rows, key=lambda row: row[0])
+
+
+@pytest.mark.parametrize("shaft_kw, length_m, temp_c", [
+    (40.0, 2500.0, 90.0),
+    (120.0, 3000.0, 110.0),
+    (250.0, 1500.0, 60.0),
+])
+def test_best_combinations_match_brute_force(shaft_kw, length_m, temp_c):
+    expected = brute_force(shaft_kw, length_m, temp_c)
+    rows = best_combinations(size_motor_cable(shaft_kw, length_m, temp_c), limit=None)
+    assert len(rows) == len(expected)
+    for row, (cost, section, voltage, motor, current, drop, input_kw) in zip(rows, expected):
+        assert row['lifecycle_cost'] == pytest.approx(cost)
+        assert (row['section_mm2'], row['voltage_v'], row['motor_kw']) == (section, voltage, motor)
+        assert row['current_a'] == pytest.approx(current)
+        assert row['voltage_drop_v'] == pytest.approx(drop)
+        assert row['input_kw'] == pytest.approx(input_kw)
+
+
+def test_batch_matches_single_wells():
+    shaft = np.array([30.0, 80.0, 200.0])
+    length = np.array([1800.0, 2600.0, 3200.0])
+    temp = np.array([70.0, 95.0, 120.0])
+    sizing = size_motor_cable(shaft, length, temp)
+    assert sizing['lifecycle_cost'].shape == (3, len(CABLE_SECTIONS_MM2), len(SUPPLY_VOLTAGES_V),
+                                              len(MOTOR_POWERS_KW))
+    for i in range(3):
+        single = size_motor_cable(shaft[i], length[i], temp[i])
+        assert best_combinations(sizing, i) == best_combinations(single)
+
+
+def test_motor_voltages_restrict_pairs():
+    sizing = size_motor_cable(50.0, 2000.0, motors_kw=[75.0, 75.0],
+                              motor_voltages_v=[1000.0, 2000.0], motor_costs=[9000.0, 12000.0])
+    rows = best_combinations(sizing, limit=None)
+    assert rows
+    for row in rows:
+        motor_cost = {1000.0: 9000.0, 2000.0: 12000.0}[row['voltage_v']]
+        expected = (motor_cost + CABLE_COST_PER_MM2_KM * row['section_mm2'] * 2.0
+                    + VOLTAGE_COST_PER_KV * row['voltage_v'] / 1000.0)
+        assert row['capex'] == pytest.approx(expected)
+
+
+def test_no_feasible_combination():
+    sizing = size_motor_cable(1000.0, 3000.0)
+    assert not sizing['feasible'].any()
+    assert best_combinations(sizing) == []
+
+
+def test_limit():
+    sizing = size_motor_cable(60.0, 2500.0, 90.0)
+    rows = best_combinations(sizing, limit=3)
+    assert len(rows) == 3
+    costs = [row['lifecycle_cost'] for row in rows]
+    assert costs == sorted(costs)
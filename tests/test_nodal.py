@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from core.catalog import BORETS_CATALOG
+from core.engine import prepare_inputs
+from core.ipr import build_ipr
+from core.nodal import find_operating_points, vlp_curve
+
+PUMP = BORETS_CATALOG[4]
+DEPTHS = np.array([2630.0, 2000.0, 1500.0])
+
+
+def test_operating_point_lies_on_both_curves():
+    result = find_operating_points({'pumpDepth': DEPTHS}, pump=PUMP, stages=300)
+    assert result['has_operating_point'].all()
+    p = prepare_inputs({'pumpDepth': DEPTHS})
+    pump = {key: np.full(DEPTHS.size, float(PUMP[key]))
+            for key in ('nominal_q_m3', 'head_per_stage_m')}
+    q = result['q_op']
+    inflow = build_ipr(p).pwf(q)
+    np.testing.assert_allclose(inflow, result['p_op'])
+    np.testing.assert_allclose(inflow, vlp_curve(q, p, pump, np.full(DEPTHS.size, 300.0)),
+                               atol=1e-6)
+
+
+def test_batch_matches_single_wells():
+    batch = find_operating_points({'pumpDepth': DEPTHS}, pump=PUMP, stages=300)
+    for i, depth in enumerate(DEPTHS):
+        single = find_operating_points({'pumpDepth': depth}, pump=PUMP, stages=300)
+        assert single['q_op'][0] == pytest.approx(batch['q_op'][i], rel=1e-9)
+
+
+def test_shallower_pump_produces_more():
+    q = find_operating_points({'pumpDepth': DEPTHS}, pump=PUMP, stages=300)['q_op']
+    assert np.all(np.diff(q) > 0)
+
+
+def test_pump_needs_stages():
+    with pytest.raises(ValueError):
+        find_operating_points({}, pump=PUMP)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from core.pareto import non_dominated, non_dominated_sort
+
+
+def brute_force_front(scores):
+    """Rows no other row dominates; of identical rows the first one."""
+    front = []
+    for i, row in enumerate(scores):
+        dominated = np.any(np.all(scores <= row, axis=1) & np.any(scores < row, axis=1))
+        duplicate = np.any(np.all(scores[:i] == row, axis=1))
+        if not dominated and not duplicate:
+            front.append(i)
+    return np.array(front, dtype=int)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("objectives", [2, 3, 4])
+def test_non_dominated_matches_brute_force(seed, objectives):
+    # Small integer scores give plenty of ties and duplicate rows.
+    scores = np.random.default_rng(seed).integers(0, 6, size=(300, objectives)).astype(float)
+    np.testing.assert_array_equal(non_dominated(scores), brute_force_front(scores))
+
+
+def test_non_dominated_continuous_scores():
+    scores = np.random.default_rng(11).normal(size=(1000, 3))
+    np.testing.assert_array_equal(non_dominated(scores), brute_force_front(scores))
+
+
+def test_non_dominated_sort_peels_fronts():
+    scores = np.random.default_rng(3).integers(0, 5, size=(200, 3)).astype(float)
+    rank = non_dominated_sort(scores)
+    assert rank.min() == 0
+    left = np.arange(scores.shape[0])
+    for front in range(rank.max() + 1):
+        expected = left[brute_force_front(scores[left])]
+        assert set(expected) <= set(np.flatnonzero(rank == front))
+        # Every row of this front is a front row or one of its duplicates.
+        members = np.flatnonzero(rank == front)
+        same = (scores[members][:, None, :] == scores[expected][None, :, :]).all(axis=2).any(axis=1)
+        assert same.all()
+        left = left[rank[left] != front]
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+import core.portfolio as portfolio
+from core.forecast import run_forecast
+from core.portfolio import PortfolioForecaster
+
+N_WELLS = 40
+
+
+@pytest.fixture(scope='module')
+def field():
+    rng = np.random.default_rng(0)
+    return {
+        'inputs': {'targetFlowRate': rng.uniform(40.0, 200.0, N_WELLS),
+                   'waterCut': rng.uniform(10.0, 90.0, N_WELLS)},
+        'decline_rate': rng.uniform(0.01, 0.05, N_WELLS),
+    }
+
+
+@pytest.fixture(scope='module')
+def serial(field):
+    return run_forecast(field['inputs'], 'exponential', field['decline_rate'],
+                        forecast_period=36)
+
+
+def check_matches(result, serial):
+    for key in ('flow_rate', 'tdh_m', 'stages', 'motor_power_kw'):
+        np.testing.assert_allclose(result[key], serial[key], rtol=1e-12)
+    for key in ('pump_index', 'status', 'month_of_pump_change'):
+        np.testing.assert_array_equal(result[key], serial[key])
+
+
+def test_in_process_matches_run_forecast(field, serial):
+    with PortfolioForecaster(workers=1) as forecaster:
+        with forecaster.run(field['inputs'], decline_rate=field['decline_rate'],
+                            forecast_period=36, chunk_size=7) as result:
+            check_matches(result, serial)
+            np.testing.assert_array_equal(result.pump_name(result['pump_index']),
+                                          serial['pump_name'])
+            summary = result.summary()
+            np.testing.assert_allclose(summary['field_rate'], serial['flow_rate'].sum(axis=0))
+            assert summary['pump_wells'].sum(axis=0).tolist() == \
+                (serial['pump_index'] >= 0).sum(axis=0).tolist()
+
+
+def test_pool_matches_serial(field, serial, monkeypatch):
+    monkeypatch.setattr(portfolio, 'PARALLEL_MIN_WELLS', 0)
+    with PortfolioForecaster(workers=2) as forecaster:
+        for _ in range(2):  # the pool and the shared catalog are reused
+            with forecaster.run(field['inputs'], decline_rate=field['decline_rate'],
+                                forecast_period=36) as result:
+                check_matches(result, serial)
+
+
+def test_small_field_stays_in_process(field):
+    with PortfolioForecaster(workers=4) as forecaster:
+        forecaster.run(field['inputs'], forecast_period=12).release()
+        assert forecaster._pool is None
+
+
+def test_selected_pump_per_well(field):
+    names = np.array(['ЭЦНД 5А-100'] * N_WELLS, dtype=object)
+    expected = run_forecast(field['inputs'], forecast_period=12, selected_pump=names)
+    with PortfolioForecaster(workers=1) as forecaster:
+        with forecaster.run(field['inputs'], forecast_period=12, selected_pump=names) as result:
+            np.testing.assert_array_equal(result['status'], expected['status'])
@@ -0,0 +1,44 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('openpyxl')
+
+from core.cavitation import format_npsh_curve, parse_npsh_curve  # noqa: E402
+from pump_manager import PumpManager  # noqa: E402
+
+ROWS = [
+    {'model': "ЭЦН-80", 'nominal_q_m3': 80, 'min_q_m3': 40, 'max_q_m3': 110,
+     'nominal_head_m': 1500, 'min_head_m': 900, 'max_head_m': 1600, 'nominal_power_kw': 45,
+     'efficiency': 0.55, 'stages': 250, 'npsh_req': 3.0, 'npsh_curve': "40:2,5; 110:4,5; 80:3"},
+    {'model': "ЭЦН-125", 'nominal_q_m3': 125, 'min_q_m3': 60, 'max_q_m3': 160,
+     'nominal_head_m': 1400, 'min_head_m': 800, 'max_head_m': 1500, 'nominal_power_kw': 63,
+     'efficiency': 62, 'stages': 230},
+]
+
+
+def test_format_parses_back():
+    curve = [(110.0, 4.5), (40.0, 2.5), (80.0, 3.0)]
+    text = format_npsh_curve(curve)
+    assert text == "40:2.5; 80:3; 110:4.5"
+    q, npsh = parse_npsh_curve(text)
+    assert list(zip(q, npsh)) == sorted(curve)
+
+
+def test_excel_round_trip_keeps_npsh_curve(tmp_path):
+    source = tmp_path / "pumps.xlsx"
+    pd.DataFrame(ROWS).to_excel(source, index=False, engine='openpyxl')
+    (tmp_path / "first").mkdir()
+    (tmp_path / "second").mkdir()
+    manager = PumpManager(tmp_path / "first")
+    assert manager.import_from_excel(str(source))['imported'] == 2
+    assert manager.pumps[0]['npsh_curve'] == [(40.0, 2.5), (80.0, 3.0), (110.0, 4.5)]
+    assert 'npsh_curve' not in manager.pumps[1]
+
+    exported = tmp_path / "exported.xlsx"
+    assert manager.export_to_excel(str(exported))
+    again = PumpManager(tmp_path / "second")
+    result = again.import_from_excel(str(exported))
+    assert result['imported'] == 2, result['errors']
+    for before, after in zip(manager.pumps, again.pumps):
+        for key in ('model', 'nominal_q_m3', 'efficiency', 'stages', 'npsh_req', 'npsh_curve'):
+            assert after.get(key) == before.get(key)
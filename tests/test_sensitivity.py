@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from core.catalog import BORETS_CATALOG
+from core.engine import DEFAULT_INPUTS, calculate_staging, run_design
+from core.selection import evaluate_candidates
+from core.sensitivity import SENSITIVITY_INPUTS, SENSITIVITY_METRICS, run_sensitivity
+
+
+def one_run(inputs, pump):
+    design = run_design(inputs)
+    values = {key: float(design[key]) for key in SENSITIVITY_METRICS if key in design}
+    values['shaft_power_kw'] = float(calculate_staging(design, inputs, pump)['shaft_power_kw'])
+    if not design['inflow_feasible']:
+        values = {key: np.nan for key in values}
+    return values
+
+
+def test_matches_one_run_per_perturbation():
+    result = run_sensitivity(delta=0.2)
+    pump = BORETS_CATALOG[int(evaluate_candidates(None)['recommended'])]
+    assert result['pump'] == pump['name']
+    base = one_run(dict(DEFAULT_INPUTS), pump)
+    for metric in SENSITIVITY_METRICS:
+        assert result['base'][metric] == pytest.approx(base[metric])
+        rows = result['tornado'][metric]
+        assert [row['input'] for row in rows if np.isfinite(row['swing'])] == [
+            row['input'] for row in sorted((row for row in rows if np.isfinite(row['swing'])),
+                                           key=lambda row: -row['swing'])]
+        for row in rows:
+            value = DEFAULT_INPUTS[row['input']]
+            low = one_run(dict(DEFAULT_INPUTS, **{row['input']: row['low_input']}), pump)
+            high = one_run(dict(DEFAULT_INPUTS, **{row['input']: row['high_input']}), pump)
+            assert row['low_input'] == pytest.approx(max(value * 0.8, 0.0))
+            assert row['low'] == pytest.approx(low[metric], nan_ok=True)
+            assert row['high'] == pytest.approx(high[metric], nan_ok=True)
+    assert {row['input'] for row in result['tornado']['tdh_m']} == set(SENSITIVITY_INPUTS)
+
+
+def test_bounds_and_absolute_steps():
+    result = run_sensitivity({'waterCut': 95.0}, inputs=['waterCut', 'tubingHeadPressure'],
+                             deltas={'waterCut': 10.0, 'tubingHeadPressure': 5.0})
+    rows = {row['input']: row for row in result['tornado']['tdh_m']}
+    assert (rows['waterCut']['low_input'], rows['waterCut']['high_input']) == (85.0, 100.0)
+    assert (rows['tubingHeadPressure']['low_input'], rows['tubingHeadPressure']['high_input']) == (20.0, 30.0)
+    # The design TDH (as in the JS engine) is the tubing drop, without the wellhead pressure.
+    assert rows['tubingHeadPressure']['swing'] == 0.0
+    assert result['tornado']['tdh_m'][-1]['input'] == 'tubingHeadPressure'
+
+
+def test_infeasible_rows_are_nan():
+    result = run_sensitivity({'targetFlowRate': 150.0}, inputs=['reservoirPressure'], delta=0.5)
+    row = result['tornado']['pip_atm'][0]
+    assert np.isnan(row['low']) and np.isfinite(row['high'])
+    assert np.isnan(row['swing'])
+
+
+def test_fixed_pump():
+    pump = BORETS_CATALOG[9]
+    result = run_sensitivity(inputs=['gasOilRatio'], pump=pump)
+    assert result['pump'] == pump['name']
+    expected = one_run(dict(DEFAULT_INPUTS), pump)['shaft_power_kw']
+    assert result['base']['shaft_power_kw'] == pytest.approx(expected)
+
+
+def test_unknown_input():
+    with pytest.raises(ValueError):
+        run_sensitivity(inputs=['porosity'])
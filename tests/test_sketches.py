@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from core.montecarlo import run_monte_carlo
+from core.sketches import Histogram, QuantileSketch, RunningStats, StreamingSummary
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).lognormal(3.0, 0.7, 200_000)
+
+
+def test_running_stats_merge_matches_numpy(values):
+    total = RunningStats()
+    for chunk in np.array_split(values, 7):
+        part = RunningStats()
+        part.update(chunk)
+        total.merge(part)
+    assert total.count == values.size
+    assert total.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert total.std == pytest.approx(values.std(), rel=1e-9)
+    assert (total.min, total.max) == (values.min(), values.max())
+
+
+def test_quantile_sketch_rank_error(values):
+    sketches = [QuantileSketch(k=512, seed=i) for i in range(4)]
+    for sketch, chunk in zip(sketches, np.array_split(values, 4)):
+        for block in np.array_split(chunk, 10):
+            sketch.update(block)
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    assert merged.count == values.size
+    assert sum(level.size for level in merged.levels) < values.size / 20
+    q = np.array([0.01, 0.1, 0.5, 0.9, 0.99])
+    ranks = np.searchsorted(np.sort(values), merged.quantile(q)) / values.size
+    np.testing.assert_allclose(ranks, q, atol=0.01)
+
+
+def test_empty_sketch_is_nan():
+    assert np.isnan(QuantileSketch().quantile([0.5])).all()
+
+
+def test_histogram_merge_and_overflow():
+    first, second = Histogram(0.0, 10.0, 10), Histogram(0.0, 10.0, 10)
+    first.update([-1.0, 0.5, 5.5])
+    second.update([5.5, 9.5, 11.0])
+    first.merge(second)
+    assert first.counts.tolist() == [1, 0, 0, 0, 0, 2, 0, 0, 0, 1]
+    assert (first.underflow, first.overflow) == (1, 1)
+    with pytest.raises(ValueError):
+        first.merge(Histogram(0.0, 5.0, 10))
+
+
+def test_streaming_summary_counts_failures():
+    summary = StreamingSummary(seed=1)
+    summary.update({'tdh_m': np.array([1.0, np.nan, 3.0])})
+    other = StreamingSummary(seed=2)
+    other.update({'tdh_m': np.array([np.nan, 5.0])})
+    summary.merge(other)
+    row = summary.summary()['tdh_m']
+    assert row['failed_fraction'] == pytest.approx(0.4)
+    assert row['mean'] == pytest.approx(3.0)
+    assert (row['min'], row['max']) == (1.0, 5.0)
+
+
+def test_streaming_monte_carlo_close_to_exact():
+    distributions = {'waterCut': {'type': 'uniform', 'low': 40.0, 'high': 60.0},
+                     'reservoirPressure': {'type': 'normal', 'std': 5.0}}
+    exact = run_monte_carlo(distributions=distributions, n=20_000, seed=4, chunk_size=5000)
+    streaming = run_monte_carlo(distributions=distributions, n=20_000, seed=4, chunk_size=5000,
+                                streaming=True, batch_size=1000)
+    for key in ('P10', 'P50', 'P90', 'mean'):
+        assert streaming['summary']['tdh_m'][key] == pytest.approx(
+            exact['summary']['tdh_m'][key], rel=0.01)
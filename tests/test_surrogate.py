@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from core.engine import prepare_inputs, run_design
+from core.forecast import run_forecast
+from core.ipr import build_ipr
+from core.montecarlo import run_monte_carlo, sample_inputs
+from core.surrogate import NEAR_AOF_RATIO, PolynomialSurrogate, fit_surrogate
+
+DISTRIBUTIONS = {
+    'targetFlowRate': {'type': 'uniform', 'low': 30.0, 'high': 60.0},
+    'waterCut': {'type': 'uniform', 'low': 20.0, 'high': 80.0},
+    'gasOilRatio': {'type': 'uniform', 'low': 150.0, 'high': 300.0},
+}
+
+
+@pytest.fixture(scope='module')
+def surrogate():
+    training = sample_inputs({}, DISTRIBUTIONS, 2000, np.random.default_rng(0))
+    return fit_surrogate(training, rng=np.random.default_rng(1))
+
+
+@pytest.fixture(scope='module')
+def batch():
+    return sample_inputs({}, DISTRIBUTIONS, 3000, np.random.default_rng(2))
+
+
+def test_design_close_to_run_design(surrogate, batch):
+    design, report = surrogate.design(batch, rng=np.random.default_rng(3))
+    exact = run_design(batch)
+    assert not report['fallback']
+    feasible = exact['inflow_feasible']
+    np.testing.assert_array_equal(design['inflow_feasible'], feasible)
+    np.testing.assert_allclose(design['pip_atm'], exact['pip_atm'])
+    error = np.abs(design['pressure_drop'] - exact['pressure_drop'])[feasible]
+    assert error.max() < 2.0
+
+
+def test_design_returns_run_design_keys(surrogate, batch):
+    design, _ = surrogate.design(batch, rng=np.random.default_rng(3))
+    exact = run_design(batch)
+    assert design.keys() == exact.keys()
+    for key in ('void_fraction', 'flow_pattern', 'liquid_holdup', 'mixture_density'):
+        np.testing.assert_allclose(design[key], exact[key])
+
+
+def test_fallback_reproduces_run_design(surrogate, batch):
+    design, report = surrogate.design(batch, rng=np.random.default_rng(3), threshold=0.0)
+    assert report['fallback']
+    exact = run_design(batch)
+    for key in ('pip_atm', 'pressure_drop', 'tdh_m'):
+        np.testing.assert_array_equal(design[key], exact[key])
+
+
+def test_outside_domain_uses_run_design(surrogate):
+    inputs = {'targetFlowRate': 60.0, 'waterCut': 50.0, 'gasOilRatio': 1000.0}
+    assert not surrogate.predict(inputs)['in_domain']
+    design, _ = surrogate.design(inputs, rng=np.random.default_rng(0))
+    assert float(design['tdh_m']) == float(run_design(inputs)['tdh_m'])
+
+
+def test_save_load_round_trip(surrogate, batch, tmp_path):
+    path = tmp_path / "surrogate.npz"
+    surrogate.save(path)
+    loaded = PolynomialSurrogate.load(path)
+    np.testing.assert_array_equal(loaded.predict(batch)['pressure_drop'],
+                                  surrogate.predict(batch)['pressure_drop'])
+
+
+def test_fit_needs_feasible_rows():
+    with pytest.raises(ValueError):
+        fit_surrogate({'targetFlowRate': np.full(100, 1e4)})
+
+
+def test_rates_near_open_flow_use_run_design(surrogate):
+    aof = float(build_ipr(prepare_inputs({})).aof)
+    rates = np.array([45.0, NEAR_AOF_RATIO * aof, 0.99 * aof])
+    inputs = {'targetFlowRate': rates, 'waterCut': 50.0, 'gasOilRatio': 200.0}
+    assert surrogate.predict(inputs)['in_domain'].tolist() == [True, False, False]
+    design, report = surrogate.design(inputs, rng=np.random.default_rng(0))
+    assert report['engine_rows'] == 2
+    np.testing.assert_array_equal(design['pressure_drop'][1:], run_design(inputs)['pressure_drop'][1:])
+
+
+def test_monte_carlo_on_default_well_keeps_surrogate():
+    distributions = {
+        'reservoirPressure': {'type': 'normal', 'mean': 89.6, 'std': 5.0},
+        'productivityIndex': {'type': 'normal', 'mean': 2.238, 'std': 0.3},
+        'gasOilRatio': {'type': 'normal', 'mean': 251.7, 'std': 30.0},
+        'waterCut': {'type': 'uniform', 'low': 40.0, 'high': 60.0},
+    }
+    report = run_monte_carlo(None, distributions, n=20000, seed=1, surrogate=True)['surrogate']
+    assert not report['fallback']
+    assert report['max_error'] < 2.0
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'decline_rate': 0.05, 'forecast_period': 120},
+    {'inputs': {'targetFlowRate': 150.0}},
+])
+def test_forecast_keeps_surrogate(kwargs):
+    report = run_forecast(surrogate=True, **kwargs)['surrogate']
+    assert not report['fallback']
+    assert report['max_error'] < 2.0
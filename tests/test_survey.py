@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+import pytest
+
+from core.survey import Survey
+
+LENGTH = 600.0
+RADIUS = LENGTH / (math.pi / 2.0)
+
+
+@pytest.fixture
+def build_up():
+    """Quarter circle from vertical to horizontal, heading east."""
+    return Survey([0.0, LENGTH], [0.0, 90.0], 90.0)
+
+
+def test_station_positions_on_arc(build_up):
+    north, east, tvd = build_up.position[-1]
+    assert tvd == pytest.approx(RADIUS, rel=1e-12)
+    assert east == pytest.approx(RADIUS, rel=1e-12)
+    assert north == pytest.approx(0.0, abs=1e-9)
+
+
+def test_points_inside_arc(build_up):
+    md = np.linspace(0.0, LENGTH, 13)
+    angle = md / RADIUS
+    position, _ = build_up.locate(md)
+    np.testing.assert_allclose(position[:, 2], RADIUS * np.sin(angle), atol=1e-9)
+    np.testing.assert_allclose(position[:, 1], RADIUS * (1.0 - np.cos(angle)), atol=1e-9)
+    np.testing.assert_allclose(build_up.inclination_at(md), np.degrees(angle), atol=1e-9)
+
+
+def test_beyond_last_station_follows_tangent(build_up):
+    position, tangent = build_up.locate(LENGTH + 100.0)
+    assert position[2] == pytest.approx(RADIUS)
+    assert position[1] == pytest.approx(RADIUS + 100.0)
+    np.testing.assert_allclose(tangent, [0.0, 1.0, 0.0], atol=1e-12)
+
+
+def test_vertical_and_slant_wells():
+    vertical = Survey([1000.0], [0.0])
+    np.testing.assert_allclose(vertical.tvd_at([0.0, 500.0, 2500.0]), [0.0, 500.0, 2500.0])
+    slant = Survey([0.0, 1000.0, 2000.0], [30.0, 30.0, 30.0])
+    np.testing.assert_allclose(slant.tvd_at([1500.0, 3000.0]),
+                               np.array([1500.0, 3000.0]) * math.cos(math.radians(30.0)))
+
+
+def test_segment_geometry_adds_up(build_up):
+    geometry = build_up.segment_geometry(np.array(LENGTH), 40)
+    assert geometry['length'].sum() == pytest.approx(LENGTH)
+    assert geometry['height'].sum() == pytest.approx(RADIUS)
+
+
+@pytest.mark.parametrize("md", [[], [100.0, 100.0], [-10.0, 100.0], [[0.0, 100.0]]])
+def test_invalid_stations(md):
+    with pytest.raises(ValueError):
+        Survey(md, 0.0)
@@ -0,0 +1,96 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import core.tapered as tapered
+from core.catalog import BORETS_CATALOG
+from core.engine import G, PA_PER_ATM, prepare_inputs, run_design
+from core.tapered import design_tapered
+
+GASSY = {'gasOilRatio': 400, 'separatorEfficiency': 0, 'targetFlowRate': 100}
+
+
+def enumerate_paths(power, max_sections, penalty):
+    """Cheapest pump sequence over the steps by listing every one of them."""
+    pumps, steps = power.shape
+    paths = np.array(list(itertools.product(range(pumps), repeat=steps)))
+    sections = 1 + (paths[:, 1:] != paths[:, :-1]).sum(axis=1)
+    cost = power[paths, np.arange(steps)].sum(axis=1) + penalty * (sections - 1)
+    cost[sections > max_sections] = np.inf
+    return cost.min()
+
+
+def step_powers(inputs, steps):
+    """Per-step power matrix of the catalog on the grid ``design_tapered`` builds."""
+    p = {key: value.reshape(()) for key, value in prepare_inputs(inputs).items()}
+    design = run_design(p)
+    pip = float(design['pip_atm'])
+    discharge = pip + float(design['tdh_m']) * p['liquidDensity'] * G / PA_PER_ATM
+    pressure = np.linspace(pip, discharge, steps + 1)
+    return tapered._step_costs(p, tapered.catalog_arrays(BORETS_CATALOG[4:]), pressure,
+                               design['temp_bottom_c'])['power_kw']
+
+
+def total_cost(result, penalty):
+    return result['total_power_kw'] + penalty * (len(result['sections']) - 1)
+
+
+@pytest.mark.parametrize("inputs", [None, GASSY])
+@pytest.mark.parametrize("max_sections", [1, 2, 3])
+def test_matches_enumeration_on_wells(inputs, max_sections):
+    steps = 6
+    result = design_tapered(inputs, BORETS_CATALOG[4:], max_sections=max_sections, steps=steps)
+    expected = enumerate_paths(step_powers(inputs, steps), max_sections, 0.0)
+    assert result['total_power_kw'] == pytest.approx(expected)
+    assert len(result['sections']) <= max_sections
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_matches_enumeration_on_random_costs(monkeypatch, seed):
+    rng = np.random.default_rng(seed)
+    pumps, steps = 4, 7
+    power = rng.uniform(1.0, 10.0, (pumps, steps))
+    power[rng.random(power.shape) < 0.2] = np.inf
+    penalty = [0.0, 1.5][seed % 2]
+
+    def fake_costs(p, arrays, pressure, temp_c):
+        mid = 0.5 * (pressure[:-1] + pressure[1:])
+        return {'pressure': mid, 'rate': np.full(steps, 80.0), 'void_fraction': np.zeros(steps),
+                'stages': np.ones((pumps, steps)), 'power_kw': power}
+
+    monkeypatch.setattr(tapered, '_step_costs', fake_costs)
+    for max_sections in (1, 2, 3):
+        result = design_tapered(None, BORETS_CATALOG[:pumps], max_sections=max_sections,
+                                steps=steps, switch_penalty_kw=penalty)
+        expected = enumerate_paths(power, max_sections, penalty)
+        if np.isinf(expected):
+            assert result['sections'] == [] and np.isinf(result['total_power_kw'])
+            continue
+        assert total_cost(result, penalty) == pytest.approx(expected)
+        path = result['profile']['pump_index']
+        assert power[path, np.arange(steps)].sum() == pytest.approx(result['total_power_kw'])
+        assert [s['pump_index'] for s in result['sections']] == [
+            int(k) for k, _ in itertools.groupby(path)]
+
+
+def test_sections_cover_the_rise():
+    result = design_tapered(None, max_sections=3, steps=60)
+    sections = result['sections']
+    assert sections
+    for lower, upper in zip(sections, sections[1:]):
+        assert lower['outlet_pressure_atm'] == upper['inlet_pressure_atm']
+    assert result['total_stages'] == sum(section['stages'] for section in sections)
+    single = design_tapered(None, max_sections=1, steps=60)
+    assert result['total_power_kw'] <= single['total_power_kw'] + 1e-9
+
+
+def test_no_pump_covers_the_rate():
+    result = design_tapered({'targetFlowRate': 10}, BORETS_CATALOG[5:], steps=20)
+    assert result['sections'] == [] and np.isinf(result['total_power_kw'])
+    assert (result['profile']['pump_index'] == -1).all()
+
+
+def test_batch_rejected():
+    with pytest.raises(ValueError):
+        design_tapered({'targetFlowRate': [50, 80]})
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from core.engine import intake_temperature, prepare_inputs, run_design
+from core.temperature import (TemperatureProfile, relaxation_length, temperature_profile)
+
+
+def integrate_ramey(profile, tvd_top, steps=20000):
+    """March dT/dh = -(T - T_geo) / A up from the inflow depth with RK4."""
+    a = float(profile.relaxation_m)
+    bottom = float(profile.bottom_tvd)
+    h_step = (bottom - tvd_top) / steps
+
+    def slope(h, t):
+        return -(t - profile.geothermal(bottom - h)) / a
+
+    t, h = float(profile.geothermal(bottom)), 0.0
+    for _ in range(steps):
+        k1 = slope(h, t)
+        k2 = slope(h + h_step / 2, t + h_step / 2 * k1)
+        k3 = slope(h + h_step / 2, t + h_step / 2 * k2)
+        k4 = slope(h + h_step, t + h_step * k3)
+        t += h_step / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        h += h_step
+    return t
+
+
+@pytest.mark.parametrize("rate", [20.0, 80.0, 300.0])
+def test_matches_integrated_heat_balance(rate):
+    p = prepare_inputs({'targetFlowRate': rate})
+    profile = temperature_profile(p, bottom_tvd=np.asarray(2800.0))
+    for top in (2500.0, 1200.0, 0.0):
+        assert profile.at(top) == pytest.approx(integrate_ramey(profile, top), abs=1e-6)
+
+
+def test_limits():
+    p = prepare_inputs(None)
+    profile = temperature_profile(p, bottom_tvd=np.asarray(2800.0))
+    depths = np.array([0.0, 1000.0, 2800.0, 3000.0])
+    flowing = profile.at(depths)
+    geothermal = profile.geothermal(depths)
+    assert flowing[2] == pytest.approx(geothermal[2]) and flowing[3] == pytest.approx(geothermal[3])
+    assert np.all(flowing[:2] > geothermal[:2])
+    assert np.all(flowing[:3] <= profile.geothermal(2800.0) + 1e-12)
+    assert np.all(np.diff(flowing[:3]) > 0)
+
+
+def test_geothermal_model_and_no_flow():
+    p = prepare_inputs(None)
+    depths = np.linspace(0.0, 2630.0, 7)
+    expected = p['surfaceTemperature'] + p['tempGradient'] / 100.0 * depths
+    np.testing.assert_allclose(temperature_profile(p, model='geothermal').at(depths), expected)
+    np.testing.assert_allclose(temperature_profile(p, q_m3=np.asarray(0.0)).at(depths), expected)
+    with pytest.raises(ValueError):
+        temperature_profile(p, model='steady')
+
+
+def test_relaxation_length_is_linear_in_rate():
+    p = prepare_inputs(None)
+    lengths = relaxation_length(p, np.array([10.0, 20.0, 40.0]))
+    np.testing.assert_allclose(lengths / lengths[0], [1.0, 2.0, 4.0])
+    assert relaxation_length(p, np.asarray(-5.0)) == 0.0
+
+
+def test_expand_broadcasts_over_depth_grids():
+    p = prepare_inputs({'targetFlowRate': [40.0, 90.0, 150.0]})
+    profile = temperature_profile(p).expand()
+    grid = np.linspace(0.0, 2630.0, 5)
+    values = profile.at(grid)
+    assert values.shape == (3, 5)
+    for w, rate in enumerate((40.0, 90.0, 150.0)):
+        single = temperature_profile(prepare_inputs({'targetFlowRate': rate}))
+        np.testing.assert_allclose(values[w], single.at(grid))
+
+
+def test_intake_temperature():
+    at_pump = prepare_inputs(None)
+    np.testing.assert_allclose(intake_temperature(at_pump, at_pump['targetFlowRate']),
+                               at_pump['surfaceTemperature'] + at_pump['tempGradient'] / 100.0
+                               * at_pump['pumpDepth'])
+    deeper = prepare_inputs({'perforationDepth': 2900.0})
+    expected = temperature_profile(deeper, bottom_tvd=np.asarray(2900.0)).at(2630.0)
+    assert intake_temperature(deeper, deeper['targetFlowRate']) == pytest.approx(expected)
+    assert run_design(deeper)['temp_bottom_c'] == pytest.approx(expected)
+
+
+def test_profile_is_frozen():
+    profile = TemperatureProfile(*(np.asarray(v) for v in (20.0, 0.03, 2000.0, 500.0)))
+    with pytest.raises(AttributeError):
+        profile.relaxation_m = np.asarray(0.0)
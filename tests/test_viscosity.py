@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from core.catalog import catalog_arrays
+from core.engine import prepare_inputs
+from core.viscosity import (catalog_table, correction_factors, correction_parameter,
+                            head_factor, kinematic_viscosity_cst, viscosity_corrections)
+
+
+@pytest.fixture(scope='module')
+def arrays():
+    return catalog_arrays()
+
+
+def direct(nu, arrays):
+    b = correction_parameter(np.asarray(nu)[..., None], arrays['nominal_q_m3'],
+                             arrays['head_per_stage_m'])
+    return correction_factors(b)
+
+
+def test_table_matches_direct_formula(arrays):
+    nu = np.random.default_rng(0).lognormal(3.0, 2.0, 300)
+    factors = catalog_table(arrays).factors(nu)
+    c_q, c_eff = direct(nu, arrays)
+    assert factors['c_q'].shape == (nu.size, arrays['nominal_q_m3'].size)
+    np.testing.assert_allclose(factors['c_q'], c_q, atol=1e-4)
+    np.testing.assert_allclose(factors['c_eff'], c_eff, atol=1e-4)
+
+
+def test_water_is_barely_corrected(arrays):
+    factors = viscosity_corrections(prepare_inputs({'viscosity': 1.0, 'liquidDensity': 1000.0}),
+                                    arrays)
+    for key in ('c_q', 'c_eff', 'c_h'):
+        assert np.all(factors[key] <= 1.0)
+    np.testing.assert_allclose(factors['c_q'], 1.0, atol=5e-3)
+    np.testing.assert_allclose(factors['c_h'], 1.0, atol=5e-3)
+    # B <= 1 gives no correction at all.
+    assert correction_factors(np.array(0.5)) == (1.0, 1.0)
+
+
+def test_factors_fall_with_viscosity(arrays):
+    nu = np.array([50.0, 200.0, 1000.0, 5000.0])
+    factors = catalog_table(arrays).factors(nu)
+    assert np.all(np.diff(factors['c_q'], axis=0) <= 0)
+    assert np.all(np.diff(factors['c_eff'], axis=0) <= 0)
+    assert np.all(factors['c_eff'][-1] < 0.5)
+
+
+def test_head_factor_at_bep_equals_rate_factor(arrays):
+    p = prepare_inputs({'viscosity': [100.0, 500.0], 'liquidDensity': 900.0})
+    factors = viscosity_corrections(p, arrays)
+    np.testing.assert_allclose(factors['c_h'], factors['c_q'])
+    # Shut-in head is not corrected; rates past 120 % of BEP are held there.
+    assert head_factor(0.7, 0.0) == 1.0
+    assert head_factor(0.7, 2.0) == head_factor(0.7, 1.2)
+
+
+def test_table_is_cached(arrays):
+    assert catalog_table(arrays) is catalog_table(catalog_arrays())
+    assert kinematic_viscosity_cst(9.0, 900.0) == pytest.approx(10.0)
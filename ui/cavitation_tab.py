@@ -7,6 +7,13 @@ from PySide6.QtCore import Qt
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
+from matplotlib.colors import ListedColormap
+import numpy as np
+
+from core.cavitation import (
+    CAVITATION_STATUSES, MARGIN_THRESHOLDS, STATUS_COLORS,
+    npsh_map, npsh_margin, vapor_pressure
+)
 
 
 class CavitationTab(QWidget):
@@ -140,7 +147,12 @@ class CavitationTab(QWidget):
         """)
         self.calc_btn.clicked.connect(self._on_calculate)
         
+        self.map_btn = QPushButton("КАРТА NPSH")
+        self.map_btn.setStyleSheet(self.calc_btn.styleSheet())
+        self.map_btn.clicked.connect(self._on_map)
+        
         btn_layout.addWidget(self.calc_btn)
+        btn_layout.addWidget(self.map_btn)
         btn_layout.addStretch()
         
         left_layout.addWidget(fluid_group)
@@ -261,61 +273,59 @@ class CavitationTab(QWidget):
     
     def _calculate_npsh(self, pip_atm, temp_c, pb_atm, gor, separator_loss, npsh_req):
         """Расчёт NPSH и проверка на кавитацию"""
-        import math
-        
-        # Расчёт давления паров
-        vapor_pressure = self._calculate_vapor_pressure(temp_c, pb_atm, gor)
-        
-        # Давление на входе в насос
-        pump_inlet_pressure = pip_atm - separator_loss
-        
-        # Доступный NPSH
-        npsh_available = pump_inlet_pressure - vapor_pressure
-        
-        # Запас по кавитации
-        cavitation_margin = npsh_available - npsh_req
-        
-        # Статус кавитации
-        if cavitation_margin >= 1.0:
-            cavitation_status = "БЕЗОПАСНО"
-            status_color = "green"
-        elif cavitation_margin >= 0.5:
-            cavitation_status = "ВНИМАНИЕ"
-            status_color = "orange"
-        else:
-            cavitation_status = "ОПАСНО"
-            status_color = "red"
+        result = npsh_margin(pip_atm, temp_c, pb_atm, separator_loss, npsh_req)
+        status = int(result['status'])
         
         return {
-            'vapor_pressure': vapor_pressure,
-            'pump_inlet_pressure': pump_inlet_pressure,
-            'npsh_available': npsh_available,
+            'vapor_pressure': float(result['vapor_pressure']),
+            'pump_inlet_pressure': float(result['pump_inlet_pressure']),
+            'npsh_available': float(result['npsh_available']),
             'npsh_required': npsh_req,
-            'cavitation_margin': cavitation_margin,
-            'cavitation_status': cavitation_status,
-            'status_color': status_color,
+            'cavitation_margin': float(result['cavitation_margin']),
+            'cavitation_status': CAVITATION_STATUSES[status],
+            'status_color': STATUS_COLORS[status],
             'temp_c': temp_c,
             'pip_atm': pip_atm
         }
     
     def _calculate_vapor_pressure(self, temp_c, pb_atm, gor):
         """Расчёт давления паров по уравнению Антуана"""
-        import math
-        
-        # Коэффициенты уравнения Антуана для углеводородов
-        A = 6.834
-        B = 948.2
-        C = 239.7
-        
-        # Давление паров в мм рт.ст.
-        log10_pv_mmHg = A - B / (temp_c + C)
-        pv_mmHg = 10 ** log10_pv_mmHg
-        
-        # Пересчёт в атм
-        pv_atm = pv_mmHg / 760
+        return float(vapor_pressure(temp_c, pb_atm))
+    
+    def _calculate_npsh_map(self, pip_atm, temp_c, pb_atm, separator_loss, npsh_req):
+        """Запас NPSH на сетке PIP × температура вокруг рабочей точки"""
+        pip_grid = np.linspace(0.0, max(2.0 * pip_atm, pb_atm, npsh_req + separator_loss + 5.0), 241)
+        temp_grid = np.linspace(0.0, max(150.0, temp_c + 30.0), 181)
+        return npsh_map(pb_atm, separator_loss, npsh_req, pip_grid, temp_grid)
+    
+    def _on_map(self):
+        """Построение карты кавитации"""
+        self.progress.setValue(10)
+        self.status.setText("Построение карты NPSH...")
         
-        # Ограничение давлением насыщения
-        return min(pb_atm, max(0.03, pv_atm))
+        try:
+            pip_atm = self.pip_pressure.value()
+            temp_c = self.temperature.value()
+            pb_atm = self.bubble_point.value()
+            gor = self.gas_oil_ratio.value()
+            separator_loss = self.separator_loss.value()
+            npsh_req = self.npsh_required.value()
+            
+            result = self._calculate_npsh(pip_atm, temp_c, pb_atm, gor, separator_loss, npsh_req)
+            self.progress.setValue(40)
+            
+            grid = self._calculate_npsh_map(pip_atm, temp_c, pb_atm, separator_loss, npsh_req)
+            self.progress.setValue(70)
+            
+            self._display_results(result)
+            self._plot_map(grid, result)
+            
+            self.progress.setValue(100)
+            self.status.setText("Карта NPSH построена")
+            
+        except Exception as e:
+            self.status.setText(f"Ошибка расчёта: {str(e)}")
+            self.progress.setValue(0)
     
     def _display_results(self, result):
         """Отображение результатов расчёта"""
@@ -390,3 +400,27 @@ NPSH АНАЛИЗ:
             self.ax.set_facecolor('#b71c1c')
         
         self.chart.draw()
+    
+    def _plot_map(self, grid, result):
+        """Карта статуса кавитации по PIP и температуре с рабочей точкой"""
+        self.ax.clear()
+        self.ax.set_facecolor('#2a2a2a')
+        
+        cmap = ListedColormap(['#b71c1c', '#e65100', '#1b5e20'])
+        self.ax.pcolormesh(grid['pip_grid'], grid['temp_grid'], grid['status'],
+                           cmap=cmap, vmin=-0.5, vmax=2.5, shading='auto', alpha=0.8)
+        contours = self.ax.contour(grid['pip_grid'], grid['temp_grid'], grid['cavitation_margin'],
+                                   levels=list(MARGIN_THRESHOLDS), colors='#e0e0e0', linewidths=1)
+        self.ax.clabel(contours, fmt='%.1f м', fontsize=8)
+        
+        # Рабочая точка
+        self.ax.plot(result['pip_atm'], result['temp_c'], marker='o', color='white',
+                     markeredgecolor='black', markersize=9, linestyle='none',
+                     label=f"Рабочая точка: {result['cavitation_status']}")
+        
+        self.ax.set_xlabel('PIP, атм', color='#e0e0e0')
+        self.ax.set_ylabel('Температура на приёме, °C', color='#e0e0e0')
+        self.ax.set_title('Карта запаса NPSH', color='#e0e0e0')
+        self.ax.legend()
+        
+        self.chart.draw()
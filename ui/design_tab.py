@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 from typing import Dict
 
 from PySide6.QtCore import Qt
@@ -19,6 +20,7 @@ from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 
 from core.calc import run_full_calc
+from core.sensitivity import SENSITIVITY_METRICS, run_sensitivity
 
 
 class PumpChart(FigureCanvasQTAgg):
@@ -42,6 +44,22 @@ class PumpChart(FigureCanvasQTAgg):
         ax.legend(loc='best')
         self.draw()
 
+    def draw_tornado(self, rows, base, title, limit: int = 10) -> None:
+        """Торнадо-диаграмма: отклонения показателя при -Δ и +Δ каждого параметра."""
+        ax = self.ax
+        ax.clear()
+        rows = [row for row in rows if math.isfinite(row['swing'])][:limit][::-1]
+        y = range(len(rows))
+        ax.barh(y, [row['low'] - base for row in rows], left=base, color="#42a5f5", label="-Δ")
+        ax.barh(y, [row['high'] - base for row in rows], left=base, color="#ef5350", label="+Δ")
+        ax.axvline(base, color="black", linewidth=1)
+        ax.set_yticks(list(y))
+        ax.set_yticklabels([row['label'] for row in rows])
+        ax.set_xlabel(title)
+        ax.grid(True, axis='x', alpha=0.25)
+        ax.legend(loc='best')
+        self.draw()
+
 
 class DesignTab(QWidget):
     def __init__(self) -> None:
@@ -176,7 +194,25 @@ class DesignTab(QWidget):
                     stop:0 #42a5f5, stop:1 #1565c0);
             }
         """)
+        self.btn_sensitivity = QPushButton("ЧУВСТВИТЕЛЬНОСТЬ")
+        self.btn_sensitivity.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #ff9800, stop:1 #f57c00);
+                color: white;
+                border: none;
+                padding: 12px 20px;
+                border-radius: 6px;
+                font-weight: bold;
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #ffa726, stop:1 #ef6c00);
+            }
+        """)
         buttons_row.addWidget(self.btn_calc)
+        buttons_row.addWidget(self.btn_sensitivity)
         buttons_row.addWidget(self.btn_export)
 
         left_layout.addWidget(reservoir_group)
@@ -250,6 +286,7 @@ class DesignTab(QWidget):
         root.addWidget(right_widget)
 
         self.btn_calc.clicked.connect(self.on_calc)
+        self.btn_sensitivity.clicked.connect(self.on_sensitivity)
         
         # Автоматически запускаем расчёт при инициализации
         self._run_initial_calculation()
@@ -333,4 +370,24 @@ class DesignTab(QWidget):
         self.status.setText("Готово")
         self.progress.setValue(100)
 
+    def on_sensitivity(self) -> None:
+        """Анализ чувствительности: ±10% по каждому параметру одним пакетным расчётом."""
+        self.progress.setValue(10)
+        self.status.setText("Анализ чувствительности...")
+
+        out = run_sensitivity(self._collect())
+        base = out['base']['shaft_power_kw']
+        self.progress.setValue(60)
+        self.chart.draw_tornado(out['tornado']['shaft_power_kw'], base,
+                                f"Мощность на валу, кВт ({out['pump'] or 'насос не подобран'})")
+
+        names = {'tdh_m': "TDH", 'pip_atm': "PIP", 'void_fraction': "Газ, φ",
+                 'shaft_power_kw': "Мощность"}
+        parts = []
+        for metric in SENSITIVITY_METRICS:
+            top = out['tornado'][metric][0]
+            parts.append(f"<b>{names[metric]}:</b> {top['label']} (±{top['swing'] / 2:.1f})")
+        self.results.setText("Главные факторы (±10%): " + " | ".join(parts))
 
+        self.status.setText("Готово")
+        self.progress.setValue(100)
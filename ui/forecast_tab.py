@@ -9,6 +9,12 @@ from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 import numpy as np
 
+from core.economics import cash_flows, decline_type_key, run_scenarios, scenario_rows
+from core.forecast import decline_rates
+
+# Множители вокруг введённых значений для матрицы сценариев
+SCENARIO_MULTIPLIERS = (0.8, 1.0, 1.2)
+
 
 class ForecastTab(QWidget):
     def __init__(self):
@@ -145,7 +151,13 @@ class ForecastTab(QWidget):
         """)
         self.calc_btn.clicked.connect(self._on_calculate)
         
+        self.scenarios_btn = QPushButton("СЦЕНАРИИ")
+        self.scenarios_btn.setStyleSheet(self.calc_btn.styleSheet())
+        self.scenarios_btn.setToolTip("Цена, затраты, темп падения и ставка: ±20% от введённых значений")
+        self.scenarios_btn.clicked.connect(self._on_scenarios)
+        
         btn_layout.addWidget(self.calc_btn)
+        btn_layout.addWidget(self.scenarios_btn)
         btn_layout.addStretch()
         
         left_layout.addWidget(forecast_group)
@@ -270,6 +282,34 @@ class ForecastTab(QWidget):
             self.status.setText(f"Ошибка расчёта: {str(e)}")
             self.progress.setValue(0)
     
+    def _on_scenarios(self):
+        """Расчёт матрицы сценариев вокруг введённых параметров"""
+        self.progress.setValue(10)
+        self.status.setText("Выполняется расчёт сценариев...")
+        
+        try:
+            multipliers = np.array(SCENARIO_MULTIPLIERS)
+            result = self._calculate_scenarios(
+                self.decline_type.currentText(),
+                self.decline_rate.value() / 100 * multipliers,
+                self.hyperbolic_n.value(),
+                self.forecast_period.value(),
+                self.initial_rate.value(),
+                self.oil_price.value() * multipliers,
+                self.operating_cost.value() * multipliers,
+                self.discount_rate.value() / 100 * multipliers,
+            )
+            
+            self.progress.setValue(70)
+            self._display_scenarios(result)
+            
+            self.progress.setValue(100)
+            self.status.setText(f"Рассчитано сценариев: {len(result['rows'])}")
+            
+        except Exception as e:
+            self.status.setText(f"Ошибка расчёта: {str(e)}")
+            self.progress.setValue(0)
+    
     def _calculate_forecast(self, decline_type, decline_rate, hyperbolic_n, 
                           forecast_period, initial_rate, oil_price, 
                           operating_cost, discount_rate):
@@ -279,62 +319,68 @@ class ForecastTab(QWidget):
         months = np.arange(0, forecast_period + 1)
         
         # Расчёт дебитов
-        if decline_type == "Экспоненциальное":
-            rates = initial_rate * np.exp(-decline_rate * months)
-        else:  # Гиперболическое
-            rates = initial_rate / (1 + hyperbolic_n * decline_rate * months) ** (1 / hyperbolic_n)
-        
-        # Конвертация в баррели (1 м³ ≈ 6.29 баррелей)
-        rates_bbl = rates * 6.29
-        
-        # Расчёт доходов и расходов
-        revenues = rates_bbl * oil_price
-        costs = rates_bbl * operating_cost
-        profits = revenues - costs
-        
-        # Дисконтированные денежные потоки
-        discount_factors = 1 / (1 + discount_rate) ** (months / 12)
-        discounted_profits = profits * discount_factors
-        
-        # Накопленные показатели
-        cumulative_production = np.cumsum(rates_bbl)
-        cumulative_revenue = np.cumsum(revenues)
-        cumulative_profit = np.cumsum(profits)
-        npv = np.sum(discounted_profits)
-        
-        # Ключевые показатели
-        final_rate = rates[-1]
-        total_production = cumulative_production[-1]
-        total_revenue = cumulative_revenue[-1]
-        total_profit = cumulative_profit[-1]
-        
-        # Точка безубыточности
-        breakeven_month = None
-        for i, profit in enumerate(cumulative_profit):
-            if profit >= 0:
-                breakeven_month = i
-                break
+        rates = decline_rates(initial_rate, months, decline_type_key(decline_type),
+                              decline_rate, hyperbolic_n)
+        
+        # Денежные потоки, накопленные показатели и точка безубыточности
+        flows = cash_flows(rates, months, oil_price, operating_cost, discount_rate)
+        breakeven_month = int(flows['breakeven_month'])
         
         return {
             'months': months,
             'rates': rates,
-            'rates_bbl': rates_bbl,
-            'revenues': revenues,
-            'costs': costs,
-            'profits': profits,
-            'discounted_profits': discounted_profits,
-            'cumulative_production': cumulative_production,
-            'cumulative_revenue': cumulative_revenue,
-            'cumulative_profit': cumulative_profit,
-            'final_rate': final_rate,
-            'total_production': total_production,
-            'total_revenue': total_revenue,
-            'total_profit': total_profit,
-            'npv': npv,
-            'breakeven_month': breakeven_month,
+            'rates_bbl': flows['rates_bbl'],
+            'revenues': flows['revenues'],
+            'costs': flows['costs'],
+            'profits': flows['profits'],
+            'discounted_profits': flows['discounted_profits'],
+            'cumulative_production': flows['cumulative_production'],
+            'cumulative_revenue': flows['cumulative_revenue'],
+            'cumulative_profit': flows['cumulative_profit'],
+            'final_rate': rates[-1],
+            'total_production': flows['cumulative_production'][-1],
+            'total_revenue': flows['cumulative_revenue'][-1],
+            'total_profit': flows['cumulative_profit'][-1],
+            'npv': float(flows['npv']),
+            'breakeven_month': breakeven_month if breakeven_month >= 0 else None,
             'decline_type': decline_type
         }
     
+    def _calculate_scenarios(self, decline_type, declines, hyperbolic_n,
+                             forecast_period, initial_rate, oil_prices,
+                             operating_costs, discount_rates):
+        """Расчёт матрицы сценариев (все сочетания цен, затрат, темпов падения и ставок)"""
+        result = run_scenarios(initial_rate, forecast_period, oil_prices, operating_costs,
+                               declines, discount_rates, decline_type, hyperbolic_n)
+        result['rows'] = scenario_rows(result['scenarios'])
+        return result
+    
+    def _display_scenarios(self, result, shown=5):
+        """Лучшие и худшие сценарии по NPV"""
+        rows = result['rows']
+        
+        def line(row):
+            breakeven = row['breakeven_month']
+            return (f"• ${row['oil_price']:.1f} | ${row['operating_cost']:.1f} | "
+                    f"{row['decline_rate'] * 100:.1f}%/мес | {row['discount_rate'] * 100:.1f}% | "
+                    f"NPV ${row['npv']:,.0f} | окупаемость "
+                    f"{'нет' if breakeven is None else f'{breakeven} мес'}")
+        
+        positive = sum(row['npv'] > 0 for row in rows)
+        text = [
+            "МАТРИЦА СЦЕНАРИЕВ:",
+            "Цена | Затраты | Падение | Ставка | NPV | Окупаемость",
+            "",
+            "ЛУЧШИЕ:",
+            *[line(row) for row in rows[:shown]],
+            "",
+            "ХУДШИЕ:",
+            *[line(row) for row in rows[-shown:]],
+            "",
+            f"NPV > 0 в {positive} из {len(rows)} сценариев",
+        ]
+        self.results.setText("\n".join(text))
+    
     def _display_results(self, result):
         """Отображение результатов прогноза"""
         text = f"""
@@ -8,6 +8,8 @@ from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 
+from core.motor import CABLE_RESISTANCE_20_OHM_KM, best_combinations, cable_resistance, size_motor_cable
+
 
 class MotorTab(QWidget):
     def __init__(self):
@@ -162,7 +164,12 @@ class MotorTab(QWidget):
         """)
         self.calc_btn.clicked.connect(self._on_calculate)
         
+        self.sizing_btn = QPushButton("ПОДОБРАТЬ КАБЕЛЬ И ДВИГАТЕЛЬ")
+        self.sizing_btn.setStyleSheet(self.calc_btn.styleSheet())
+        self.sizing_btn.clicked.connect(self._on_sizing)
+        
         btn_layout.addWidget(self.calc_btn)
+        btn_layout.addWidget(self.sizing_btn)
         btn_layout.addStretch()
         
         left_layout.addWidget(pump_group)
@@ -342,23 +349,42 @@ class MotorTab(QWidget):
     
     def _get_cable_resistance(self, cable_type, length, temp):
         """Получение сопротивления кабеля"""
-        # Сопротивление на 1 км при 20°C (Ом/км)
-        resistance_20 = {
-            "Cu 4мм²": 4.61,
-            "Cu 6мм²": 3.08,
-            "Cu 10мм²": 1.83,
-            "Cu 16мм²": 1.15,
-            "Cu 25мм²": 0.727
-        }
-        
-        base_resistance = resistance_20.get(cable_type, 3.08)
-        
-        # Температурная коррекция
-        temp_coeff = 0.004  # для меди
-        resistance = base_resistance * (1 + temp_coeff * (temp - 20))
+        base_resistance = CABLE_RESISTANCE_20_OHM_KM.get(cable_type, 3.08)
+        return float(cable_resistance(base_resistance, length, temp))
+    
+    def _on_sizing(self):
+        """Перебор сечений кабеля, напряжений и двигателей"""
+        self.progress.setValue(10)
+        self.status.setText("Подбор кабеля и двигателя...")
         
-        # Сопротивление для заданной длины
-        return resistance * (length / 1000)
+        try:
+            shaft_power = self.power_required.value() / self.efficiency.value()
+            rows = best_combinations(size_motor_cable(
+                shaft_power, self.cable_length.value(), self.temperature.value(),
+                motor_eff=self.motor_efficiency.value(),
+                power_factor=self.power_factor.value()
+            ))
+            self.progress.setValue(70)
+            
+            if not rows:
+                self.results.setText("Нет допустимых сочетаний кабеля, напряжения и двигателя")
+            else:
+                lines = ["ЛУЧШИЕ СОЧЕТАНИЯ (по стоимости жизненного цикла):", ""]
+                for i, row in enumerate(rows, 1):
+                    lines.append(
+                        f"{i}. Cu {row['section_mm2']:.0f}мм², {row['voltage_v']:.0f} В, "
+                        f"{row['motor_kw']:.0f} кВт: ток {row['current_a']:.1f} А, "
+                        f"ΔU {row['voltage_drop_v']:.0f} В, потери {row['cable_losses_kw']:.1f} кВт, "
+                        f"КПД {row['total_efficiency']:.1%}, ${row['lifecycle_cost']:,.0f}"
+                    )
+                self.results.setText("\n".join(lines))
+            
+            self.progress.setValue(100)
+            self.status.setText(f"Найдено сочетаний: {len(rows)}")
+            
+        except Exception as e:
+            self.status.setText(f"Ошибка расчёта: {str(e)}")
+            self.progress.setValue(0)
     
     def _display_results(self, result):
         """Отображение результатов расчёта"""